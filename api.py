@@ -1,21 +1,115 @@
-from fastapi import FastAPI
+from typing import Optional
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from src.juno import Juno
+from src.utilities.sessions.session_pool import SessionPool, SessionLimitError
+from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+from src.utilities.openai_client.openai_client import usage
 
 app = FastAPI()
-new_bot = Juno()
+
+# Every session gets its own text-only Juno instance, taken from a pool of prewarmed instances.
+# The pool is created once the server has started, so a preforked server (server.py) creates one per worker process.
+session_pool = None
+
+# Set by server.py in each preforked worker: the worker's index and the session port of every worker
+worker_index = None
+worker_ports = None
 
 class TextData(BaseModel):
     text: str
+    session_id: Optional[str] = None
+
+def configure_worker(index: int, ports: list):
+    """Identifies this process as one of a preforked server's workers"""
+    global worker_index, worker_ports
+    worker_index = index
+    worker_ports = ports
+
+@app.on_event("startup")
+def startup():
+    global session_pool
+    # Read here rather than on import, so importing the api does not touch the settings files
+    server_settings = MasterSettingsManager().retrieve_property('server')
+    session_pool = SessionPool(
+        bot_factory=lambda: Juno(mode="text"),
+        warm_size=server_settings['warm_sessions'],
+        max_sessions=server_settings['max_sessions'],
+        idle_timeout=server_settings['session_idle_timeout'],
+        session_id_prefix='' if worker_index is None else f'w{worker_index}-'
+    )
+
+@app.post("/sessions/")
+def create_session():
+    session = start_session()
+    return session_response(session.session_id)
+
+@app.get("/sessions/")
+def session_status():
+    return session_pool.status()
+
+@app.post("/sessions/{session_id}/process/")
+def process_session_text(session_id: str, data: TextData):
+    session = retrieve_session(session_id)
+    return session_response(session_id, processed_text=session.process(data.text))
+
+@app.delete("/sessions/{session_id}/")
+def close_session(session_id: str):
+    if not session_pool.close_session(session_id):
+        # raises 404, or 421 if the session belongs to another worker
+        retrieve_session(session_id)
+    return {"session_id": session_id, "closed": True}
 
 @app.post("/process/")
 def process_text(data: TextData):
-    processed_text = start_session(data.text)
-    return {"processed_text": processed_text}
+    # Continue the given session, or start a new one if none was given or it has expired
+    session = session_pool.retrieve_session(data.session_id) if data.session_id else None
+    if session is None:
+        if data.session_id:
+            check_session_owner(data.session_id)
+        session = start_session()
+    return session_response(session.session_id, processed_text=session.process(data.text))
+
+@app.get("/usage/")
+def openai_usage():
+    # OpenAI requests, tokens and characters used by this process, per model
+    return usage.summary()
+
+@app.on_event("shutdown")
+def shutdown():
+    session_pool.shutdown()
+
+def start_session():
+    try:
+        return session_pool.create_session()
+    except SessionLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+def retrieve_session(session_id: str):
+    session = session_pool.retrieve_session(session_id)
+    if session is not None:
+        return session
+
+    check_session_owner(session_id)
+    raise HTTPException(status_code=404, detail=f"Session {session_id} does not exist or has expired.")
+
+def check_session_owner(session_id: str):
+    # Sessions live in the worker process that created them, point the client at the worker that owns it
+    owner = session_owner(session_id)
+    if owner is not None and owner != worker_index:
+        raise HTTPException(status_code=421, detail=f"Session {session_id} belongs to the worker on port {worker_ports[owner]}.")
 
-def start_session(text):
+def session_owner(session_id: str):
+    """Returns the index of the worker that created a session, or None if the server is not preforked"""
+    if worker_ports is None or not session_id.startswith('w') or '-' not in session_id:
+        return None
+    index = session_id[1:session_id.index('-')]
+    if not index.isdigit() or int(index) >= len(worker_ports):
+        return None
+    return int(index)
 
-    speech = new_bot.listen()
-    text = speech + text
-    response = new_bot.process(text)
-    new_bot.verbalize(response)
+def session_response(session_id: str, **response):
+    # A preforked server's sessions must be continued on the worker that owns them
+    if worker_ports is not None:
+        response["worker_port"] = worker_ports[worker_index]
+    return {"session_id": session_id, **response}
@@ -0,0 +1,12 @@
+"""
+Runs the end-to-end turn latency benchmark, see benchmarks/turn_latency.py for the scenarios and options.
+
+Usage:
+	python bench.py [--scenario warm] [--turns 200] [--latency realistic] [--compare previous.json]
+"""
+
+import sys
+from benchmarks.turn_latency import main
+
+if __name__ == '__main__':
+	sys.exit(main())
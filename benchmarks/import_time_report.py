@@ -0,0 +1,117 @@
+"""
+Reports where Juno's startup time goes by parsing Python's `-X importtime` output.
+
+Usage:
+	python -m benchmarks.import_time_report
+	python -m benchmarks.import_time_report --target src.juno --top 25 --budget-ms 400
+	python -m benchmarks.import_time_report --json import_times.json
+
+The script exits with a non-zero status if a target fails to import, or, when --budget-ms is given, if its total
+import time exceeds the budget.
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+
+DEFAULT_TARGETS = ['src.juno', 'api', 'listener']
+
+def measure_imports(target:str) -> dict:
+	"""
+	Imports the target in a fresh interpreter and returns the parsed import timings
+	"""
+	process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {target}'], capture_output=True, text=True)
+	modules = parse_import_times(process.stderr)
+
+	error = None
+	if process.returncode != 0:
+		# the last line of the traceback names the missing module or failing import
+		error = process.stderr.strip().splitlines()[-1]
+
+	return {'target': target, 'modules': modules, 'error': error}
+
+def parse_import_times(output:str) -> list:
+	"""
+	Parses lines of the form 'import time: <self us> | <cumulative us> | <module>'
+	"""
+	modules = []
+	for line in output.splitlines():
+		if not line.startswith('import time:'):
+			continue
+		fields = line[len('import time:'):].split('|')
+		if len(fields) != 3:
+			continue
+		try:
+			self_us, cumulative_us = int(fields[0]), int(fields[1])
+		except ValueError:
+			# skips the header line
+			continue
+		name = fields[2]
+		depth = (len(name) - len(name.lstrip())) // 2
+		modules.append({'module': name.strip(), 'self_ms': self_us / 1000, 'cumulative_ms': cumulative_us / 1000, 'depth': depth})
+	return modules
+
+def summarize(measurement:dict, top:int) -> dict:
+	"""
+	Returns the total import time of the target and the slowest modules by cumulative and self time
+	"""
+	modules = measurement['modules']
+	# top level imports are the shallowest entries, their cumulative times add up to the total
+	minimum_depth = min((module['depth'] for module in modules), default=0)
+	total_ms = sum(module['cumulative_ms'] for module in modules if module['depth'] == minimum_depth)
+
+	return {
+		'target': measurement['target'],
+		'error': measurement['error'],
+		'total_ms': round(total_ms, 2),
+		'module_count': len(modules),
+		'slowest_cumulative': sorted(modules, key=lambda module: module['cumulative_ms'], reverse=True)[:top],
+		'slowest_self': sorted(modules, key=lambda module: module['self_ms'], reverse=True)[:top],
+	}
+
+def print_summary(summary:dict) -> None:
+	print(f"\n{summary['target']}: {summary['total_ms']:.1f} ms across {summary['module_count']} modules")
+	if summary['error']:
+		print(f"  import failed: {summary['error']}")
+
+	print('  slowest (cumulative):')
+	for module in summary['slowest_cumulative']:
+		print(f"    {module['cumulative_ms']:9.1f} ms  {module['module']}")
+	print('  slowest (self):')
+	for module in summary['slowest_self']:
+		print(f"    {module['self_ms']:9.1f} ms  {module['module']}")
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description="Report import time of Juno's entry points")
+	parser.add_argument('--target', action='append', help='module to import, may be repeated (default: src.juno, api, listener)')
+	parser.add_argument('--top', type=int, default=15, help='number of modules to list')
+	parser.add_argument('--budget-ms', type=float, default=None, help='fail if any target takes longer than this to import')
+	parser.add_argument('--json', default=None, help='also write the report to this file')
+	args = parser.parse_args()
+
+	summaries = [summarize(measure_imports(target), args.top) for target in args.target or DEFAULT_TARGETS]
+	for summary in summaries:
+		print_summary(summary)
+
+	if args.json:
+		with open(args.json, 'w', encoding='utf-8') as f:
+			json.dump(summaries, f, indent=2)
+
+	# a target that fails to import stops early, so its timing would pass any budget
+	failed = [summary for summary in summaries if summary['error']]
+	for summary in failed:
+		print(f"\n{summary['target']} failed to import: {summary['error']}")
+
+	over_budget = []
+	if args.budget_ms is not None:
+		over_budget = [summary for summary in summaries if summary['total_ms'] > args.budget_ms]
+		for summary in over_budget:
+			print(f"\n{summary['target']} is over the {args.budget_ms:.0f} ms startup budget ({summary['total_ms']:.1f} ms)")
+
+	if failed or over_budget:
+		return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+Concurrent load generator for the text api (api.py, served by server.py).
+
+Each virtual user opens a session, sends utterances drawn from a weighted mix with a random think time in between,
+and closes its session when its stage ends. The number of users is stepped up through the given concurrency levels,
+and every level reports its throughput, latency percentiles and errors. Throughput that stops growing as users are
+added (low scaling efficiency) while latency climbs marks the saturation point, the concurrency at which requests
+start queueing behind something serialized: a worker's GIL, the shared conversation history or settings file writes.
+
+With --start-server, the api is started against the local mock services with a throwaway profile, so the measurement
+needs neither network access nor real api keys.
+
+Usage:
+	python -m benchmarks.load_test --start-server --workers 2 --concurrency 1,2,4,8,16 --duration 20
+	python -m benchmarks.load_test --url http://localhost:8000 --mix weather=2,gpt=5,translate=1 --think-time 1
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlsplit
+
+from benchmarks.mock_services import MockServices
+from benchmarks.turn_latency import TemporaryProfile, bench_api_keys, summarize, git_commit
+
+UTTERANCES = {
+	'weather': ["What is the weather in Chicago", "What is the weather in Paris", "What is the weather in Tokyo"],
+	'translate': ["Translate good morning to Spanish", "Translate thank you very much into French"],
+	'password': ["Generate a password"],
+	'gpt': ["Tell me a fun fact about octopuses", "How do airplanes stay in the air?", "Why is the sky blue?", "Can you recommend a good book to read?"],
+}
+
+DEFAULT_MIX = {'weather': 2, 'translate': 1, 'password': 1, 'gpt': 4}
+
+class ApiClient:
+	"""
+	A keep-alive connection to the api, one per virtual user.
+	Sessions of a preforked server are continued on the port of the worker that owns them.
+	"""
+
+	def __init__(self, url:str, timeout:float):
+		parts = urlsplit(url)
+		self.host = parts.hostname
+		self.port = parts.port or 80
+		self.timeout = timeout
+		self.connections = {}
+
+	def request(self, method:str, path:str, body:dict=None, port:int=None) -> tuple:
+		"""
+		Sends a request and returns its status and decoded response
+		"""
+		port = port or self.port
+		connection = self.connections.get(port)
+		if connection is None:
+			connection = self.connections[port] = http.client.HTTPConnection(self.host, port, timeout=self.timeout)
+
+		headers = {'Content-Type': 'application/json'} if body is not None else {}
+		try:
+			connection.request(method, path, body=json.dumps(body).encode() if body is not None else None, headers=headers)
+			response = connection.getresponse()
+			content = response.read()
+		except (OSError, http.client.HTTPException):
+			# the connection is unusable, the next request reconnects
+			connection.close()
+			del self.connections[port]
+			raise
+
+		try:
+			return response.status, json.loads(content) if content else {}
+		except ValueError:
+			return response.status, {}
+
+	def close(self) -> None:
+		for connection in self.connections.values():
+			connection.close()
+		self.connections = {}
+
+class VirtualUser(threading.Thread):
+	"""
+	Opens a session and keeps sending utterances to it until the stage's stop event is set
+	"""
+
+	def __init__(self, user_id:int, url:str, utterances:list, think_time:float, timeout:float, stop_event:threading.Event, results:'LevelResults'):
+		super().__init__(daemon=True, name=f'virtual-user-{user_id}')
+		self.client = ApiClient(url, timeout)
+		self.random = random.Random(user_id)
+		self.utterances = utterances
+		self.think_time = think_time
+		self.stop_event = stop_event
+		self.results = results
+
+	def run(self) -> None:
+		session_id, port = self._create_session()
+		while not self.stop_event.is_set():
+			if session_id is None:
+				# the server could not start a session (e.g. its session limit was reached), back off and retry
+				self.stop_event.wait(1)
+				session_id, port = self._create_session()
+				continue
+
+			start_time = time.perf_counter()
+			try:
+				status, response = self.client.request('POST', f'/sessions/{session_id}/process/', {'text': self.random.choice(self.utterances)}, port)
+			except (OSError, http.client.HTTPException) as e:
+				status, response = type(e).__name__, {}
+			self.results.record('process', status, time.perf_counter() - start_time)
+
+			if status in [404, 421]:
+				# the session expired or was lost with its worker
+				session_id, port = self._create_session()
+
+			if self.think_time:
+				self.stop_event.wait(self.random.expovariate(1 / self.think_time))
+
+		if session_id is not None:
+			try:
+				self.client.request('DELETE', f'/sessions/{session_id}/', port=port)
+			except (OSError, http.client.HTTPException):
+				pass
+		self.client.close()
+
+	def _create_session(self) -> tuple:
+		start_time = time.perf_counter()
+		try:
+			status, response = self.client.request('POST', '/sessions/')
+		except (OSError, http.client.HTTPException) as e:
+			status, response = type(e).__name__, {}
+		self.results.record('create_session', status, time.perf_counter() - start_time)
+		if status != 200:
+			return None, None
+		return response['session_id'], response.get('worker_port')
+
+class LevelResults:
+	"""
+	Collects the latency and status of every request made at one concurrency level
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self.latencies = {}
+		self.statuses = {}
+		self.measuring = False
+
+	def record(self, operation:str, status, seconds:float) -> None:
+		# requests made while users ramp up are not measured
+		if not self.measuring:
+			return
+		with self._lock:
+			self.latencies.setdefault(operation, []).append(seconds * 1000)
+			counts = self.statuses.setdefault(operation, {})
+			counts[str(status)] = counts.get(str(status), 0) + 1
+
+def run_level(url:str, concurrency:int, utterances:list, args) -> dict:
+	"""
+	Runs the given number of virtual users for the configured duration and returns the level's measurements
+	"""
+	results = LevelResults()
+	stop_event = threading.Event()
+	users = [VirtualUser(user_id, url, utterances, args.think_time, args.timeout, stop_event, results) for user_id in range(concurrency)]
+	for user in users:
+		user.start()
+
+	stop_event.wait(args.ramp_up)
+	results.measuring = True
+	start_time = time.perf_counter()
+	time.sleep(args.duration)
+	results.measuring = False
+	elapsed = time.perf_counter() - start_time
+
+	stop_event.set()
+	for user in users:
+		user.join(args.timeout + 5)
+
+	process_statuses = results.statuses.get('process', {})
+	requests = sum(process_statuses.values())
+	successes = process_statuses.get('200', 0)
+	successful_latencies = results.latencies.get('process', [])
+
+	return {
+		'concurrency': concurrency,
+		'requests': requests,
+		'throughput_per_second': round(successes / elapsed, 2),
+		'error_rate': round((requests - successes) / requests, 4) if requests else None,
+		'statuses': results.statuses,
+		'process': summarize(successful_latencies),
+		'create_session': summarize(results.latencies.get('create_session', [])),
+		'server': server_status(url),
+	}
+
+def server_status(url:str) -> dict:
+	"""
+	The session pool's status once a level has ended, or None if it could not be retrieved
+	"""
+	client = ApiClient(url, 5)
+	try:
+		status, response = client.request('GET', '/sessions/')
+		return response if status == 200 else None
+	except (OSError, http.client.HTTPException):
+		return None
+	finally:
+		client.close()
+
+def find_saturation(levels:list, efficiency_threshold:float) -> dict:
+	"""
+	Adds each level's scaling efficiency (its throughput relative to the first level's, scaled by concurrency)
+	and returns the highest concurrency that still scaled, and the first that did not
+	"""
+	base = levels[0]
+	base_per_user = base['throughput_per_second'] / base['concurrency'] if base['throughput_per_second'] else None
+	saturated_at = None
+	for level in levels:
+		level['scaling_efficiency'] = round(level['throughput_per_second'] / (base_per_user * level['concurrency']), 3) if base_per_user else None
+		if saturated_at is None and level['scaling_efficiency'] is not None and level['scaling_efficiency'] < efficiency_threshold:
+			saturated_at = level['concurrency']
+
+	scaled = [level['concurrency'] for level in levels if saturated_at is None or level['concurrency'] < saturated_at]
+	return {
+		'max_scaling_concurrency': scaled[-1] if scaled else None,
+		'saturated_at_concurrency': saturated_at,
+		'peak_throughput_per_second': max(level['throughput_per_second'] for level in levels),
+	}
+
+def parse_mix(mix:str) -> list:
+	"""
+	Expands a mix such as 'weather=2,gpt=5' into a weighted list of utterances
+	"""
+	weights = DEFAULT_MIX
+	if mix:
+		weights = {}
+		for part in mix.split(','):
+			category, _, weight = part.partition('=')
+			if category not in UTTERANCES:
+				raise argparse.ArgumentTypeError(f"Unknown utterance category '{category}', expected one of {', '.join(UTTERANCES)}")
+			weights[category] = int(weight or 1)
+
+	utterances = []
+	for category, weight in weights.items():
+		utterances.extend(UTTERANCES[category] * weight)
+	return utterances
+
+def wait_for_server(url:str, timeout:float) -> bool:
+	deadline = time.time() + timeout
+	while time.time() < deadline:
+		if server_status(url) is not None:
+			return True
+		time.sleep(0.5)
+	return False
+
+def serve() -> None:
+	"""
+	Runs in the server process started by --start-server: the api with bench api keys, against the mock services
+	named in the environment. Arguments after --serve are passed on to server.py.
+	"""
+	from src.initialization import shared_resources
+	from src.utilities.http.service_endpoints import retrieve_service_endpoint
+	import server
+
+	shared_resources.use_api_keys(bench_api_keys({'clu': retrieve_service_endpoint('clu')}))
+	sys.argv = ['server.py'] + sys.argv[sys.argv.index('--serve') + 1:]
+	server.main()
+
+def main() -> int:
+	if '--serve' in sys.argv:
+		serve()
+		return 0
+
+	parser = argparse.ArgumentParser(description='Measure how the Juno text api behaves under many concurrent sessions')
+	parser.add_argument('--url', default='http://127.0.0.1:8000', help='the api to load')
+	parser.add_argument('--concurrency', default='1,2,4,8,16,32', help='comma separated numbers of concurrent users')
+	parser.add_argument('--duration', type=float, default=20, help='seconds measured per concurrency level')
+	parser.add_argument('--ramp-up', type=float, default=3, help='seconds per level before measuring starts')
+	parser.add_argument('--think-time', type=float, default=0.5, help='mean seconds a user waits between utterances (exponentially distributed)')
+	parser.add_argument('--mix', default=None, help=f"utterance weights, e.g. 'weather=2,gpt=5' (categories: {', '.join(UTTERANCES)})")
+	parser.add_argument('--timeout', type=float, default=60, help='seconds before a request is counted as failed')
+	parser.add_argument('--efficiency-threshold', type=float, default=0.7, help='scaling efficiency below which a level counts as saturated')
+	parser.add_argument('--start-server', action='store_true', help='start the api against the local mock services')
+	parser.add_argument('--workers', type=int, default=1, help='worker processes of the started server')
+	parser.add_argument('--latency', default='realistic', help='mock service latency profile of the started server')
+	parser.add_argument('--output', default=None, help='where to save the results (default: benchmarks/results/load-<time>.json)')
+	args = parser.parse_args()
+
+	utterances = parse_mix(args.mix)
+	concurrency_levels = [int(level) for level in args.concurrency.split(',')]
+
+	results = {
+		'meta': {
+			'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+			'commit': git_commit(),
+			'arguments': vars(args),
+		},
+		'levels': [],
+	}
+
+	if args.start_server:
+		services = MockServices(profile=args.latency, seed=0).start()
+		profile = TemporaryProfile().__enter__()
+		port = urlsplit(args.url).port or 8000
+		server_process = subprocess.Popen(
+			[sys.executable, '-m', 'benchmarks.load_test', '--serve', '--workers', str(args.workers), '--host', '127.0.0.1', '--port', str(port)],
+			env={**os.environ, **services.environment()}
+		)
+
+	try:
+		if not wait_for_server(args.url, 120 if args.start_server else 5):
+			print(f'The api at {args.url} did not respond')
+			return 1
+
+		for concurrency in concurrency_levels:
+			print(f'{concurrency} concurrent users...')
+			level = run_level(args.url, concurrency, utterances, args)
+			results['levels'].append(level)
+			print(f"  {level['throughput_per_second']:.2f} turns/s, p50 {level['process'].get('p50_ms')} ms, p99 {level['process'].get('p99_ms')} ms, errors {level['error_rate']}")
+	finally:
+		if args.start_server:
+			server_process.terminate()
+			server_process.wait(30)
+			profile.__exit__(None, None, None)
+			results['meta']['mock_requests'] = dict(services.request_counts)
+			services.stop()
+
+	if results['levels']:
+		results['saturation'] = find_saturation(results['levels'], args.efficiency_threshold)
+		print('\nThroughput by concurrency:')
+		for level in results['levels']:
+			print(f"  {level['concurrency']:>4} users  {level['throughput_per_second']:9.2f} turns/s  efficiency {level['scaling_efficiency']}")
+		print(json.dumps(results['saturation'], indent=2))
+
+	output = args.output or os.path.join('benchmarks', 'results', f"load-{time.strftime('%Y%m%d-%H%M%S')}.json")
+	os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+	with open(output, 'w', encoding='utf-8') as f:
+		json.dump(results, f, indent=2)
+	print(f'\nResults saved to {output}')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Local stand-ins for the HTTP services Juno calls: OpenAI chat completions and audio speech, CLU analyze-conversations,
+Translator /translate, OpenWeatherMap /weather and NewsAPI articles. Responses have the shapes the code consumes, and each
+service's latency and error rate can be configured, so the pipeline can be exercised and benchmarked without network access.
+
+Point Juno at the services with 'service_endpoints' in "configuration/config.yaml", or with the JUNO_ENDPOINT_* environment
+variables printed on startup.
+
+Usage:
+	python -m benchmarks.mock_services [--port 8900] [--profile fast|realistic|degraded] [--error-rate 0.05]
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Mean and jitter of each service's latency in milliseconds
+LATENCY_PROFILES = {
+	'fast': {},
+	'realistic': {
+		'openai': (600, 200),
+		'openai_speech': (400, 100),
+		'clu': (90, 30),
+		'translator': (120, 40),
+		'weather': (150, 50),
+		'news': (200, 60),
+	},
+}
+LATENCY_PROFILES['degraded'] = {service: (mean * 3, jitter * 3) for service, (mean, jitter) in LATENCY_PROFILES['realistic'].items()}
+
+SERVICES = ['openai', 'clu', 'translator', 'weather', 'news']
+
+# A single silent MPEG-1 layer III frame (128 kbps, 44.1 kHz), enough for an mp3 decoder to accept the audio
+SILENT_MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0x64]) + bytes(413)
+
+class MockServices:
+	"""
+	Runs every mock service on one local port, each under its own path prefix
+	"""
+
+	def __init__(self, host:str='127.0.0.1', port:int=0, profile:str='fast', error_rate:float=0.0, api_key:str=None, seed:int=None):
+		"""
+		:param profile: (str) latency profile, one of LATENCY_PROFILES or a dict of service -> (mean ms, jitter ms)
+		:param error_rate: (float) share of requests answered with a 500 error, a dict of service -> rate is also accepted
+		:param api_key: (str) if given, requests using any other key are rejected the way the real service would
+		"""
+		self.latencies = LATENCY_PROFILES[profile] if isinstance(profile, str) else profile
+		self.error_rates = error_rate if isinstance(error_rate, dict) else {service: error_rate for service in SERVICES}
+		self.api_key = api_key
+		self.random = random.Random(seed)
+		self.request_counts = {}
+		self._lock = threading.Lock()
+
+		self.server = ThreadingHTTPServer((host, port), self._create_handler())
+		self.server.daemon_threads = True
+		self.thread = None
+
+	@property
+	def url(self) -> str:
+		host, port = self.server.server_address[:2]
+		return f'http://{host}:{port}'
+
+	def endpoints(self) -> dict:
+		"""
+		Returns the base url of every service, in the form expected by 'service_endpoints'
+		"""
+		return {
+			'openai': f'{self.url}/openai/v1',
+			'clu': f'{self.url}/clu',
+			'translator': f'{self.url}/translator',
+			'weather': f'{self.url}/weather/data/2.5',
+			'news': f'{self.url}/news/v1',
+		}
+
+	def environment(self) -> dict:
+		"""
+		Returns the environment variables that point Juno at the services
+		"""
+		return {f'JUNO_ENDPOINT_{service.upper()}': endpoint for service, endpoint in self.endpoints().items()}
+
+	def start(self) -> 'MockServices':
+		"""
+		Serves the mock services on a background thread
+		"""
+		self.thread = threading.Thread(target=self.server.serve_forever, daemon=True, name='mock-services')
+		self.thread.start()
+		return self
+
+	def stop(self) -> None:
+		self.server.shutdown()
+		self.server.server_close()
+
+	def __enter__(self):
+		return self.start()
+
+	def __exit__(self, *exc_info):
+		self.stop()
+
+	def _create_handler(self):
+		services = self
+
+		class MockServiceHandler(BaseHTTPRequestHandler):
+			protocol_version = 'HTTP/1.1'
+			# headers and body are written separately, with Nagle's algorithm every keep-alive response would stall on a delayed ACK
+			disable_nagle_algorithm = True
+
+			def do_GET(self):
+				services._handle(self)
+
+			def do_POST(self):
+				services._handle(self)
+
+			def log_message(self, format, *args):
+				pass
+
+		return MockServiceHandler
+
+	def _handle(self, request:BaseHTTPRequestHandler) -> None:
+		"""
+		Routes a request to its service after applying the service's latency and error rate
+		"""
+		url = urlsplit(request.path)
+		query = {key: values[0] for key, values in parse_qs(url.query).items()}
+		length = int(request.headers.get('Content-Length') or 0)
+		body = request.rfile.read(length) if length else b''
+
+		routes = [
+			(r'^/openai/v1/chat/completions$', 'openai', self._chat_completion),
+			(r'^/openai/v1/audio/speech$', 'openai_speech', self._audio_speech),
+			(r'^/clu/language/:analyze-conversations$', 'clu', self._analyze_conversation),
+			(r'^/translator/translate$', 'translator', self._translate),
+			(r'^/weather/data/2\.5/weather$', 'weather', self._weather),
+			(r'^/news/v1/articles$', 'news', self._news),
+		]
+		for pattern, service, handler in routes:
+			if re.match(pattern, url.path):
+				break
+		else:
+			return self._respond(request, 404, {'error': f'No mock service at {url.path}'})
+
+		with self._lock:
+			self.request_counts[service] = self.request_counts.get(service, 0) + 1
+
+		mean, jitter = self.latencies.get(service, (0, 0))
+		if mean or jitter:
+			time.sleep(max(self.random.gauss(mean, jitter), 0) / 1000)
+
+		if self.random.random() < self.error_rates.get(service.split('_')[0], 0):
+			return self._respond(request, 500, {'error': {'message': 'Mock service error', 'code': 'InternalServerError'}})
+
+		if self.api_key and self._request_key(service, request, query) != self.api_key:
+			return self._respond(request, 401, {'error': {'message': 'Invalid API key', 'code': 'Unauthorized'}})
+
+		payload = json.loads(body) if body and 'json' in (request.headers.get('Content-Type') or '') else {}
+		status, response = handler(payload, query)
+		self._respond(request, status, response)
+
+	def _request_key(self, service:str, request:BaseHTTPRequestHandler, query:dict) -> str:
+		"""
+		Returns the api key the request was sent with, wherever the real service expects it
+		"""
+		if service.startswith('openai'):
+			return (request.headers.get('Authorization') or '').replace('Bearer ', '')
+		if service in ['clu', 'translator']:
+			return request.headers.get('Ocp-Apim-Subscription-Key')
+		if service == 'weather':
+			return query.get('appid')
+		return query.get('apiKey')
+
+	def _respond(self, request:BaseHTTPRequestHandler, status:int, response) -> None:
+		if isinstance(response, bytes):
+			content, content_type = response, 'audio/mpeg'
+		else:
+			content, content_type = json.dumps(response).encode(), 'application/json'
+		request.send_response(status)
+		request.send_header('Content-Type', content_type)
+		request.send_header('Content-Length', str(len(content)))
+		request.end_headers()
+		request.wfile.write(content)
+
+	def _chat_completion(self, payload:dict, query:dict) -> tuple:
+		messages = payload.get('messages') or [{}]
+		question = messages[-1].get('content', '')
+		answer = f'This is a mock answer to: {question}'
+		prompt_tokens = sum(len(str(message.get('content', '')).split()) for message in messages)
+		return 200, {
+			'id': f'chatcmpl-mock{self.random.randrange(10**8)}',
+			'object': 'chat.completion',
+			'created': int(time.time()),
+			'model': payload.get('model', 'gpt-3.5-turbo'),
+			'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': answer}, 'finish_reason': 'stop'}],
+			'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': len(answer.split()), 'total_tokens': prompt_tokens + len(answer.split())},
+		}
+
+	def _audio_speech(self, payload:dict, query:dict) -> tuple:
+		# roughly one frame per word so longer input takes longer to transfer and decode
+		return 200, SILENT_MP3_FRAME * max(len(str(payload.get('input', '')).split()), 1)
+
+	def _analyze_conversation(self, payload:dict, query:dict) -> tuple:
+		"""
+		Recognizes a handful of the virtual assistant's intents by keyword, everything else is a low confidence 'None'
+		"""
+		text = payload.get('analysisInput', {}).get('conversationItem', {}).get('text', '')
+		lowered_text = text.lower()
+		entities = []
+
+		if 'weather' in lowered_text:
+			top_intent = 'Get_Weather'
+			location = re.search(r'\bin ([\w\s]+)', text)
+			if location:
+				entities.append(self._entity('location', location.group(1).strip(), text))
+		elif lowered_text.startswith('translate'):
+			top_intent = 'Translate_Speech'
+			translation = re.match(r'translate (.+) (?:to|into) (\w+)', text, re.IGNORECASE)
+			if translation:
+				entities.append(self._entity('speech', translation.group(1), text))
+				entities.append(self._entity('language', translation.group(2), text))
+		elif 'timer' in lowered_text:
+			top_intent = 'Start_Timer'
+			timer = re.search(r'(\d+) (second|minute|hour)s?', lowered_text)
+			if timer:
+				# the timer's entities are keyed by category
+				entities = {'user_timer': [timer.group(1)], 'metric': [f'{timer.group(2)}s']}
+		elif lowered_text.startswith('unmute'):
+			top_intent = 'Unmute'
+		elif lowered_text.startswith('mute'):
+			top_intent = 'Mute'
+		elif 'news' in lowered_text:
+			top_intent = 'Get_News'
+		elif 'password' in lowered_text:
+			top_intent = 'Generate_Password'
+		else:
+			top_intent = 'None'
+
+		score = 0.97 if top_intent != 'None' else 0.35
+		intents = [{'category': top_intent, 'confidenceScore': score}]
+		if top_intent != 'None':
+			intents.append({'category': 'None', 'confidenceScore': round(1 - score, 2)})
+
+		return 200, {
+			'kind': 'ConversationResult',
+			'result': {
+				'query': text,
+				'prediction': {'topIntent': top_intent, 'projectKind': 'Conversation', 'intents': intents, 'entities': entities},
+			},
+		}
+
+	def _entity(self, category:str, entity_text:str, text:str) -> dict:
+		return {'category': category, 'text': entity_text, 'offset': max(text.find(entity_text), 0), 'length': len(entity_text), 'confidenceScore': 1}
+
+	def _translate(self, payload:list, query:dict) -> tuple:
+		items = payload if isinstance(payload, list) else []
+		language = query.get('to', 'en')
+		return 200, [{'translations': [{'text': f"[{language}] {item.get('text', '')}", 'to': language}]} for item in items]
+
+	def _weather(self, payload:dict, query:dict) -> tuple:
+		location = query.get('q', '')
+		if not location or location.lower() == 'nowhere':
+			return 404, {'cod': '404', 'message': 'city not found'}
+		# a stable temperature per location so repeated runs give identical answers
+		temperature = 40 + sum(map(ord, location.lower())) % 50
+		return 200, {'name': location, 'main': {'temp': float(temperature), 'humidity': 50}, 'weather': [{'main': 'Clear'}]}
+
+	def _news(self, payload:dict, query:dict) -> tuple:
+		articles = [{'title': f'Mock headline {number}', 'description': f'A short description of mock story {number}.'} for number in range(1, 6)]
+		return 200, {'status': 'ok', 'source': query.get('source', 'bbc-news'), 'articles': articles}
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description='Serve local stand-ins for the services Juno uses')
+	parser.add_argument('--host', default='127.0.0.1')
+	parser.add_argument('--port', type=int, default=8900)
+	parser.add_argument('--profile', default='fast', choices=sorted(LATENCY_PROFILES))
+	parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with a 500 error')
+	parser.add_argument('--api-key', default=None, help='reject requests that use a different api key')
+	parser.add_argument('--seed', type=int, default=None)
+	args = parser.parse_args()
+
+	services = MockServices(args.host, args.port, args.profile, args.error_rate, args.api_key, args.seed)
+	print(f'Mock services listening on {services.url} ({args.profile} latency, {args.error_rate:.0%} errors)')
+	for variable, endpoint in services.environment().items():
+		print(f'  {variable}={endpoint}')
+
+	try:
+		services.server.serve_forever()
+	except KeyboardInterrupt:
+		services.stop()
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,24 @@
+import argparse
+import unittest
+from benchmarks.load_test import parse_mix, find_saturation
+
+class TestLoadTest(unittest.TestCase):
+    """Class for testing the load generator's helpers"""
+
+    def test_parse_mix(self):
+        utterances = parse_mix('password=2')
+        self.assertEqual(utterances, ["Generate a password", "Generate a password"])
+
+    def test_parse_mix_unknown_category(self):
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_mix('lottery=1')
+
+    def test_find_saturation(self):
+        levels = [{'concurrency': 1, 'throughput_per_second': 10}, {'concurrency': 2, 'throughput_per_second': 19}, {'concurrency': 4, 'throughput_per_second': 22}]
+        saturation = find_saturation(levels, 0.7)
+        self.assertEqual(saturation['max_scaling_concurrency'], 2)
+        self.assertEqual(saturation['saturated_at_concurrency'], 4)
+        self.assertEqual(levels[1]['scaling_efficiency'], 0.95)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import unittest
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+from benchmarks.mock_services import MockServices
+
+class TestMockServices(unittest.TestCase):
+    """Class for testing the local mock services"""
+
+    def setUp(self):
+        self.services = MockServices(api_key='test-key', seed=1).start()
+        self.endpoints = self.services.endpoints()
+
+    def tearDown(self):
+        self.services.stop()
+
+    def post(self, url, body, headers):
+        request = Request(url, data=json.dumps(body).encode(), headers={'Content-Type': 'application/json', **headers})
+        with urlopen(request) as response:
+            return json.loads(response.read())
+
+    def test_chat_completion(self):
+        response = self.post(f"{self.endpoints['openai']}/chat/completions", {'model': 'gpt-4', 'messages': [{'role': 'user', 'content': 'Hi'}]}, {'Authorization': 'Bearer test-key'})
+        self.assertEqual(response['choices'][0]['message']['content'], 'This is a mock answer to: Hi')
+        self.assertEqual(response['model'], 'gpt-4')
+
+    def test_analyze_conversation(self):
+        body = {'analysisInput': {'conversationItem': {'text': 'What is the weather in Chicago'}}}
+        response = self.post(f"{self.endpoints['clu']}/language/:analyze-conversations?api-version=2023-04-01", body, {'Ocp-Apim-Subscription-Key': 'test-key'})
+        prediction = response['result']['prediction']
+        self.assertEqual(prediction['topIntent'], 'Get_Weather')
+        self.assertEqual(prediction['entities'][0]['text'], 'Chicago')
+
+    def test_wrong_key_is_rejected(self):
+        with self.assertRaises(HTTPError) as error:
+            urlopen(f"{self.endpoints['weather']}/weather?q=Chicago&appid=wrong_key")
+        self.assertEqual(error.exception.code, 401)
+
+    def test_error_rate(self):
+        services = MockServices(error_rate=1.0).start()
+        self.addCleanup(services.stop)
+        with self.assertRaises(HTTPError) as error:
+            urlopen(f"{services.endpoints()['news']}/articles")
+        self.assertEqual(error.exception.code, 500)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from benchmarks.turn_latency import summarize, StageTimer
+
+class TestTurnLatency(unittest.TestCase):
+    """Class for testing the turn latency benchmark's helpers"""
+
+    def test_summarize(self):
+        summary = summarize([float(milliseconds) for milliseconds in range(1, 101)])
+        self.assertEqual(summary['count'], 100)
+        self.assertEqual(summary['mean_ms'], 50.5)
+        self.assertEqual(summary['p50_ms'], 51.0)
+        self.assertEqual(summary['p99_ms'], 100.0)
+        self.assertEqual(summary['max_ms'], 100.0)
+
+    def test_summarize_empty(self):
+        self.assertEqual(summarize([]), {'count': 0})
+
+    def test_stage_timer_wraps_method(self):
+        class Stage:
+            def run(self, value):
+                return value * 2
+
+        class Bot:
+            stage = Stage()
+
+        bot = Bot()
+        timer = StageTimer()
+        timer.wrap(bot, 'stage', 'run', 'double')
+        self.assertEqual(bot.stage.run(2), 4)
+        self.assertEqual(len(timer.samples['double']), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,372 @@
+"""
+End-to-end turn latency benchmark.
+
+Drives Juno.process in text mode through a scripted corpus of commands and GPT fallbacks against the local mock services,
+and reports per-stage and end-to-end latency distributions, throughput, allocations and peak RSS as JSON.
+
+Scenarios:
+	cold_start         imports and initializes Juno in fresh interpreters and times the first turn
+	warm               steady state latency of an initialized instance after a warm-up pass over the corpus
+	long_conversation  a single conversation of 1000+ turns, reported per window so growth with history length shows
+
+Usage:
+	python bench.py                                  # every scenario, results saved under benchmarks/results
+	python bench.py --scenario warm --turns 500 --latency realistic
+	python bench.py --compare benchmarks/results/previous.json
+"""
+
+import os
+import io
+import sys
+import atexit
+import json
+import time
+import shutil
+import platform
+import argparse
+import subprocess
+import contextlib
+import tracemalloc
+
+from benchmarks.mock_services import MockServices
+
+try:
+	import resource
+except ImportError:
+	resource = None
+
+# Commands recognized by the mock CLU service mixed with questions that fall back to GPT
+CORPUS = [
+	"What is the weather in Chicago",
+	"Tell me a fun fact about octopuses",
+	"Translate good morning to Spanish",
+	"Set a timer for 0 seconds",
+	"How do airplanes stay in the air?",
+	"Mute",
+	"Unmute",
+	"What is the weather in Paris",
+	"Can you recommend a good book to read?",
+	"Generate a password",
+	"Translate thank you very much into French",
+	"Why is the sky blue?",
+]
+
+BENCH_PROFILE_NAME = 'bench_profile'
+
+# The stages timed within each turn: (label, path to the object from the bot, method name)
+STAGES = [
+	('intent', 'speech_processor.get_intent', 'get_user_intent'),
+	('command', 'speech_processor.command_orchestrator', 'process_command'),
+	('gpt', 'speech_processor.command_orchestrator.command.request_gpt', 'ask_GPT'),
+	('history', 'speech_processor.manage_conversation_history', 'save_conversation_history'),
+]
+
+class StageTimer:
+	"""
+	Wraps methods of a live Juno instance and records how long every call takes
+	"""
+
+	def __init__(self):
+		self.samples = {}
+
+	def wrap(self, bot:object, path:str, method_name:str, label:str) -> None:
+		target = bot
+		for attribute in path.split('.'):
+			target = getattr(target, attribute)
+		method = getattr(target, method_name)
+
+		def timed(*args, **kwargs):
+			start_time = time.perf_counter()
+			try:
+				return method(*args, **kwargs)
+			finally:
+				self.record(label, time.perf_counter() - start_time)
+
+		setattr(target, method_name, timed)
+
+	def record(self, label:str, seconds:float) -> None:
+		self.samples.setdefault(label, []).append(seconds * 1000)
+
+	def reset(self) -> None:
+		self.samples = {}
+
+class TemporaryProfile:
+	"""
+	Creates a throwaway copy of the default profile and removes it afterwards, so the benchmark neither reads nor grows
+	a real profile's history and logs. Bots are given the profile by name (see create_bot), the current profile in
+	"master_settings.json" is never changed.
+	"""
+
+	def __init__(self, profile_name:str=BENCH_PROFILE_NAME):
+		self.profile_name = profile_name
+
+	def __enter__(self):
+		from src.customization.profiles.profile_manager import ProfileManager
+
+		config = ProfileManager()._load_profile_data('default')
+		config['system'].update({'package': 'virtual_assistant', 'gpt_model': 'gpt-3.5-turbo', 'startup_sound': False})
+		config['entity'].update({'language': 'english', 'persona': None})
+		ProfileManager().create_profile(config, self.profile_name)
+		# also removed if the run is stopped without unwinding, e.g. by sys.exit in a command
+		atexit.register(self.remove)
+		return self
+
+	def __exit__(self, *exc_info):
+		atexit.unregister(self.remove)
+		self.remove()
+
+	def remove(self) -> None:
+		from src.customization.profiles.profile_manager import profiles_path
+		shutil.rmtree(os.path.join(profiles_path, self.profile_name), ignore_errors=True)
+
+def bench_api_keys(endpoints:dict) -> dict:
+	"""
+	Api keys for running against the mock services, no real secrets are read
+	"""
+	return {
+		'OPENAI-API-KEY': 'bench-key',
+		'WEATHER-API-KEY': 'bench-key',
+		'NEWS-API-KEY': 'bench-key',
+		'TRANSLATOR-API-KEY': 'bench-key',
+		'ELEVENLABS-API-KEY': 'bench-key',
+		'SPOTIFY-CLIENT-ID': 'bench-key',
+		'SPOTIFY-CLIENT-SECRET': 'bench-key',
+		'COGNITIVE-SERVICES-API-KEY': 'bench-key',
+		'CLU-API-KEY': 'bench-key',
+		'CLU-ENDPOINT': endpoints['clu'],
+		'CLU-PROJECT-NAME': 'Juno',
+		'CLU-TRAINING-MODEL-NAME': 'Model1',
+		'REGION': 'eastus',
+	}
+
+def create_bot(endpoints:dict):
+	"""
+	Initializes a text mode Juno that uses the mock services and the benchmark's profile
+	"""
+	from src.initialization import shared_resources
+	from src.juno import Juno
+
+	shared_resources.use_api_keys(bench_api_keys(endpoints))
+	with contextlib.redirect_stdout(io.StringIO()):
+		return Juno(mode='text', profile_name=BENCH_PROFILE_NAME)
+
+def run_turns(bot:object, turns:int, timer:StageTimer) -> list:
+	"""
+	Processes the given number of turns from the corpus and returns each turn's latency in milliseconds.
+	Juno prints every turn, so its output is discarded while the turn is timed.
+	"""
+	latencies = []
+	with contextlib.redirect_stdout(io.StringIO()) as output:
+		for turn in range(turns):
+			speech = CORPUS[turn % len(CORPUS)]
+			start_time = time.perf_counter()
+			bot.process(speech)
+			latencies.append((time.perf_counter() - start_time) * 1000)
+			timer.record('turn', latencies[-1] / 1000)
+			# keep the captured output from growing with the run
+			output.seek(0)
+			output.truncate()
+	return latencies
+
+def instrument(bot:object) -> StageTimer:
+	timer = StageTimer()
+	for label, path, method_name in STAGES:
+		try:
+			timer.wrap(bot, path, method_name, label)
+		except AttributeError:
+			# the stage does not exist in this configuration (e.g. no package, so no CLU)
+			pass
+	return timer
+
+def summarize(samples:list) -> dict:
+	"""
+	Returns the distribution of a list of milliseconds
+	"""
+	if not samples:
+		return {'count': 0}
+	ordered = sorted(samples)
+
+	def percentile(share:float) -> float:
+		return round(ordered[min(int(share * len(ordered)), len(ordered) - 1)], 3)
+
+	return {
+		'count': len(ordered),
+		'mean_ms': round(sum(ordered) / len(ordered), 3),
+		'p50_ms': percentile(0.50),
+		'p90_ms': percentile(0.90),
+		'p99_ms': percentile(0.99),
+		'max_ms': round(ordered[-1], 3),
+	}
+
+def peak_rss_mb() -> float:
+	if resource is None:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# reported in kilobytes on Linux and bytes on macOS
+	return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def measure(bot:object, turns:int, trace_allocations:bool) -> dict:
+	"""
+	Runs the turns and returns their stage distributions, throughput and memory use
+	"""
+	timer = instrument(bot)
+	if trace_allocations:
+		tracemalloc.start()
+		allocated_before = tracemalloc.get_traced_memory()[0]
+
+	start_time = time.perf_counter()
+	latencies = run_turns(bot, turns, timer)
+	elapsed = time.perf_counter() - start_time
+
+	result = {
+		'turns': turns,
+		'throughput_turns_per_second': round(turns / elapsed, 2),
+		'stages': {label: summarize(samples) for label, samples in timer.samples.items()},
+		'peak_rss_mb': peak_rss_mb(),
+		'latencies_ms': latencies,
+	}
+	if trace_allocations:
+		current, peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+		result['allocations'] = {
+			'retained_kb': round((current - allocated_before) / 1024, 1),
+			'retained_bytes_per_turn': round((current - allocated_before) / turns),
+			'peak_traced_kb': round(peak / 1024, 1),
+		}
+	return result
+
+def cold_start(services:MockServices, runs:int) -> dict:
+	"""
+	Times importing Juno, initializing it and its first turn in fresh interpreters
+	"""
+	samples = {'import': [], 'init': [], 'first_turn': []}
+	environment = {**os.environ, **services.environment()}
+	for _ in range(runs):
+		process = subprocess.run([sys.executable, '-m', 'benchmarks.turn_latency', '--cold-start-child'], env=environment, capture_output=True, text=True)
+		if process.returncode != 0:
+			return {'error': process.stderr.strip().splitlines()[-1] if process.stderr.strip() else f'exit status {process.returncode}'}
+		timings = json.loads(process.stdout.strip().splitlines()[-1])
+		for stage, milliseconds in timings.items():
+			samples[stage].append(milliseconds)
+	return {'runs': runs, 'stages': {stage: summarize(values) for stage, values in samples.items()}}
+
+def cold_start_child() -> None:
+	"""
+	Runs in the fresh interpreter started by cold_start and prints its timings as JSON
+	"""
+	from src.utilities.http.service_endpoints import retrieve_service_endpoint
+
+	start_time = time.perf_counter()
+	from src.juno import Juno
+	imported = time.perf_counter()
+	bot = create_bot({'clu': retrieve_service_endpoint('clu')})
+	initialized = time.perf_counter()
+	with contextlib.redirect_stdout(io.StringIO()):
+		bot.process(CORPUS[0])
+	finished = time.perf_counter()
+
+	print(json.dumps({
+		'import': (imported - start_time) * 1000,
+		'init': (initialized - imported) * 1000,
+		'first_turn': (finished - initialized) * 1000,
+	}))
+
+def warm(services:MockServices, turns:int, trace_allocations:bool) -> dict:
+	bot = create_bot(services.endpoints())
+	# a pass over the whole corpus creates every lazily initialized command and opens the pooled connections
+	run_turns(bot, len(CORPUS), StageTimer())
+	result = measure(bot, turns, trace_allocations)
+	result.pop('latencies_ms')
+	return result
+
+def long_conversation(services:MockServices, turns:int, trace_allocations:bool, window:int=100) -> dict:
+	bot = create_bot(services.endpoints())
+	result = measure(bot, turns, trace_allocations)
+
+	# mean latency per window of turns, a rising trend means a turn's cost grows with the conversation's length
+	latencies = result.pop('latencies_ms')
+	windows = [latencies[start:start + window] for start in range(0, len(latencies), window)]
+	result['window_mean_ms'] = [round(sum(samples) / len(samples), 3) for samples in windows]
+	if len(windows) > 1:
+		result['last_to_first_window_ratio'] = round(result['window_mean_ms'][-1] / result['window_mean_ms'][0], 2)
+	return result
+
+def compare(current:dict, previous:dict) -> None:
+	"""
+	Prints how each scenario's end-to-end latency changed against a previous run
+	"""
+	print('\nCompared with the previous run:')
+	for scenario, result in current['scenarios'].items():
+		previous_stages = previous.get('scenarios', {}).get(scenario, {}).get('stages', {})
+		for stage, summary in result.get('stages', {}).items():
+			if stage not in ['turn', 'init', 'first_turn'] or stage not in previous_stages:
+				continue
+			for statistic in ['p50_ms', 'p90_ms']:
+				before, after = previous_stages[stage].get(statistic), summary.get(statistic)
+				if before and after:
+					print(f'  {scenario:<18} {stage:<10} {statistic:<7} {before:9.2f} -> {after:9.2f} ms ({(after - before) / before:+.1%})')
+
+def git_commit() -> str:
+	try:
+		return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip() or None
+	except OSError:
+		return None
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description='Benchmark the latency of Juno turns against local mock services')
+	parser.add_argument('--scenario', action='append', choices=['cold_start', 'warm', 'long_conversation'], help='may be repeated, defaults to all')
+	parser.add_argument('--turns', type=int, default=200, help='measured turns in the warm scenario')
+	parser.add_argument('--long-turns', type=int, default=1000, help='turns in the long conversation scenario')
+	parser.add_argument('--cold-runs', type=int, default=3, help='fresh interpreters started by the cold start scenario')
+	parser.add_argument('--latency', default='fast', help='mock service latency profile: fast, realistic or degraded')
+	parser.add_argument('--error-rate', type=float, default=0.0)
+	parser.add_argument('--no-tracemalloc', action='store_true', help='skip allocation tracing, which slows turns down')
+	parser.add_argument('--output', default=None, help='where to save the results (default: benchmarks/results/bench-<time>.json)')
+	parser.add_argument('--compare', default=None, help='a previous results file to compare against')
+	parser.add_argument('--cold-start-child', action='store_true', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.cold_start_child:
+		cold_start_child()
+		return 0
+
+	scenarios = args.scenario or ['cold_start', 'warm', 'long_conversation']
+	trace_allocations = not args.no_tracemalloc
+	results = {
+		'meta': {
+			'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+			'commit': git_commit(),
+			'python': platform.python_version(),
+			'platform': platform.platform(),
+			'arguments': {key: value for key, value in vars(args).items() if key != 'cold_start_child'},
+		},
+		'scenarios': {},
+	}
+
+	with MockServices(profile=args.latency, error_rate=args.error_rate, seed=0) as services, TemporaryProfile():
+		os.environ.update(services.environment())
+		for scenario in scenarios:
+			print(f'Running {scenario}...')
+			if scenario == 'cold_start':
+				results['scenarios'][scenario] = cold_start(services, args.cold_runs)
+			elif scenario == 'warm':
+				results['scenarios'][scenario] = warm(services, args.turns, trace_allocations)
+			else:
+				results['scenarios'][scenario] = long_conversation(services, args.long_turns, trace_allocations)
+		results['meta']['mock_requests'] = dict(services.request_counts)
+
+	output = args.output or os.path.join('benchmarks', 'results', f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+	os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+	with open(output, 'w', encoding='utf-8') as f:
+		json.dump(results, f, indent=2)
+
+	print(json.dumps(results['scenarios'], indent=2))
+	print(f'\nResults saved to {output}')
+
+	if args.compare:
+		with open(args.compare, 'r', encoding='utf-8') as f:
+			compare(results, json.load(f))
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -1,6 +1,5 @@
 from .utils.secret_retrieval_handler import SecretRetrieval
 from .utils.encryption_handler import EncryptionHandler
-from .utils.key_vault_handler import KeyVaultManager
 
 class ConfigurationManager:
 	"""
@@ -12,9 +11,19 @@ class ConfigurationManager:
   
 		self.data = self.secret_manager._load_in_data()
 		self.key_vault_name = self.retrieve_config_value('KEYVAULT_NAME')
-		self.key_vault = KeyVaultManager(self.key_vault_name)
+		self._key_vault = None
 		self.preferred_secret_storage = self.data['preferred_secret_storage']
 		self.api_keys = self.data['api_keys']
+
+	@property
+	def key_vault(self) -> object:
+		"""
+		The Azure Key Vault client, created on first use so local and environment storage never load the Azure identity SDK
+		"""
+		if self._key_vault is None:
+			from .utils.key_vault_handler import KeyVaultManager
+			self._key_vault = KeyVaultManager(self.key_vault_name)
+		return self._key_vault
   
 	def initial_setup(self) -> None:
 		"""
@@ -32,7 +41,7 @@ class ConfigurationManager:
 		secret values are stored in a hash map for ease of use
    		"""
 		if self.preferred_secret_storage == 'azure':
-			api_keys = self.secret_manager._get_keyvault_secrets(self.api_keys, self.key_vault_name)
+			api_keys = self.secret_manager._get_keyvault_secrets(self.api_keys, self.key_vault)
 		elif self.preferred_secret_storage == 'environment':
 			api_keys = self.secret_manager._get_environment_secrets(self.api_keys)
 		elif self.preferred_secret_storage == 'local':
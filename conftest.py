@@ -0,0 +1,13 @@
+import pytest
+from src.utilities.logs.metrics_store import MetricsStore, use_metrics_store
+
+@pytest.fixture(autouse=True, scope='session')
+def metrics_store_in_temporary_directory(tmp_path_factory):
+    """
+    Metrics recorded by the code under test go to a temporary file instead of the working tree
+    """
+    store = MetricsStore(str(tmp_path_factory.mktemp('metrics') / 'metrics.jsonl'))
+    use_metrics_store(store)
+    yield store
+    store.flush()
+    use_metrics_store(None)
@@ -1,7 +1,7 @@
 import streamlit as st
 from PIL import Image
-import os
-from src.juno import Juno
+from gui.juno_runner import JunoRunner
+from gui.data_cache import list_profiles
 from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
 
 # import pages
@@ -10,43 +10,55 @@ from gui.pages.profiles import profile_interaface
 from gui.pages.packages import package_interface
 from gui.pages.voice_cloning import voice_cloning_interface
 from gui.pages.fine_tuning import fine_tuning_interface
+from gui.pages.performance import performance_interface
 
 def run_juno():
     
-    all_profiles = os.listdir('src/customization/profiles/profile_storage')
+    all_profiles = list_profiles()
     selected_profile = st.sidebar.selectbox("Choose a Profile", all_profiles)
     
-    # Initialize session states if not already set
-    if 'chat_started' not in st.session_state:
-        st.session_state.chat_started = False
+    # Juno runs in a worker process that outlives the page's reruns, one per browser session
+    if 'juno_runner' not in st.session_state:
+        st.session_state.juno_runner = JunoRunner()
+    runner = st.session_state.juno_runner
         
     col1, col2 = st.sidebar.columns(2) 
     with col1:
-        if st.button("Begin Session"):
-            MasterSettingsManager().save_property("status", True, "session")
-            st.session_state.chat_started = True 
+        if st.button("Begin Session", disabled=runner.is_running()):
+            master_settings = MasterSettingsManager()
+            master_settings.save_property("status", True, "session")
+            master_settings.save_property("profile", selected_profile)
+            runner.start()
     with col2:
         if st.button("Reset Session"):
+            runner.stop()
             MasterSettingsManager().save_property("status", False, "session")
-            st.session_state.chat_started = False
         
-    if not st.session_state.chat_started:
+    if not runner.is_running() and not runner.turns:
         img_path = 'gui/logo.png'
         img = Image.open(img_path)
         st.image(img, use_column_width=True)
-
-    elif st.session_state.chat_started:
+    else:
         st.title('Conversation History:')
-        MasterSettingsManager().save_property("profile", selected_profile)
-        MasterSettingsManager().save_property("functions", True, "gui")
-        new_session = Juno()
-        new_session.run()
-        st.session_state.chat_started = False
+        show_conversation(runner)
+
+@st.fragment(run_every=1)
+def show_conversation(runner):
+    """
+    Shows the session's turns, rerunning every second on its own so new turns appear without reloading the page
+    """
+    runner.poll_events()
+    st.caption(f"Juno is {runner.state}" + (f": {runner.error}" if runner.error else ""))
+    for turn in runner.turns:
+        with st.chat_message("user"):
+            st.write(turn['user'])
+        with st.chat_message("assistant"):
+            st.write(turn['response'])
         
 def main_interface():
     
     # Create a select box for page navigation
-    page = st.sidebar.selectbox("Choose a page", ["Juno", "Overview", "Profiles", "Packages", "Voice Cloning", "Fine Tuning"])
+    page = st.sidebar.selectbox("Choose a page", ["Juno", "Overview", "Profiles", "Packages", "Voice Cloning", "Fine Tuning", "Performance"])
 
     # Display content for selected page
     if page == "Juno":
@@ -61,3 +73,5 @@ def main_interface():
         voice_cloning_interface()  
     elif page == "Fine Tuning":
         fine_tuning_interface()
+    elif page == "Performance":
+        performance_interface()
@@ -0,0 +1,109 @@
+"""
+Cached data access for the GUI pages.
+
+Streamlit reruns a page on every widget interaction, so anything a page reads from disk is read again each time.
+Reads go through Streamlit's data cache instead: profile files are cached per file and keyed by their modification time,
+so a profile changed outside the GUI (e.g. by a voice command) is picked up on the next rerun, and every write made by
+the GUI goes through the functions below, which clear the affected entries right away. Every change to a file leaves its
+previous entry behind, so the number of entries kept is bounded.
+"""
+
+import os
+import yaml
+import streamlit as st
+
+profiles_path = 'src/customization/profiles/profile_storage'
+packages_path = 'src/customization/packages'
+
+def _modified_time(path:str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return 0.0
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _list_profiles(modified_time:float) -> list:
+    return sorted(name for name in os.listdir(profiles_path) if os.path.isdir(os.path.join(profiles_path, name)))
+
+def list_profiles() -> list:
+    """
+    Returns the names of every profile
+    """
+    return _list_profiles(_modified_time(profiles_path))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _load_profile(profile_name:str, modified_time:float) -> dict:
+    with open(os.path.join(profiles_path, profile_name, 'settings.yaml'), 'r') as file:
+        return yaml.safe_load(file)
+
+def load_profile(profile_name:str) -> dict:
+    """
+    Returns a profile's settings, the returned dict is a copy and may be edited
+    """
+    return _load_profile(profile_name, _modified_time(os.path.join(profiles_path, profile_name, 'settings.yaml')))
+
+# histories can be large, only those of the last few profiles viewed are kept
+@st.cache_data(show_spinner=False, max_entries=8)
+def _load_conversation_history(profile_name:str, modified_time:float) -> dict:
+    try:
+        with open(os.path.join(profiles_path, profile_name, 'conversation_history.yaml'), 'r', encoding='utf-8') as file:
+            return yaml.safe_load(file) or {}
+    except FileNotFoundError:
+        return {}
+
+def load_conversation_history(profile_name:str) -> dict:
+    """
+    Returns a profile's conversation history, re-read only when the file has changed
+    """
+    return _load_conversation_history(profile_name, _modified_time(os.path.join(profiles_path, profile_name, 'conversation_history.yaml')))
+
+@st.cache_data(show_spinner=False, ttl=300)
+def load_profile_options() -> tuple:
+    """
+    Returns the languages, GPT models, packages and voices a profile can choose from
+    """
+    from configuration.manage_secrets import ConfigurationManager
+    from src.customization.voices.voice_settings_manager import VoiceSettingsManager
+
+    voice_settings = VoiceSettingsManager()
+    available_languages = voice_settings.retrieve_available_languages()
+    available_voices = voice_settings.retrieve_available_voices()
+
+    all_gpt_models = []
+    for model in ConfigurationManager().retrieve_config_value('GPT-MODELS'):
+        if isinstance(model, dict):
+            all_gpt_models.extend(model.keys())
+        else:
+            all_gpt_models.append(model)
+
+    available_packages = [None] + sorted(os.listdir(packages_path))
+
+    return available_languages, all_gpt_models, available_packages, available_voices
+
+def save_profile(profile_name:str, profile:dict) -> None:
+    """
+    Writes a profile's settings and clears its cached copy
+    """
+    with open(os.path.join(profiles_path, profile_name, 'settings.yaml'), 'w') as file:
+        yaml.dump(profile, file, default_flow_style=False)
+    _load_profile.clear()
+
+def create_profile(profile_name:str, config:dict) -> None:
+    """
+    Creates a profile and clears the cached profile list
+    """
+    from usage.create_profile.create_new_profile import create_custom_profile
+
+    create_custom_profile(config=config, profile_name=profile_name)
+    _list_profiles.clear()
+
+def remove_profile(profile_name:str) -> None:
+    """
+    Removes a profile and clears everything cached about it
+    """
+    from src.customization.profiles.profile_manager import ProfileManager
+
+    ProfileManager().remove_profile(profile_name=profile_name)
+    _list_profiles.clear()
+    _load_profile.clear()
+    _load_conversation_history.clear()
@@ -0,0 +1,146 @@
+"""
+Runs a voice Juno session in a separate process on behalf of the Streamlit GUI.
+
+Streamlit re-executes its page script on every interaction, so Juno cannot run inside it: its loop never returns and
+would freeze the page. Instead the page keeps a JunoRunner in its session state, which starts Juno in a worker process
+once per session and talks to it over two queues: commands ('stop', 'status') go to the worker, and events (state
+changes and every conversation turn) come back and are drained by the page without blocking.
+"""
+
+import time
+import queue
+import threading
+import multiprocessing
+
+class JunoRunner:
+    """
+    Starts, stops and follows a Juno worker process from the GUI
+    """
+
+    def __init__(self, target=None, stop_timeout:float=10):
+        """
+        :param target: (callable) function run by the worker process, given the commands and events queues
+        :param stop_timeout: (float) seconds a worker has to stop once asked before it is terminated
+        """
+        # spawn, so the worker does not inherit the Streamlit server's threads and open sockets
+        self.context = multiprocessing.get_context('spawn')
+        self.target = target or run_worker
+        self.stop_timeout = stop_timeout
+        self.stop_requested = None
+        self.process = None
+        self.commands = None
+        self.events = None
+        self.state = 'stopped'
+        self.error = None
+        self.turns = []
+
+    def start(self) -> bool:
+        """
+        Starts a Juno worker for the current profile, returns False if one is already running
+        """
+        if self.is_running():
+            return False
+
+        self.commands = self.context.Queue()
+        self.events = self.context.Queue()
+        self.state = 'starting'
+        self.error = None
+        self.turns = []
+        self.stop_requested = None
+        self.process = self.context.Process(target=self.target, args=(self.commands, self.events), daemon=True, name='juno-gui-worker')
+        self.process.start()
+        return True
+
+    def stop(self) -> None:
+        """
+        Asks the worker to stop once its current turn is complete without waiting for it,
+        the exit is picked up by a later poll, which terminates the worker if it does not stop in time
+        """
+        if not self.is_running() or self.stop_requested is not None:
+            return
+        self.state = 'stopping'
+        self.stop_requested = time.monotonic()
+        self.commands.put('stop')
+
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def poll_events(self) -> list:
+        """
+        Applies every event the worker has sent since the last poll and returns the new conversation turns
+        """
+        new_turns = []
+        if self.events is None:
+            return new_turns
+
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event['type'] == 'turn':
+                self.turns.append(event)
+                new_turns.append(event)
+            elif event['type'] == 'state':
+                self.state = event['state']
+                self.error = event.get('error')
+
+        if self.process is not None:
+            if not self.process.is_alive():
+                # reap the worker, it may also have died without reporting it (e.g. it was killed)
+                self.process.join()
+                if self.state not in ['stopped', 'failed']:
+                    self.state = 'stopped'
+            elif self.stop_requested is not None and time.monotonic() - self.stop_requested > self.stop_timeout:
+                self.process.terminate()
+        return new_turns
+
+    def status(self) -> dict:
+        """
+        Returns the worker's last known state and asks it for a fresh one, which arrives with a later poll
+        """
+        if self.is_running():
+            self.commands.put('status')
+        self.poll_events()
+        return {"state": self.state, "error": self.error, "turns": len(self.turns), "pid": self.process.pid if self.is_running() else None}
+
+def run_worker(commands, events) -> None:
+    """
+    Runs in the worker process: initializes Juno once, then runs it until it is stopped or exits,
+    reporting state changes and every turn as events
+    """
+    stop_event = threading.Event()
+    started = time.time()
+    current_state = {"state": None}
+
+    def send_state(state, error=None):
+        current_state["state"] = state
+        events.put({"type": "state", "state": state, "error": error, "uptime": round(time.time() - started, 1)})
+
+    def follow_commands():
+        while True:
+            command = commands.get()
+            if command == 'stop':
+                stop_event.set()
+                return
+            if command == 'status':
+                send_state('stopping' if stop_event.is_set() else current_state["state"])
+
+    def send_turn(speech, response):
+        events.put({"type": "turn", "user": speech, "response": response, "time": time.strftime('%H:%M:%S')})
+
+    threading.Thread(target=follow_commands, daemon=True, name='juno-gui-commands').start()
+
+    send_state('initializing')
+    try:
+        from src.juno import Juno
+        bot = Juno()
+        send_state('running')
+        bot.run(stop_event=stop_event, on_turn=send_turn)
+    except SystemExit:
+        # the bot exits on a quit command or after a period of inactivity
+        pass
+    except Exception as e:
+        send_state('failed', str(e))
+        return
+    send_state('stopped')
@@ -1,5 +1,6 @@
 import streamlit as st
 from training.begin_gpt_training_session import OpenAIFineTuningJob
+from training.validate_gpt_training_data import DatasetValidator
 from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
 from src.customization.profiles.profile_manager import ProfileManager
 from src.customization.voices.voice_settings_manager import VoiceSettingsManager
@@ -18,15 +19,38 @@ def fine_tune_GPT():
     
     model_name = st.text_input("Model Name:")
     file = st.file_uploader("Training Data (.jsonl format)", type=["jsonl"])
+
+    if file:
+        show_validation_report(file)
     
     if st.button("Begin Training"):
         if model_name and file:
-            OpenAIFineTuningJob().start_finetuning(model_name=model_name, file=file)
-            st.success("🎉 Training started successfully!")
-            st.info("📩 An email notification from OpenAI will arrive shortly with your job ID. Once received, you can use the integration section below to add your new model into Juno.")
+            file.seek(0)
+            job_id = OpenAIFineTuningJob().start_finetuning(model_name=model_name, file=file)
+            if job_id:
+                st.success(f"🎉 Training started successfully! Job ID: {job_id}")
+                st.info("📩 An email notification from OpenAI will arrive once training is complete. You can then use the integration section below to add your new model into Juno.")
+            else:
+                st.error("⚠️ The fine-tuning job could not be started, see the console for details.")
         else:
             st.warning("⚠️ Ensure you provide both a model name and the training data to proceed.")
 
+def show_validation_report(file):
+    """
+    Shows how many of the uploaded examples are usable and what training on them will cost, before anything is uploaded.
+    """
+    report = DatasetValidator().validate(file)
+    file.seek(0)
+
+    columns = st.columns(4)
+    columns[0].metric("Usable Examples", f"{report['valid_examples']} / {report['examples']}")
+    columns[1].metric("Duplicates Dropped", report['exact_duplicates'] + report['near_duplicates'])
+    columns[2].metric("Billed Tokens", f"{report['billed_tokens']:,}", help=f"{report['epochs']} epochs")
+    columns[3].metric("Estimated Cost", f"${report['estimated_cost_usd']:.2f}" if report['estimated_cost_usd'] is not None else "unknown")
+
+    for error, details in report['errors'].items():
+        st.warning(f"⚠️ {details['count']} example(s) skipped: {error} (lines {', '.join(map(str, details['lines']))})")
+
 def add_model_to_juno():
     """
     Integrates a fine-tuned GPT model into Juno.
@@ -0,0 +1,145 @@
+import math
+import time
+import pandas as pd
+import streamlit as st
+from collections import deque
+from datetime import datetime
+from src.utilities.logs.metrics_store import read_metrics
+
+# Turn stages recorded by the speech processor, in the order they run
+STAGES = ['intent_ms', 'command_ms', 'history_ms', 'total_ms']
+# Caches shown even before they have recorded a lookup
+CACHES = ['tts', 'clu', 'gpt', 'weather']
+WINDOWS = {"Last 15 minutes": (900, 60), "Last hour": (3600, 300), "Last 24 hours": (86400, 3600), "Everything loaded": (None, 3600)}
+
+# Records kept in memory, and how much of a long metrics file is read when the page is first opened
+MAX_RECORDS = 100000
+INITIAL_READ_BYTES = 20 * 1024 * 1024
+
+def load_new_metrics() -> deque:
+    """
+    Reads only the records appended to the metrics file since the last rerun and adds them to those already loaded
+    """
+    if 'performance_metrics' not in st.session_state:
+        st.session_state.performance_metrics = {"position": None, "records": deque(maxlen=MAX_RECORDS)}
+    metrics = st.session_state.performance_metrics
+
+    records, metrics['position'] = read_metrics(position=metrics['position'], max_bytes=INITIAL_READ_BYTES)
+    metrics['records'].extend(records)
+    return metrics['records']
+
+def percentile(values:list, q:float) -> float:
+    """
+    Returns the q-th percentile of the values using the nearest rank
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, math.ceil(round(q / 100 * len(values), 6)) - 1)]
+
+def stage_percentiles(turns:list) -> pd.DataFrame:
+    """
+    Returns the p50, p90 and p99 latency of every stage of the given turns
+    """
+    rows = []
+    for stage in STAGES:
+        values = [turn[stage] for turn in turns if turn.get(stage) is not None]
+        rows.append({"Stage": stage[:-3].title(), "Turns": len(values), "p50 (ms)": percentile(values, 50), "p90 (ms)": percentile(values, 90), "p99 (ms)": percentile(values, 99)})
+    return pd.DataFrame(rows)
+
+def percentiles_over_time(turns:list, stage:str, bucket_seconds:int) -> pd.DataFrame:
+    """
+    Returns the p50 and p90 latency of a stage per time bucket
+    """
+    buckets = {}
+    for turn in turns:
+        if turn.get(stage) is not None:
+            buckets.setdefault(int(turn['ts'] // bucket_seconds * bucket_seconds), []).append(turn[stage])
+
+    rows = [{"Time": datetime.fromtimestamp(bucket), "p50": percentile(values, 50), "p90": percentile(values, 90)} for bucket, values in sorted(buckets.items())]
+    return pd.DataFrame(rows, columns=["Time", "p50", "p90"]).set_index("Time")
+
+def slowest_turns(turns:list, count:int=10) -> pd.DataFrame:
+    rows = [{
+        "Time": time.strftime('%d/%m %H:%M:%S', time.localtime(turn['ts'])),
+        "Speech": turn.get('speech'),
+        "Source": turn.get('source'),
+        "Profile": turn.get('profile'),
+        **{stage[:-3].title() + " (ms)": turn.get(stage) for stage in STAGES}
+    } for turn in sorted(turns, key=lambda turn: turn.get('total_ms') or 0, reverse=True)[:count]]
+    return pd.DataFrame(rows)
+
+def cache_hit_rates(lookups:list) -> pd.DataFrame:
+    """
+    Returns the lookups and hit rate of every cache, caches without lookups in the window are listed without a rate
+    """
+    names = CACHES + sorted({lookup['name'] for lookup in lookups} - set(CACHES))
+    rows = []
+    for name in names:
+        hits = [bool(lookup.get('hit')) for lookup in lookups if lookup['name'] == name]
+        rows.append({"Cache": name.upper(), "Lookups": len(hits), "Hit rate": f"{sum(hits) / len(hits):.0%}" if hits else "no data"})
+    return pd.DataFrame(rows)
+
+def upstream_error_rates(requests:list) -> pd.DataFrame:
+    """
+    Returns the requests, error rate and latency of every upstream service
+    """
+    services = {}
+    for request in requests:
+        services.setdefault(request['service'], []).append(request)
+
+    rows = []
+    for service, calls in sorted(services.items()):
+        errors = [call for call in calls if call.get('error')]
+        durations = [call['duration_ms'] for call in calls if call.get('duration_ms') is not None]
+        last_error = max(errors, key=lambda call: call['ts'])['error'] if errors else None
+        rows.append({"Service": service, "Requests": len(calls), "Errors": len(errors), "Error rate": f"{len(errors) / len(calls):.1%}",
+                     "Retried": sum(1 for call in calls if (call.get('attempts') or 1) > 1), "p90 (ms)": percentile(durations, 90), "Last error": last_error})
+    return pd.DataFrame(rows)
+
+@st.fragment(run_every=5)
+def show_dashboard(window_seconds:int, bucket_seconds:int):
+    """
+    Shows the dashboard, rerunning every few seconds on its own to pick up newly recorded metrics
+    """
+    records = load_new_metrics()
+    since = time.time() - window_seconds if window_seconds else 0
+
+    by_kind = {}
+    for record in records:
+        if record['ts'] >= since:
+            by_kind.setdefault(record['kind'], []).append(record)
+    turns = by_kind.get('turn', [])
+
+    st.subheader("⏱ Turn Latency")
+    if turns:
+        st.dataframe(stage_percentiles(turns), hide_index=True, use_container_width=True)
+        stage = st.selectbox("Stage", STAGES, index=STAGES.index('total_ms'), format_func=lambda stage: stage[:-3].title())
+        st.line_chart(percentiles_over_time(turns, stage, bucket_seconds))
+
+        st.subheader("🐢 Slowest Turns")
+        st.dataframe(slowest_turns(turns), hide_index=True, use_container_width=True)
+    else:
+        st.info("No turns have been recorded in this window yet. Begin a session on the Juno page to record some.")
+
+    st.subheader("🗄 Cache Hit Rates")
+    st.dataframe(cache_hit_rates(by_kind.get('cache', [])), hide_index=True, use_container_width=True)
+
+    st.subheader("🌐 Upstream Services")
+    upstream = by_kind.get('upstream', [])
+    if upstream:
+        st.dataframe(upstream_error_rates(upstream), hide_index=True, use_container_width=True)
+    else:
+        st.info("No upstream requests have been recorded in this window yet.")
+
+    st.caption(f"{len(records):,} records loaded, updated {time.strftime('%H:%M:%S')}")
+
+def performance_interface():
+    st.title("Performance")
+    st.write("Latency, cache and upstream metrics recorded by every Juno session, the page updates itself as new turns are recorded.")
+
+    window = st.sidebar.selectbox("Time Window", list(WINDOWS))
+    if st.sidebar.button("Reload Metrics"):
+        st.session_state.pop('performance_metrics', None)
+
+    show_dashboard(*WINDOWS[window])
@@ -1,37 +1,14 @@
 import streamlit as st
-import os
-import yaml
 from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
-from src.customization.profiles.profile_manager import ProfileManager
-from configuration.manage_secrets import ConfigurationManager
-from src.customization.voices.voice_settings_manager import VoiceSettingsManager
-from usage.create_profile.create_new_profile import create_custom_profile
+from gui.data_cache import list_profiles, load_profile, load_conversation_history, load_profile_options, save_profile, create_profile as create_new_profile, remove_profile as remove_existing_profile
 
 # Initialize session state
 if 'page_state' not in st.session_state:
     st.session_state.page_state = "default"
 
 def load_in_profile_data():
-    manager = ConfigurationManager()
-    available_languages = VoiceSettingsManager().retrieve_available_languages()
-    
-    all_gpt_models = []
-
-    gpt_models = manager.retrieve_config_value('GPT-MODELS')
-
-    for model in gpt_models:
-        if isinstance(model, dict):
-            all_gpt_models.extend(model.keys())
-        else:
-            all_gpt_models.append(model)
-
-
-    directory_path = "src/customization/packages"
-    available_packages = [None] + os.listdir(directory_path)
-    
-    available_voices = VoiceSettingsManager().retrieve_available_voices()
-    
-    return available_languages, all_gpt_models, available_packages, available_voices
+    # cached, the fields call this for every nested section on every rerun
+    return load_profile_options()
 
 def display_sorted_fields(profile_dict, parent_key=""):
     available_language, all_gpt_models, available_packages, available_voices = load_in_profile_data()
@@ -47,7 +24,7 @@ def display_sorted_fields(profile_dict, parent_key=""):
             'startup_sound': ([True, False], "Startup Sound"),
             'tts': (["Azure", "Elevenlabs"], "TTS Engine"),
             'voice_name': (available_voices, "Voice Name"),
-            'voice_recognition_engine': (['Azure'], "Voice Recognition Engine")
+            'voice_recognition_engine': (['Azure', 'Replay'], "Voice Recognition Engine")
         }
 
         if key.lower() in display_map:
@@ -79,7 +56,7 @@ def display_and_edit_fields(profile_dict, parent_key=""):
             'startup_sound': ([True, False], "Startup Sound"),
             'tts': (["Azure", "Elevenlabs"], "TTS Engine"),
             'voice_name': (available_voices, "Voice Name"),
-            'voice_recognition_engine': (['Azure'], "Voice Recognition Engine")
+            'voice_recognition_engine': (['Azure', 'Replay'], "Voice Recognition Engine")
         }
 
         if key.lower() in display_map:
@@ -105,7 +82,7 @@ def display_and_edit_fields2(profile_dict, parent_key=""):
             'startup_sound': ([True, False], "Startup Sound"),
             'tts': (["Azure", "Elevenlabs"], "TTS"),
             'voice_name': (available_voices, "Voice Name"),
-            'voice_recognition_engine': (['Azure'], "Voice Recognition Engine")
+            'voice_recognition_engine': (['Azure', 'Replay'], "Voice Recognition Engine")
         }
 
         if key.lower() in display_map:
@@ -192,19 +169,42 @@ def view_profile():
         """
     )
     
-    all_profiles = os.listdir('src/customization/profiles/profile_storage')
+    all_profiles = list_profiles()
     selected_profile = st.selectbox("Choose a Profile", all_profiles)
 
-    with open(f'src/customization/profiles/profile_storage/{selected_profile.lower()}/settings.yaml', 'r') as file:
-        profile = yaml.safe_load(file)
+    profile = load_profile(selected_profile)
 
     display_sorted_fields(profile)
 
     if st.button("Save Changes"):
-        with open(f'src/customization/profiles/profile_storage/{selected_profile.lower()}/settings.yaml', 'w') as file:
-            yaml.dump(profile, file, default_flow_style=False)
+        save_profile(selected_profile, profile)
         st.success(f"{selected_profile} has been updated!")
         MasterSettingsManager().save_property('profile', selected_profile)
+
+    show_conversation_history(selected_profile)
+
+def show_conversation_history(profile_name, sessions_shown=5):
+    """
+    Shows the profile's most recent conversations, the history is only re-read once it has changed
+    """
+    history = load_conversation_history(profile_name)
+    sessions = sorted((key for key, session in history.items() if str(key).startswith('Session') and isinstance(session, dict)),
+                      key=lambda key: int(str(key).split()[-1]) if str(key).split()[-1].isdigit() else 0, reverse=True)
+
+    with st.expander(f"Conversation History ({len(sessions)} sessions)"):
+        if not sessions:
+            st.write("No conversations have been recorded with this profile yet.")
+        for key in sessions[:sessions_shown]:
+            session = history[key]
+            st.markdown(f"**{key}** ({session.get('Date')} {session.get('Time')})")
+            for entry in session.get('Conversation') or []:
+                if not isinstance(entry, dict):
+                    continue
+                with st.chat_message("user"):
+                    st.write(entry.get('User'))
+                response = next((value for name, value in entry.items() if name not in ('User', 'Source')), None)
+                with st.chat_message("assistant"):
+                    st.write(response)
         
 def create_profile():
     st.title("Create a Profile")
@@ -216,15 +216,14 @@ def create_profile():
     profile_name = profile_name.replace(' ', '_')
     
     # load default profile 
-    with open(f'src/customization/profiles/profile_storage/default/settings.yaml', 'r') as file:
-        profile = yaml.safe_load(file)
+    profile = load_profile('default')
 
     display_and_edit_fields2(profile)
 
     if st.button("Create New Profile"):
         config = read_values_from_fields(profile)
 
-        create_custom_profile(config=config, profile_name=profile_name)
+        create_new_profile(profile_name, config)
         st.success(f"{profile_name} profile created!")
         MasterSettingsManager().save_property('profile', profile_name)
 
@@ -235,12 +234,12 @@ def remove_profile():
         """
         Use this interface to remove a preexisting profile.
         """)
-    all_profiles = os.listdir('src/customization/profiles/profile_storage')
+    all_profiles = list_profiles()
     selected_profile = st.selectbox("Choose a Profile", all_profiles)
 
     if st.button("Delete Profile"):
         if selected_profile != 'default':
-            ProfileManager().remove_profile(profile_name=selected_profile)
+            remove_existing_profile(selected_profile)
             MasterSettingsManager().save_property('profile', 'default')
             st.success(f"{selected_profile} profile deleted!")
         else:
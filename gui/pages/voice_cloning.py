@@ -1,7 +1,8 @@
 import streamlit as st
 from src.customization.voices.voice_settings_manager import VoiceSettingsManager
 from configuration.manage_secrets import ConfigurationManager
-import requests
+from src.utilities.http.http_transport import get_transport
+from gui.data_cache import load_profile_options
 
 def create_custom_voice(voice_name, file):
     """
@@ -23,7 +24,8 @@ def create_custom_voice(voice_name, file):
         'files': (file.name, file.getvalue(), 'audio/mpeg')
     }
 
-    response = requests.post(url, headers=headers, data=data, files=files)
+    # creating a voice is not idempotent, so it is never retried
+    response = get_transport().post(url, headers=headers, data=data, files=files, retries=0)
     return response.status_code == 200
 
 def create_and_save_custom_voice():
@@ -46,6 +48,8 @@ def create_and_save_custom_voice():
             if create_custom_voice(voice_name, file):
                 st.success(f"The voice '{voice_name}' has been successfully created!")
                 VoiceSettingsManager().save_custom_voice(voice_name=voice_name, type='custom')
+                # the new voice must show up in the profile pages' voice options
+                load_profile_options.clear()
                 
                 api_keys = ConfigurationManager().retrieve_api_keys()
                 
@@ -57,7 +61,7 @@ def create_and_save_custom_voice():
                 "xi-api-key": api_keys['ELEVENLABS-API-KEY']
                 }
 
-                response = requests.get(list_voices_url, headers=headers)
+                response = get_transport().get(list_voices_url, headers=headers)
 
                 # Assuming the response gives a list of voice objects
                 voices = response.json()
@@ -0,0 +1,79 @@
+import time
+import queue
+import threading
+import unittest
+from unittest.mock import Mock, patch
+from gui.juno_runner import JunoRunner, run_worker
+
+def cooperative_worker(commands, events):
+    """Stands in for Juno: reports a turn and stops when asked"""
+    events.put({"type": "state", "state": "running", "error": None})
+    events.put({"type": "turn", "user": "hello", "response": "hi", "time": "10:00:00"})
+    while commands.get() != 'stop':
+        pass
+    events.put({"type": "state", "state": "stopped", "error": None})
+
+def unresponsive_worker(commands, events):
+    """Stands in for a Juno that never finishes its turn"""
+    events.put({"type": "state", "state": "running", "error": None})
+    time.sleep(60)
+
+def poll_until(runner, condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        runner.poll_events()
+        time.sleep(0.05)
+    return condition()
+
+class TestJunoRunner(unittest.TestCase):
+    """Class for testing the JunoRunner"""
+
+    def test_start_poll_and_stop(self):
+        runner = JunoRunner(target=cooperative_worker)
+        self.assertTrue(runner.start())
+        self.assertFalse(runner.start())
+        self.assertTrue(poll_until(runner, lambda: runner.turns))
+        self.assertEqual(runner.state, 'running')
+        self.assertEqual(runner.turns[0]['response'], 'hi')
+
+        started = time.monotonic()
+        runner.stop()
+        # stopping does not wait for the worker
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(runner.state, 'stopping')
+        self.assertTrue(poll_until(runner, lambda: not runner.is_running() and runner.state == 'stopped'))
+
+    def test_unresponsive_worker_is_terminated(self):
+        runner = JunoRunner(target=unresponsive_worker, stop_timeout=0.2)
+        runner.start()
+        self.assertTrue(poll_until(runner, lambda: runner.state == 'running'))
+        runner.stop()
+        self.assertTrue(poll_until(runner, lambda: not runner.is_running()))
+        runner.poll_events()
+        self.assertEqual(runner.state, 'stopped')
+
+class TestRunWorker(unittest.TestCase):
+    """Class for testing the worker's events"""
+
+    def run_worker(self, bot):
+        commands, events = queue.Queue(), queue.Queue()
+        with patch('src.juno.Juno', return_value=bot):
+            thread = threading.Thread(target=run_worker, args=(commands, events))
+            thread.start()
+            thread.join(10)
+        return [events.get_nowait() for _ in range(events.qsize())]
+
+    def test_reports_turns_and_states(self):
+        bot = Mock()
+        bot.run.side_effect = lambda stop_event, on_turn: on_turn('hello', 'hi')
+        events = self.run_worker(bot)
+        self.assertEqual([event.get('state') or event['type'] for event in events], ['initializing', 'running', 'turn', 'stopped'])
+
+    def test_reports_failures(self):
+        bot = Mock()
+        bot.run.side_effect = RuntimeError('no microphone')
+        events = self.run_worker(bot)
+        self.assertEqual((events[-1]['state'], events[-1]['error']), ('failed', 'no microphone'))
+
+if __name__ == '__main__':
+    unittest.main()
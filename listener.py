@@ -1,21 +1,46 @@
+import threading
 from flask import Flask, request
 from src.juno import Juno
-import threading
+from src.utilities.sessions.worker_pool import JunoWorkerPool, WorkerPoolFullError
+from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
 
 app = Flask(__name__)
 
-def start_juno():
-    new_bot = Juno()
-    # Replace the while loop with new_bot.run() if applicable
-    while True:
-        speech = new_bot.listen()
-        response = new_bot.process(speech)
-        new_bot.verbalize(response)
+# Voice bots share the host's microphone and settings files, so only a bounded number may run at once.
+# The pool is created on the first request, so importing the listener does not touch the settings files.
+worker_pool = None
+worker_pool_lock = threading.Lock()
+
+def retrieve_worker_pool():
+    global worker_pool
+    # requests are served on several threads, only the first one creates the pool
+    with worker_pool_lock:
+        if worker_pool is None:
+            worker_pool = JunoWorkerPool(bot_factory=Juno, max_workers=MasterSettingsManager().retrieve_property('server', 'max_voice_workers'))
+    return worker_pool
 
 @app.route('/start_juno', methods=['POST'])
 def handle_request():
-    threading.Thread(target=start_juno).start()
-    return "Juno started", 200
+    worker_pool = retrieve_worker_pool()
+    try:
+        worker = worker_pool.start_worker()
+    except WorkerPoolFullError as e:
+        return {"error": str(e), **worker_pool.status()}, 429, {"Retry-After": "30"}
+    return {"message": "Juno started", **worker.status()}, 202
+
+@app.route('/stop_juno', methods=['POST'])
+def handle_stop_request():
+    worker_pool = retrieve_worker_pool()
+    worker_id = (request.get_json(silent=True) or {}).get('worker_id')
+    if worker_id is None:
+        return {"message": f"Stopping {worker_pool.stop_all_workers()} Juno worker(s)"}, 200
+    if not worker_pool.stop_worker(worker_id):
+        return {"error": f"Juno worker {worker_id} is not running"}, 404
+    return {"message": f"Stopping Juno worker {worker_id}"}, 200
+
+@app.route('/status', methods=['GET'])
+def handle_status_request():
+    return retrieve_worker_pool().status(), 200
 
 if __name__ == "__main__":
     app.run(host='0.0.0.0', port=5000)
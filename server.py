@@ -0,0 +1,129 @@
+"""
+Serves api.py from preforked worker processes.
+
+The parent process loads everything Juno instances can share (secrets, voice and language indexes, the command registry
+and all of their modules), freezes it out of the garbage collector's reach, and then forks the workers so they share those
+pages copy-on-write. Each worker prewarms its own session pool, so starting a session only hands out an initialized instance.
+
+All workers accept connections on the main port. Sessions live in the worker that created them, so each worker also listens
+on its own port (main port + 1 + worker index) which is returned as 'worker_port' and should be used to continue a session.
+
+Usage:
+	python server.py [--workers 4] [--host 0.0.0.0] [--port 8000]
+"""
+
+import os
+import sys
+import signal
+import socket
+import argparse
+import uvicorn
+from src.initialization import shared_resources
+from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+
+def create_socket(host:str, port:int) -> socket.socket:
+	"""
+	Creates a listening socket that forked workers inherit
+	"""
+	sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+	sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+	sock.bind((host, port))
+	sock.listen(2048)
+	sock.set_inheritable(True)
+	return sock
+
+def run_worker(sockets:list) -> None:
+	"""
+	Runs the api on the given sockets until the process is asked to stop
+	"""
+	import api
+
+	uvicorn.Server(uvicorn.Config(api.app, log_level='info')).run(sockets=sockets)
+
+def fork_worker(index:int, shared_socket:socket.socket, worker_sockets:list, worker_ports:list) -> int:
+	"""
+	Forks a worker process and returns its pid
+	"""
+	pid = os.fork()
+	if pid:
+		return pid
+
+	# Child process: close the other workers' session sockets and serve until stopped
+	for other_index, worker_socket in enumerate(worker_sockets):
+		if other_index != index:
+			worker_socket.close()
+
+	signal.signal(signal.SIGTERM, signal.SIG_DFL)
+	signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+	import api
+	api.configure_worker(index, worker_ports)
+	try:
+		run_worker([shared_socket, worker_sockets[index]])
+	finally:
+		os._exit(0)
+
+def supervise(workers:dict, shared_socket:socket.socket, worker_sockets:list, worker_ports:list) -> None:
+	"""
+	Waits on the workers, replacing any that exit unexpectedly until the server is stopped
+	"""
+	stopping = False
+
+	def stop(signum, frame):
+		nonlocal stopping
+		stopping = True
+		for pid in workers:
+			try:
+				os.kill(pid, signal.SIGTERM)
+			except ProcessLookupError:
+				pass
+
+	signal.signal(signal.SIGTERM, stop)
+	signal.signal(signal.SIGINT, stop)
+
+	while workers:
+		try:
+			pid, status = os.wait()
+		except ChildProcessError:
+			break
+		index = workers.pop(pid, None)
+		if index is None or stopping:
+			continue
+		print(f"Worker {index} exited with status {status}, restarting it")
+		workers[fork_worker(index, shared_socket, worker_sockets, worker_ports)] = index
+
+def main() -> None:
+	server_settings = MasterSettingsManager().retrieve_property('server')
+
+	parser = argparse.ArgumentParser(description='Serve the Juno api from preforked worker processes')
+	parser.add_argument('--workers', type=int, default=server_settings['workers'] or os.cpu_count())
+	parser.add_argument('--host', default=server_settings['host'])
+	parser.add_argument('--port', type=int, default=server_settings['port'])
+	args = parser.parse_args()
+
+	# Load everything the workers share before forking
+	shared_resources.prewarm()
+	# imports fastapi, Juno and the rest of the api's modules
+	import api
+
+	shared_socket = create_socket(args.host, args.port)
+
+	# Without fork (e.g. Windows) or with a single worker, the api is served from this process
+	if args.workers <= 1 or not hasattr(os, 'fork'):
+		run_worker([shared_socket])
+		return
+
+	worker_ports = [args.port + 1 + index for index in range(args.workers)]
+	worker_sockets = [create_socket(args.host, port) for port in worker_ports]
+
+	shared_resources.freeze()
+
+	workers = {}
+	for index in range(args.workers):
+		workers[fork_worker(index, shared_socket, worker_sockets, worker_ports)] = index
+	print(f"Serving on {args.host}:{args.port} with {args.workers} workers (session ports {worker_ports[0]}-{worker_ports[-1]})")
+
+	supervise(workers, shared_socket, worker_sockets, worker_ports)
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+
+class AsyncSpeechPipeline:
+	"""
+	Runs the bot's listen, process, and verbalize stages concurrently, connected by bounded queues.
+	The next utterance is only listened for once the current one has been processed, so the recognizer sees the settings
+	it changed (i.e. a new language). It is captured while the response is being synthesized and played if the recognizer
+	keeps the bot's own voice out of the recording, otherwise once the response has been played.
+	"""
+
+	def __init__(self, speech_recognition:object, speech_processor:object, speech_verbalizer:object, queue_size:int=1, on_turn=None):
+		"""
+		:param on_turn: (callable) optional callback given each utterance and its response once the response is produced
+		"""
+		self.speech_recognition = speech_recognition
+		self.speech_processor = speech_processor
+		self.speech_verbalizer = speech_verbalizer
+		self.queue_size = queue_size
+		self.on_turn = on_turn
+
+	async def run(self, stop_event=None) -> None:
+		"""
+		Runs every stage until listening stops, either because stop_event was set or the bot exited
+		:param stop_event: (threading.Event) optional event that stops the pipeline once it is set
+		"""
+		# Listening runs in a worker thread, so it is stopped through a thread-safe event.
+		# The pipeline owns this event, the caller's stop_event is only followed and never set by the pipeline.
+		self.stop_listening = threading.Event()
+		# Set whenever the next utterance may be listened for, the first utterance can be listened for straight away
+		self.listen_ready = asyncio.Event()
+		self.listen_ready.set()
+		speech_queue = asyncio.Queue(maxsize=self.queue_size)
+		response_queue = asyncio.Queue(maxsize=self.queue_size)
+
+		stages = [
+			asyncio.create_task(self._listen_stage(speech_queue)),
+			asyncio.create_task(self._process_stage(speech_queue, response_queue)),
+			asyncio.create_task(self._verbalize_stage(response_queue))
+		]
+		if stop_event is not None:
+			stages.append(asyncio.create_task(self._follow_stop_event(stop_event)))
+		try:
+			await asyncio.gather(*stages[:3])
+		finally:
+			self.stop_listening.set()
+			self.listen_ready.set()
+			for stage in stages:
+				stage.cancel()
+
+	async def _follow_stop_event(self, stop_event) -> None:
+		"""
+		Stops listening once the caller's stop_event is set
+		"""
+		while not self.stop_listening.is_set():
+			if stop_event.is_set():
+				self.stop_listening.set()
+				self.listen_ready.set()
+				return
+			await asyncio.sleep(0.1)
+
+	async def _listen_stage(self, speech_queue:asyncio.Queue) -> None:
+		"""
+		Captures utterances and hands them to the process stage, a None marks the end of the pipeline
+		"""
+		while not self.stop_listening.is_set():
+			await self.listen_ready.wait()
+			self.listen_ready.clear()
+			if self.stop_listening.is_set():
+				break
+			speech = await self.speech_recognition.listen_async(self.stop_listening)
+			if speech is None:
+				break
+			await speech_queue.put(speech)
+		await speech_queue.put(None)
+
+	async def _process_stage(self, speech_queue:asyncio.Queue, response_queue:asyncio.Queue) -> None:
+		"""
+		Produces a response for every utterance in order, then lets the next utterance be listened for
+		if the recognizer may listen while the response is played
+		"""
+		while True:
+			speech = await speech_queue.get()
+			if speech is None:
+				break
+			response = await self.speech_processor.process_speech_async(speech)
+			if self.on_turn:
+				self.on_turn(speech, response)
+			listening = self.speech_recognition.can_listen_during_playback()
+			if listening:
+				self.listen_ready.set()
+			await response_queue.put((response, listening))
+		await response_queue.put(None)
+
+	async def _verbalize_stage(self, response_queue:asyncio.Queue) -> None:
+		"""
+		Verbalizes every response in order, letting the next utterance be listened for once it has been played
+		if listening has not resumed already
+		"""
+		while True:
+			item = await response_queue.get()
+			if item is None:
+				break
+			response, listening = item
+			try:
+				await self.speech_verbalizer.verbalize_speech_async(response)
+			finally:
+				if not listening:
+					self.listen_ready.set()
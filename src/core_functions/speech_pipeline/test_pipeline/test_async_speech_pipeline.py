@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import unittest
+from src.core_functions.speech_pipeline.async_speech_pipeline import AsyncSpeechPipeline
+
+class FakeSpeechRecognition:
+    def __init__(self, utterances, events, listens_during_playback=True):
+        self.utterances = list(utterances)
+        self.events = events
+        self.listens_during_playback = listens_during_playback
+
+    def can_listen_during_playback(self):
+        return self.listens_during_playback
+
+    async def listen_async(self, stop_event=None):
+        await asyncio.sleep(0.01)
+        if not self.utterances:
+            return None
+        speech = self.utterances.pop(0)
+        self.events.append(f'listened {speech}')
+        return speech
+
+class FakeSpeechProcessor:
+    def __init__(self, events=None):
+        self.events = events if events is not None else []
+
+    async def process_speech_async(self, speech):
+        await asyncio.sleep(0.02)
+        self.events.append(f'processed {speech}')
+        return speech.upper()
+
+class FakeSpeechVerbalizer:
+    def __init__(self, events):
+        self.events = events
+
+    async def verbalize_speech_async(self, response):
+        self.events.append(f'verbalizing {response}')
+        await asyncio.sleep(0.05)
+        self.events.append(f'verbalized {response}')
+
+class TestAsyncSpeechPipeline(unittest.TestCase):
+    """Class for testing the AsyncSpeechPipeline"""
+
+    def test_pipeline_overlaps_listening_and_verbalizing(self):
+        events = []
+        pipeline = AsyncSpeechPipeline(FakeSpeechRecognition(['one', 'two'], events), FakeSpeechProcessor(), FakeSpeechVerbalizer(events))
+        asyncio.run(pipeline.run())
+
+        self.assertEqual([event for event in events if event.startswith('verbalized')], ['verbalized ONE', 'verbalized TWO'])
+        # the second utterance is captured while the first response is still being verbalized
+        self.assertLess(events.index('listened two'), events.index('verbalized ONE'))
+
+    def test_listens_only_once_the_previous_utterance_is_processed(self):
+        events = []
+        pipeline = AsyncSpeechPipeline(FakeSpeechRecognition(['one', 'two'], events), FakeSpeechProcessor(events), FakeSpeechVerbalizer(events))
+        asyncio.run(pipeline.run())
+        # settings changed by the first utterance's command are in place before the second is recognized
+        self.assertLess(events.index('processed one'), events.index('listened two'))
+
+    def test_does_not_listen_during_playback_unless_the_recognizer_allows_it(self):
+        events = []
+        pipeline = AsyncSpeechPipeline(FakeSpeechRecognition(['one', 'two'], events, listens_during_playback=False), FakeSpeechProcessor(events), FakeSpeechVerbalizer(events))
+        asyncio.run(pipeline.run())
+        self.assertEqual([event for event in events if event.startswith('verbalized')], ['verbalized ONE', 'verbalized TWO'])
+        self.assertLess(events.index('verbalized ONE'), events.index('listened two'))
+
+    def test_stop_event_stops_the_pipeline_without_being_set_by_it(self):
+        events = []
+        pipeline = AsyncSpeechPipeline(FakeSpeechRecognition(['one'], events), FakeSpeechProcessor(), FakeSpeechVerbalizer(events))
+        stop_event = threading.Event()
+        asyncio.run(pipeline.run(stop_event))
+        # the pipeline ended on its own, the caller's event is left as it was
+        self.assertFalse(stop_event.is_set())
+
+        endless = FakeSpeechRecognition(['one'] * 1000, [])
+        pipeline = AsyncSpeechPipeline(endless, FakeSpeechProcessor(), FakeSpeechVerbalizer([]))
+        stop_event.set()
+        asyncio.run(asyncio.wait_for(pipeline.run(stop_event), timeout=5))
+        self.assertTrue(endless.utterances)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,4 @@
-from src.customization.packages.virtual_assistant.commands.translate_speech.translate_speech import TranslateSpeech
-from src.customization.packages.virtual_assistant.commands.ask_gpt.ask_gpt import AskGPT
+import asyncio
 from importlib import import_module
 from src.utilities.logs.log_performance import PerformanceLogger
 
@@ -9,16 +8,21 @@ class CommandOrchestrator:
 	"""
 	A class that provides the most apporiate response and action to the user's speech given the similarity rankings.
 	This is done by retrieving the top intent  and its associated entity if applicable from the trained CLU model.
-	If the top intent's score is less than 90% a response is instead created using OpenAI's GPT API.
-	If the top intent's score is greater than 90% the associated entity is retrieved and the appropriate action is executed.
+	If the top intent's score is less than the minimum intent score (90% by default) a response is instead created using OpenAI's GPT API.
+	Otherwise the associated entity is retrieved and the appropriate action is executed.
 	"""
   
 	def __init__(self, api_keys: dict, speech_verbalizer:object, intents_data:dict, setting_objects:dict):
 		self.api_keys = api_keys
 		self._retrieve_master_settings(setting_objects)
 		self._load_in_commands(speech_verbalizer, intents_data, setting_objects)
-		self.MINIMUM_INTENT_SCORE = .90
+		# below this score speech is answered by GPT, tuned with training/evaluate_intent_model.py
+		self.MINIMUM_INTENT_SCORE = setting_objects['master_settings'].retrieve_property('recognition', 'minimum_intent_score')
+		if self.MINIMUM_INTENT_SCORE is None:
+			self.MINIMUM_INTENT_SCORE = .90
 		self._intents_data = intents_data
+		# whether the last response came from GPT or from a command, recorded in the conversation history
+		self.response_source = None
 
 	def process_command(self, speech:str) -> str:
 		"""
@@ -28,10 +32,41 @@ class CommandOrchestrator:
 		if self.intents_data:
 			response = self._execute_command(speech)
 		else:
+			self.response_source = 'gpt'
 			response = self.command.ask_GPT(speech)
   
 		return response
 
+	async def process_command_async(self, speech:str) -> str:
+		"""
+		Same as process_command, but awaits GPT and network bound commands instead of blocking the event loop.
+		"""
+		if not self.intents_data:
+			return await self._ask_GPT_async(speech)
+
+		top_intent, top_intent_score = self._retrieve_top_intent()
+
+		if top_intent_score < self.MINIMUM_INTENT_SCORE:
+			return await self._ask_GPT_async(speech)
+		self.response_source = 'command'
+		if top_intent not in self.commands:
+			return "Sorry, I don't understand that command. Please try asking again."
+
+		# Use the command's async variant if it has one, otherwise run the command in a worker thread
+		async_command = getattr(self.command, f'{top_intent.lower()}_async', None)
+		if async_command:
+			return await async_command()
+		return await asyncio.to_thread(getattr(self.command, top_intent.lower()))
+
+	async def _ask_GPT_async(self, speech:str) -> str:
+		"""
+		Creates a response using GPT without blocking the event loop.
+		"""
+		self.response_source = 'gpt'
+		if hasattr(self.command, 'ask_GPT_async'):
+			return await self.command.ask_GPT_async(speech)
+		return await asyncio.to_thread(self.command.ask_GPT, speech)
+
 	@logger.log_operation
 	def _retrieve_top_intent(self) -> str:
 		"""
@@ -55,11 +90,13 @@ class CommandOrchestrator:
 		top_intent, top_intent_score = self._retrieve_top_intent()
   
 		if top_intent_score >= self.MINIMUM_INTENT_SCORE:
+			self.response_source = 'command'
 			if top_intent in self.commands:
 				response = getattr(self.command, top_intent.lower())()
 			else:
 				response = "Sorry, I don't understand that command. Please try asking again."
 		else:
+			self.response_source = 'gpt'
 			response = self.command.ask_GPT(speech)
 		return response
   
@@ -67,6 +104,7 @@ class CommandOrchestrator:
 		"""
   		Retrieves the bot's role, language, and name from the bot settings file
     	"""
+		self.master_settings = setting_objects['master_settings']
 		profile_settings = setting_objects['profile_settings']
 		self.role = profile_settings.retrieve_property('role')
 		self.language = profile_settings.retrieve_property('language')
@@ -86,6 +124,7 @@ class CommandOrchestrator:
 			# dict of similarity rankings returned by CLU
 			self.intents_data = intents_data
 		else:
+			from src.customization.packages.virtual_assistant.commands.ask_gpt.ask_gpt import AskGPT
 			self.command = AskGPT(self.api_keys['OPENAI-API-KEY'], setting_objects)
 			self.top_intent_score = None
 			self.intents_data = None
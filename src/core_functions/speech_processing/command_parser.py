@@ -29,7 +29,7 @@ class SpeechProcessor:
   
 		# save conversation history
 		if self.save_conversation_history:
-			self.manage_conversation_history.save_conversation_history(speech, response)
+			self.manage_conversation_history.save_conversation_history(speech, response, self.command_orchestrator.response_source)
   
 		return response
 
@@ -1,5 +1,5 @@
-from azure.core.credentials import AzureKeyCredential
-from azure.ai.language.conversations import ConversationAnalysisClient
+import asyncio
+from src.utilities.http.service_endpoints import retrieve_service_endpoint
  
 class CLUIntentRecognition:
 		"""
@@ -17,8 +17,25 @@ class CLUIntentRecognition:
 			:param speech: (str) speech input
 			:return: (dict) Dictionary containing similarity rankings between the user's speech and the trained CLU model
 			"""
+			# Similarity rankings between the user's speech and the trained CLU model
+			return self.client.analyze_conversation(task=self._create_job(speech))
+
+		async def get_user_intent_async(self, speech:str) -> dict:
+			"""
+			Retrieves the similarity rankings between the user's speech and the trained CLU model without blocking the event loop.
+			:param speech: (str) speech input
+			:return: (dict) Dictionary containing similarity rankings between the user's speech and the trained CLU model
+			"""
+			async_client = await self._retrieve_async_client()
+			# Without the async transport (aiohttp) the blocking client is run in a worker thread instead
+			if async_client is None:
+				return await asyncio.to_thread(self.get_user_intent, speech)
+			return await async_client.analyze_conversation(task=self._create_job(speech))
 
-			# Create job to send to CLU model
+		def _create_job(self, speech:str) -> dict:
+			"""
+			Creates the job sent to the CLU model
+			"""
 			job = {
 					"kind": "Conversation",
 					"analysisInput": {
@@ -37,20 +54,59 @@ class CLUIntentRecognition:
 						"verbose": True
 					}
 				}
+			return job
 
-			# Similarity rankings between the user's speech and the trained CLU model
-			return self.client.analyze_conversation(task=job)
+		async def _retrieve_async_client(self) -> object:
+			"""
+			Returns an async CLU client bound to the running event loop, creating it on first use
+			:return: (object) the async client, or None if the async transport is not installed
+			"""
+			loop = asyncio.get_running_loop()
+			if self._async_client_loop is loop:
+				return self._async_client
+
+			# The client belongs to the previous event loop, its session is closed before it is replaced
+			await self._close_async_client()
+			try:
+				from azure.ai.language.conversations.aio import ConversationAnalysisClient as AsyncConversationAnalysisClient
+				self._async_client = AsyncConversationAnalysisClient(self.clu_endpoint, self.clu_key)
+			except ImportError as e:
+				print(f"The async CLU client is unavailable, falling back to the blocking client: {e}")
+				self._async_client = None
+			self._async_client_loop = loop
+			return self._async_client
+
+		async def _close_async_client(self) -> None:
+			"""
+			Closes the current async CLU client, on its own event loop if that loop is still running
+			"""
+			async_client, async_client_loop = self._async_client, self._async_client_loop
+			self._async_client = None
+			if async_client is None:
+				return
+			try:
+				if async_client_loop.is_running():
+					asyncio.run_coroutine_threadsafe(async_client.close(), async_client_loop)
+				else:
+					await async_client.close()
+			except Exception as e:
+				print(f"The previous async CLU client could not be closed: {e}")
 
 		def _load_in_secrets(self, api_keys:dict) -> None:
 			"""
 			Initializes secrets needed to use the CLU model.
 			"""
+			from azure.core.credentials import AzureKeyCredential
+			from azure.ai.language.conversations import ConversationAnalysisClient
+
 			self.api_keys = api_keys
-			self.clu_endpoint = self.api_keys['CLU-ENDPOINT']
+			self.clu_endpoint = retrieve_service_endpoint('clu', self.api_keys['CLU-ENDPOINT'])
 			self.clu_key = AzureKeyCredential(self.api_keys['CLU-API-KEY'])
 			self.clu_project_name = self.api_keys['CLU-PROJECT-NAME']
 			self.clu_deployment_name = self.api_keys['CLU-TRAINING-MODEL-NAME']
 			self.client = ConversationAnalysisClient(self.clu_endpoint, self.clu_key)
+			self._async_client = None
+			self._async_client_loop = None
    
 		def _get_current_language(self) -> str:
 			"""
@@ -1,9 +1,13 @@
+import re
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from .intent_recognition import CLUIntentRecognition
 from .command_orchestrator import CommandOrchestrator
 from ...utilities.conversation_history.conversation_history_manager import ConversationHistoryManager
 from src.utilities.logs.log_performance import PerformanceLogger
-
-import streamlit as st
+from src.utilities.logs.metrics_store import record_metric
 
 logger = PerformanceLogger()
 
@@ -17,7 +21,8 @@ class SpeechProcessor:
 		self.profile_settings = setting_objects['profile_settings']
 		self.get_intent = CLUIntentRecognition(api_keys, self.profile_settings, self.voice_settings)
 		self.command_orchestrator = CommandOrchestrator(api_keys, speech_verbalizer, None, setting_objects)
-		self.manage_conversation_history = ConversationHistoryManager()
+		self.manage_conversation_history = ConversationHistoryManager(self.master_settings, self.profile_settings)
+		self._initialize_intent_prefetching()
 
 	#@logger.log_operation
 	def process_speech(self, speech:str) -> str: 
@@ -27,16 +32,21 @@ class SpeechProcessor:
 		:return: (str) response to users speech and appropriate action to be taken if applicable
 		"""
 		print('\nThinking...')
+		timings = [time.perf_counter()]
   
 		# If a package is provided, retrieve the user's intent using the trained CLU model
 		self._check_for_package(speech)
+		timings.append(time.perf_counter())
 
 		# Process the user's speech and return the appropriate response and action
 		response = self.command_orchestrator.process_command(speech)
+		timings.append(time.perf_counter())
   
 		# Save conversation history
 		if self.save_conversation_history:
-			self.manage_conversation_history.save_conversation_history(speech, response)
+			self.manage_conversation_history.save_conversation_history(speech, response, self.command_orchestrator.response_source)
+		timings.append(time.perf_counter())
+		self._record_turn(speech, timings)
    
 		# Print the response to the user's speech
 		print('\nResponse:')
@@ -48,10 +58,51 @@ class SpeechProcessor:
   
 		return response
 
+	async def process_speech_async(self, speech:str) -> str:
+		"""
+		Same as process_speech, but awaits intent recognition and the response instead of blocking the event loop.
+		:param speech: (str) speech input
+		:return: (str) response to users speech and appropriate action to be taken if applicable
+		"""
+		print('\nThinking...')
+		timings = [time.perf_counter()]
+
+		# If a package is provided, retrieve the user's intent using the trained CLU model
+		await self._check_for_package_async(speech)
+		timings.append(time.perf_counter())
+
+		# Process the user's speech and return the appropriate response and action
+		response = await self.command_orchestrator.process_command_async(speech)
+		timings.append(time.perf_counter())
+
+		# Save conversation history
+		if self.save_conversation_history:
+			await asyncio.to_thread(self.manage_conversation_history.save_conversation_history, speech, response, self.command_orchestrator.response_source)
+		timings.append(time.perf_counter())
+		self._record_turn(speech, timings)
+
+		# Print the response to the user's speech
+		print('\nResponse:')
+		print(f'{self.bot_name.title()}: {response}')
+
+		return response
+
+	def _record_turn(self, speech:str, timings:list) -> None:
+		"""
+		Records how long each stage of a turn took in the metrics store
+		:param timings: (list) the times the turn started and its intent, command and history stages ended
+		"""
+		start, intent_done, command_done, history_done = timings
+		record_metric('turn', profile=self.profile, source=self.command_orchestrator.response_source, speech=speech[:80],
+		              intent_ms=round((intent_done - start) * 1000, 1), command_ms=round((command_done - intent_done) * 1000, 1),
+		              history_ms=round((history_done - command_done) * 1000, 1), total_ms=round((history_done - start) * 1000, 1))
+
 	def _write_response_to_gui(self, result) -> None: 
 		"""
 		Write response to gui if it is being used
 		"""
+		import streamlit as st
+
 		if self.bot_name:
 			with st.chat_message("assistant"):
 				st.write(f'{self.bot_name.title()}: {result}')
@@ -59,16 +110,80 @@ class SpeechProcessor:
 			with st.chat_message("assistant"):
 				st.write(f'Entity: {result}')
 
+	def prefetch_intent(self, partial_speech:str) -> None:
+		"""
+		Starts retrieving the user's intent from a stable partial hypothesis before the final transcript arrives.
+		The prefetched intent is only used if the final transcript matches the partial hypothesis.
+		:param partial_speech: (str) stable partial speech input
+		"""
+		if not self.package_name:
+			return
+
+		normalized_speech = self._normalize_speech(partial_speech)
+		with self._prefetch_lock:
+			if normalized_speech == self._prefetched_speech:
+				return
+			if self._prefetched_intent:
+				self._prefetched_intent.cancel()
+			self._prefetched_speech = normalized_speech
+			self._prefetched_intent = self._prefetch_executor.submit(self.get_intent.get_user_intent, partial_speech)
+
+	def _retrieve_prefetched_intent(self, speech:str) -> dict:
+		"""
+		Confirms the prefetched intent against the final transcript, discarding it if they differ.
+		"""
+		with self._prefetch_lock:
+			prefetched_speech, prefetched_intent = self._prefetched_speech, self._prefetched_intent
+			self._prefetched_speech, self._prefetched_intent = None, None
+
+		if not prefetched_intent:
+			# Without early intent prediction no lookup was made, so no miss is recorded
+			if self.early_intent_prediction:
+				record_metric('cache', name='clu', hit=False)
+			return None
+		if prefetched_speech != self._normalize_speech(speech):
+			prefetched_intent.cancel()
+			record_metric('cache', name='clu', hit=False)
+			return None
+
+		try:
+			intents_data = prefetched_intent.result()
+		except Exception as e:
+			print(f"Error occurred during early intent prediction: {e}")
+			intents_data = None
+		record_metric('cache', name='clu', hit=intents_data is not None)
+		return intents_data
+
+	def _normalize_speech(self, speech:str) -> str:
+		"""
+		Normalizes speech so partial and final transcripts can be compared
+		"""
+		return ' '.join(re.sub(r"[^\w\s']", '', speech.lower()).split())
+
 	def _check_for_package(self, speech) -> None:
 		"""
 		Handles the user's speech if a package is provided.
 		"""
 		if self.package_name: 
-			# Returns a dictionary containing similarity rankings between the user's speech and the trained CLU model
-			intents_data = self.get_intent.get_user_intent(speech)
+			# Use the intent predicted from the partial hypothesis if it matches the final transcript
+			intents_data = self._retrieve_prefetched_intent(speech)
+			if intents_data is None:
+				# Returns a dictionary containing similarity rankings between the user's speech and the trained CLU model
+				intents_data = self.get_intent.get_user_intent(speech)
 			# Updates the intents_data property in the command_orchestrator object with the intents data retrieved from the CLU model
 			self.command_orchestrator.intents_data = intents_data
 	
+	async def _check_for_package_async(self, speech) -> None:
+		"""
+		Handles the user's speech if a package is provided without blocking the event loop.
+		"""
+		if self.package_name:
+			# Use the intent predicted from the partial hypothesis if it matches the final transcript
+			intents_data = await asyncio.to_thread(self._retrieve_prefetched_intent, speech)
+			if intents_data is None:
+				intents_data = await self.get_intent.get_user_intent_async(speech)
+			self.command_orchestrator.intents_data = intents_data
+
 	def _initialize_settings(self, setting_objects) -> None:
 		"""
 		Initialize setting objects.
@@ -81,3 +196,13 @@ class SpeechProcessor:
 		self.save_conversation_history = self.master_settings.retrieve_property('functions', 'save_conversation_history')
 		self.bot_name = self.profile_settings.retrieve_property('name', self.profile)
 		self.gui = self.master_settings.retrieve_property('functions', 'gui')
+		self.early_intent_prediction = self.master_settings.retrieve_property('functions', 'early_intent_prediction')
+
+	def _initialize_intent_prefetching(self) -> None:
+		"""
+		Initializes the state used to predict intents from partial hypotheses.
+		"""
+		self._prefetch_executor = ThreadPoolExecutor(max_workers=1)
+		self._prefetch_lock = threading.Lock()
+		self._prefetched_speech = None
+		self._prefetched_intent = None
@@ -0,0 +1,45 @@
+import unittest
+from concurrent.futures import Future
+from unittest.mock import patch
+from src.core_functions.speech_processing.speech_processor import SpeechProcessor
+
+class TestPrefetchedIntent(unittest.TestCase):
+    """Class for testing the intents predicted from partial hypotheses"""
+
+    def setUp(self):
+        # the CLU client and commands are not needed to confirm a prefetched intent
+        self.speech_processor = SpeechProcessor.__new__(SpeechProcessor)
+        self.speech_processor._initialize_intent_prefetching()
+        patcher = patch('src.core_functions.speech_processing.speech_processor.record_metric')
+        self.record_metric = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def prefetch(self, speech, intents_data):
+        self.speech_processor._prefetched_speech = self.speech_processor._normalize_speech(speech)
+        self.speech_processor._prefetched_intent = Future()
+        self.speech_processor._prefetched_intent.set_result(intents_data)
+
+    def test_nothing_is_recorded_without_early_intent_prediction(self):
+        self.speech_processor.early_intent_prediction = False
+        self.assertIsNone(self.speech_processor._retrieve_prefetched_intent('open google'))
+        self.record_metric.assert_not_called()
+
+    def test_missing_prefetch_is_a_miss_with_early_intent_prediction(self):
+        self.speech_processor.early_intent_prediction = True
+        self.assertIsNone(self.speech_processor._retrieve_prefetched_intent('open google'))
+        self.record_metric.assert_called_once_with('cache', name='clu', hit=False)
+
+    def test_matching_prefetch_is_a_hit(self):
+        self.speech_processor.early_intent_prediction = True
+        self.prefetch('Open Google.', {'topIntent': 'Open_Website'})
+        self.assertEqual(self.speech_processor._retrieve_prefetched_intent('open google'), {'topIntent': 'Open_Website'})
+        self.record_metric.assert_called_once_with('cache', name='clu', hit=True)
+
+    def test_differing_prefetch_is_a_miss(self):
+        self.speech_processor.early_intent_prediction = True
+        self.prefetch('open google', {'topIntent': 'Open_Website'})
+        self.assertIsNone(self.speech_processor._retrieve_prefetched_intent('open google maps'))
+        self.record_metric.assert_called_once_with('cache', name='clu', hit=False)
+
+if __name__ == '__main__':
+    unittest.main()
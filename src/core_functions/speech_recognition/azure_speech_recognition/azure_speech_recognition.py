@@ -1,5 +1,7 @@
+import threading
 import azure.cognitiveservices.speech as speechsdk
 from src.customization.packages.virtual_assistant.commands.translate_speech.translate_speech import TranslateSpeech
+from .recognizer_pool import RecognizerPool
 
 class AzureSpeechRecognition:
 	"""
@@ -9,15 +11,24 @@ class AzureSpeechRecognition:
 	def __init__(self, speech_objects:dict, api_keys:dict, setting_objects:dict):
 		self._load_in_settings(speech_objects, setting_objects)
 		self.translator = TranslateSpeech(api_keys['TRANSLATOR-API-KEY'], setting_objects)
+		self.partial_result_handler = None
+		self._partial_result_timer = None
   
 	def attempt_speech_recognition(self) -> str:
 		"""
 		A 5-second attempt to recognize the user's speech input
   		"""
+		# When gated, the cloud recognizer is only engaged once speech onset is detected locally
+		if self.voice_activity_gate and not self.voice_activity_gate.wait_for_speech():
+			return None
+
 		try:
 			result = self.speech_recognizer.recognize_once_async().get() 
 		except Exception as e:
 			print(f"Error occurred during speech recognition: {e}")
+		finally:
+			if self.voice_activity_gate:
+				self.voice_activity_gate.stop_streaming()
    
 		return result
 
@@ -25,6 +36,8 @@ class AzureSpeechRecognition:
 		"""
 		Handles the result of the speech recognition. Code is from Azure's Speech SDK documentation.
 		"""
+		if result is None:
+			return None
 		if result.reason == speechsdk.ResultReason.RecognizedSpeech:
 			return True
 		elif result.reason == speechsdk.ResultReason.NoMatch:
@@ -42,23 +55,72 @@ class AzureSpeechRecognition:
   		Handles the recognized speech input
     	"""
 		recognized_speech = result.text
+
+		# The final transcript has arrived, any pending partial hypothesis is now stale
+		self._cancel_partial_result_timer()
   
 		print(f"\nInput:\nUser: {recognized_speech}")
   
 		return recognized_speech.replace('.', '').strip()
 
+	def enable_partial_results(self, handler, stability_delay:float=0.25, minimum_words:int=2) -> None:
+		"""
+		Feeds stable partial hypotheses from the recognizer's 'recognizing' events into the given handler.
+		A partial hypothesis is considered stable once no newer hypothesis has arrived for stability_delay seconds.
+		"""
+		self.partial_result_handler = handler
+		self.partial_result_stability_delay = stability_delay
+		self.partial_result_minimum_words = minimum_words
+
+		# Connect every pooled recognizer, as well as those created later on
+		for speech_recognizer in self.recognizer_pool.recognizers.values():
+			speech_recognizer.recognizing.connect(self._handle_partial_result)
+		self.recognizer_pool.on_recognizer_created = lambda speech_recognizer: speech_recognizer.recognizing.connect(self._handle_partial_result)
+
+	def _handle_partial_result(self, event) -> None:
+		"""
+		Restarts the stability timer every time the recognizer emits a newer partial hypothesis
+		"""
+		partial_speech = event.result.text.replace('.', '').strip()
+		self._cancel_partial_result_timer()
+
+		if len(partial_speech.split()) < self.partial_result_minimum_words:
+			return
+
+		self._partial_result_timer = threading.Timer(self.partial_result_stability_delay, self.partial_result_handler, args=[partial_speech])
+		self._partial_result_timer.daemon = True
+		self._partial_result_timer.start()
+
+	def _cancel_partial_result_timer(self) -> None:
+		"""
+		Cancels the pending partial hypothesis, if any
+		"""
+		if self._partial_result_timer:
+			self._partial_result_timer.cancel()
+			self._partial_result_timer = None
+
+	def listens_during_playback(self) -> bool:
+		"""
+		The voice activity gate flushes the microphone before every attempt, so only gated recognition may overlap playback
+		"""
+		return self.voice_activity_gate is not None
+
 	def reconfigure_recognizer(self) -> None:
 		"""
-  		Reconfigures the speech recognizer with the new language setting
+  		Switches to the pooled speech recognizer for the new language setting
     	"""
-		# Get the new language setting
-		current_language = self.profile_settings.retrieve_property('language')
-
 		# Recognizer needs language-country code
-		language_country_code = self.voice_settings.retrieve_language_country_code(current_language)
+		language_country_code = self._retrieve_current_language_country_code()
 
-		self.speech_config.speech_recognition_language = language_country_code
-		self.speech_recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config)
+		# Reuses a prebuilt recognizer, one is only constructed the first time a language is used
+		self.speech_recognizer = self.recognizer_pool.retrieve(language_country_code)
+
+	def _retrieve_current_language_country_code(self) -> str:
+		"""
+		Retrieves the language-country code of the current language setting
+		"""
+		current_language = self.profile_settings.retrieve_property('language')
+		return self.voice_settings.retrieve_language_country_code(current_language)
   
 	def _load_in_settings(self, speech_objects, setting_objects): 
 		"""
@@ -69,6 +131,30 @@ class AzureSpeechRecognition:
 		self.profile_settings = setting_objects['profile_settings']
 		self.voice_settings = setting_objects['voice_settings']
 		self.master_settings = setting_objects['master_settings']
+		self._initialize_recognizer_pool(speech_objects)
 		self.profile_name = self.master_settings.retrieve_property('profile')
 		#self.user_name = self.profile_settings.retrieve_property('user_name', self.profile_name)
-		self.user_name = None
\ No newline at end of file
+		self.user_name = None
+
+	def _initialize_recognizer_pool(self, speech_objects:dict) -> None:
+		"""
+		Initializes the recognizer pool, recognizers read from a push stream fed by the voice activity gate if it is enabled
+		"""
+		recognizer_pool_size = self.master_settings.retrieve_property('recognition', 'recognizer_pool_size') or 3
+		self.voice_activity_gate = None
+
+		if not self.master_settings.retrieve_property('recognition', 'voice_activity_detection'):
+			self.recognizer_pool = RecognizerPool(self.speech_config, speech_objects['audio_config'], recognizer_pool_size)
+			self.recognizer_pool.add(self._retrieve_current_language_country_code(), self.speech_recognizer)
+			return
+
+		from src.core_functions.speech_recognition.voice_activity_detection.voice_activity_detector import EnergyVoiceActivityDetector, MicrophoneFrameSource, VoiceActivityGate
+
+		detector = EnergyVoiceActivityDetector(threshold_db=self.master_settings.retrieve_property('recognition', 'vad_threshold_db'), pre_roll_ms=self.master_settings.retrieve_property('recognition', 'vad_pre_roll_ms'))
+		stream_format = speechsdk.audio.AudioStreamFormat(samples_per_second=detector.sample_rate, bits_per_sample=16, channels=1)
+		push_stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+		microphone = MicrophoneFrameSource(detector.sample_rate, detector.frame_length)
+
+		self.voice_activity_gate = VoiceActivityGate(detector, microphone.frames(), push_stream, flush=microphone.flush)
+		self.recognizer_pool = RecognizerPool(self.speech_config, speechsdk.audio.AudioConfig(stream=push_stream), recognizer_pool_size)
+		self.speech_recognizer = self.recognizer_pool.retrieve(self._retrieve_current_language_country_code())
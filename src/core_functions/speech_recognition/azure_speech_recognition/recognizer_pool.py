@@ -0,0 +1,46 @@
+from collections import OrderedDict
+import azure.cognitiveservices.speech as speechsdk
+
+class RecognizerPool:
+	"""
+	A small pool of prebuilt speech recognizers keyed by language-country code.
+	Recognizers are created lazily on first use and reused afterwards, so switching languages only swaps
+	the active recognizer. Once the pool is full the least recently used recognizer is evicted.
+	"""
+
+	def __init__(self, speech_config:object, audio_config:object, max_size:int=3):
+		self.speech_config = speech_config
+		self.audio_config = audio_config
+		self.max_size = max(1, max_size)
+		self.recognizers = OrderedDict()
+		self.on_recognizer_created = None
+
+	def add(self, language_country_code:str, speech_recognizer:object) -> None:
+		"""
+		Adds an already constructed recognizer to the pool
+		"""
+		self.recognizers[language_country_code] = speech_recognizer
+		self.recognizers.move_to_end(language_country_code)
+		self._evict_least_recently_used()
+
+	def retrieve(self, language_country_code:str) -> object:
+		"""
+		Returns the recognizer for the given language-country code, building it if it is not pooled yet
+		"""
+		if language_country_code in self.recognizers:
+			self.recognizers.move_to_end(language_country_code)
+			return self.recognizers[language_country_code]
+
+		speech_recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config, audio_config=self.audio_config, language=language_country_code)
+		if self.on_recognizer_created:
+			self.on_recognizer_created(speech_recognizer)
+
+		self.add(language_country_code, speech_recognizer)
+		return speech_recognizer
+
+	def _evict_least_recently_used(self) -> None:
+		"""
+		Drops the least recently used recognizers until the pool fits within its maximum size
+		"""
+		while len(self.recognizers) > self.max_size:
+			self.recognizers.popitem(last=False)
@@ -0,0 +1,148 @@
+import json
+import os
+import sys
+import time
+
+class ReplayResult:
+	"""
+	A recognition result replayed from a transcript fixture
+	"""
+
+	def __init__(self, text:str, audio_path:str=None):
+		self.text = text
+		self.audio_path = audio_path
+
+class ReplaySpeechRecognition:
+	"""
+	Replays transcripts, or WAV-plus-transcript fixtures, in place of live speech recognition.
+	Fixtures are read from either a JSONL file, one {"text": ..., "audio": ...} object per line,
+	or a directory of .txt transcripts with optional .wav files of the same name.
+	Used to drive the pipeline without a microphone or a cloud subscription.
+	"""
+
+	def __init__(self, setting_objects:dict, source:str=None, rate:float=None, loop:bool=None):
+		self._load_in_settings(setting_objects, source, rate, loop)
+		self.fixtures = self._load_in_fixtures(self.source)
+		self.next_attempt_time = time.perf_counter()
+
+	def attempt_speech_recognition(self) -> ReplayResult:
+		"""
+		Replays the next fixture, pacing replays to the configured rate (0 replays as fast as possible)
+		"""
+		self._wait_for_next_attempt()
+
+		try:
+			result = next(self.fixtures)
+		except StopIteration:
+			if not self.loop:
+				print("The replay source has been exhausted.")
+				sys.exit()
+			self.fixtures = self._load_in_fixtures(self.source)
+			result = next(self.fixtures)
+
+		# Fixtures whose audio contains no speech are treated as if nothing was recognized
+		if self.voice_activity_detector and result.audio_path and not self._contains_speech(result.audio_path):
+			return ReplayResult('', result.audio_path)
+		return result
+
+	def handle_result(self, result:ReplayResult) -> bool:
+		"""
+		A replayed result is recognized as long as its transcript is not empty
+		"""
+		return bool(result and result.text and result.text.strip())
+
+	def handle_recognized_speech(self, result:ReplayResult) -> str:
+		"""
+  		Handles the recognized speech input
+    	"""
+		recognized_speech = result.text
+
+		print(f"\nInput:\nUser: {recognized_speech}")
+
+		return recognized_speech.replace('.', '').strip()
+
+	def listens_during_playback(self) -> bool:
+		"""
+		Replayed fixtures are not recorded, so the bot's own voice can not be captured
+		"""
+		return True
+
+	def reconfigure_recognizer(self) -> None:
+		"""
+		Replayed transcripts do not depend on the language setting
+		"""
+		pass
+
+	def _wait_for_next_attempt(self) -> None:
+		"""
+		Sleeps until the next replay is due
+		"""
+		if not self.rate:
+			return
+
+		delay = self.next_attempt_time - time.perf_counter()
+		if delay > 0:
+			time.sleep(delay)
+		self.next_attempt_time = max(self.next_attempt_time, time.perf_counter()) + 1 / self.rate
+
+	def _contains_speech(self, audio_path:str) -> bool:
+		"""
+		Runs the voice activity detector over a fixture's WAV file
+		"""
+		from src.core_functions.speech_recognition.voice_activity_detection.voice_activity_detector import read_wav_frames
+		return self.voice_activity_detector.contains_speech(read_wav_frames(audio_path, self.voice_activity_detector.frame_length))
+
+	def _load_in_fixtures(self, source:str):
+		"""
+		Lazily yields replay results from a JSONL file or a directory of fixtures
+		"""
+		if not source or not os.path.exists(source):
+			print(f'The replay source "{source}" was not found. Set "replay_source" in master_settings.json.')
+			raise SystemExit()
+
+		if os.path.isdir(source):
+			return self._load_in_directory(source)
+		return self._load_in_jsonl(source)
+
+	def _load_in_jsonl(self, file_path:str):
+		"""
+		Yields one replay result per line of a JSONL file
+		"""
+		base_directory = os.path.dirname(os.path.abspath(file_path))
+		with open(file_path, 'r', encoding='utf-8') as f:
+			for line in f:
+				if not line.strip():
+					continue
+				fixture = json.loads(line)
+				audio_path = fixture.get('audio')
+				if audio_path:
+					audio_path = os.path.join(base_directory, audio_path)
+				yield ReplayResult(fixture.get('text', ''), audio_path)
+
+	def _load_in_directory(self, directory:str):
+		"""
+		Yields one replay result per transcript file, paired with a WAV file of the same name if one exists
+		"""
+		for file_name in sorted(os.listdir(directory)):
+			name, extension = os.path.splitext(file_name)
+			if extension != '.txt':
+				continue
+
+			with open(os.path.join(directory, file_name), 'r', encoding='utf-8') as f:
+				text = f.read().strip()
+
+			audio_path = os.path.join(directory, f'{name}.wav')
+			yield ReplayResult(text, audio_path if os.path.isfile(audio_path) else None)
+
+	def _load_in_settings(self, setting_objects:dict, source:str, rate:float, loop:bool) -> None:
+		"""
+		Loads in the replay source and pacing, explicit arguments take precedence over 'master_settings.json'
+		"""
+		self.master_settings = setting_objects['master_settings']
+		self.source = source or self.master_settings.retrieve_property('recognition', 'replay_source')
+		self.rate = rate if rate is not None else self.master_settings.retrieve_property('recognition', 'replay_rate')
+		self.loop = loop if loop is not None else self.master_settings.retrieve_property('recognition', 'replay_loop')
+		self.voice_activity_detector = None
+		if self.master_settings.retrieve_property('recognition', 'voice_activity_detection'):
+			from src.core_functions.speech_recognition.voice_activity_detection.voice_activity_detector import EnergyVoiceActivityDetector
+			self.voice_activity_detector = EnergyVoiceActivityDetector(threshold_db=self.master_settings.retrieve_property('recognition', 'vad_threshold_db'), pre_roll_ms=self.master_settings.retrieve_property('recognition', 'vad_pre_roll_ms'))
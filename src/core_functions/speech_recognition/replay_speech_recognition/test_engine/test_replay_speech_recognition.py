@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+from src.core_functions.speech_recognition.replay_speech_recognition.replay_speech_recognition import ReplaySpeechRecognition
+
+class TestReplaySpeechRecognition(unittest.TestCase):
+    """Class for testing the replay speech recognition engine"""
+
+    def setUp(self):
+        self.temp_directory = tempfile.TemporaryDirectory()
+        self.setting_objects = {'master_settings': Mock()}
+        self.setting_objects['master_settings'].retrieve_property.return_value = None
+
+    def tearDown(self):
+        self.temp_directory.cleanup()
+
+    def _write_file(self, file_name, content):
+        file_path = os.path.join(self.temp_directory.name, file_name)
+        with open(file_path, 'w') as f:
+            f.write(content)
+        return file_path
+
+    def test_replay_jsonl(self):
+        lines = [json.dumps({"text": "What's the weather in Chicago."}), json.dumps({"text": "Mute", "audio": "mute.wav"})]
+        file_path = self._write_file('fixtures.jsonl', '\n'.join(lines))
+        engine = ReplaySpeechRecognition(self.setting_objects, source=file_path, rate=0, loop=False)
+
+        result = engine.attempt_speech_recognition()
+        self.assertTrue(engine.handle_result(result))
+        self.assertEqual(engine.handle_recognized_speech(result), "What's the weather in Chicago")
+
+        result = engine.attempt_speech_recognition()
+        self.assertEqual(result.audio_path, os.path.join(self.temp_directory.name, 'mute.wav'))
+
+        with self.assertRaises(SystemExit):
+            engine.attempt_speech_recognition()
+
+    def test_replay_directory_loops(self):
+        self._write_file('01.txt', 'Hello')
+        self._write_file('01.wav', '')
+        engine = ReplaySpeechRecognition(self.setting_objects, source=self.temp_directory.name, rate=0, loop=True)
+
+        first_result = engine.attempt_speech_recognition()
+        second_result = engine.attempt_speech_recognition()
+        self.assertEqual(first_result.text, second_result.text)
+        self.assertIsNotNone(first_result.audio_path)
+
+    def test_empty_transcript_is_not_recognized(self):
+        file_path = self._write_file('fixtures.jsonl', json.dumps({"text": " "}))
+        engine = ReplaySpeechRecognition(self.setting_objects, source=file_path, rate=0)
+        self.assertFalse(engine.handle_result(engine.attempt_speech_recognition()))
+
+if __name__ == '__main__':
+    unittest.main()
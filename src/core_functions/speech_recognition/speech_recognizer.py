@@ -1,6 +1,6 @@
 import sys
+import asyncio
 from time import time
-from .azure_speech_recognition.azure_speech_recognition import AzureSpeechRecognition
 from src.utilities.logs.log_performance import PerformanceLogger
 
 logger = PerformanceLogger()
@@ -16,15 +16,20 @@ class SpeechRecognition:
   		"""
 		self._load_in_settings(setting_objects)
   
-		# Initialize the speech recognition engine
-		if self.speech_recognition_engine == 'azure':
+		# Initialize the speech recognition engine, engines are imported on demand so the replay engine runs without the Speech SDK
+		if self.speech_recognition_engine.lower() == 'azure':
+			from .azure_speech_recognition.azure_speech_recognition import AzureSpeechRecognition
 			self.speech_recognition_engine = AzureSpeechRecognition(speech_objects, api_keys, setting_objects)
+		elif self.speech_recognition_engine.lower() == 'replay':
+			from .replay_speech_recognition.replay_speech_recognition import ReplaySpeechRecognition
+			self.speech_recognition_engine = ReplaySpeechRecognition(setting_objects)
 
 	@logger.log_operation
-	def listen(self) -> str:
+	def listen(self, stop_event=None) -> str:
 		"""
 		Listens for speech input and returns the recognized text in lowercase.
-		:return: (str) The recognized speech input as a lowercase string.
+		:param stop_event: (threading.Event) optional event that stops listening once it is set
+		:return: (str) The recognized speech input as a lowercase string, or None if listening was stopped.
 		"""
 		# initiale flag to check whether the speech recognizer needs to be reconfigured
 		self._check_and_handle_preconditions()
@@ -34,6 +39,10 @@ class SpeechRecognition:
 	  
 		print('\nListening...')
 		while True:
+			# Stop listening between attempts if requested
+			if stop_event and stop_event.is_set():
+				return None
+
 			try:
 				# Attempt to recognize the user's speech input
 				result = self.speech_recognition_engine.attempt_speech_recognition()
@@ -48,6 +57,34 @@ class SpeechRecognition:
 				print("The program has been terminated due to inactivity.")
 				sys.exit()
     
+	async def listen_async(self, stop_event=None) -> str:
+		"""
+		Listens for speech input without blocking the event loop.
+		Recognition engines block while waiting on the microphone, so listening runs in a worker thread.
+		:param stop_event: (threading.Event) optional event that stops listening once it is set
+		:return: (str) The recognized speech input as a lowercase string, or None if listening was stopped.
+		"""
+		return await asyncio.to_thread(self.listen, stop_event)
+
+	def can_listen_during_playback(self) -> bool:
+		"""
+		Whether the next utterance may be captured while the current response is being played.
+		Only engines that keep the bot's own voice out of the recording allow this, and never while the
+		language is about to be reset after a one-shot translation, as the reset only happens once the response is played.
+		"""
+		if self.master_settings.retrieve_property('functions', 'reset_language'):
+			return False
+		listens_during_playback = getattr(self.speech_recognition_engine, 'listens_during_playback', None)
+		return bool(listens_during_playback and listens_during_playback())
+
+	def enable_early_intent_prediction(self, handler) -> None:
+		"""
+		Forwards stable partial hypotheses to the given handler while the user is still speaking.
+		Only engines that emit partial results support this, otherwise the request is ignored.
+		"""
+		if hasattr(self.speech_recognition_engine, 'enable_partial_results'):
+			self.speech_recognition_engine.enable_partial_results(handler)
+    
 	def _load_in_settings(self, setting_objects:dict) -> None:
 		"""
   		Loading in necessary data from 'master_settings.json'
@@ -55,7 +92,8 @@ class SpeechRecognition:
 		self.master_settings = setting_objects['master_settings']
 		self.profile_settings = setting_objects['profile_settings']
 		self.inavtivity_timeout = self.master_settings.retrieve_property('timeout', 'inactivity')
-		self.speech_recognition_engine = self.profile_settings.retrieve_property('voice_recognition_engine')
+		# An engine set in 'master_settings.json' overrides the profile's engine, i.e. to replay fixtures during benchmarks
+		self.speech_recognition_engine = self.master_settings.retrieve_property('recognition', 'engine') or self.profile_settings.retrieve_property('voice_recognition_engine')
    
 	def _check_and_handle_preconditions(self) -> None:
 		"""
@@ -63,4 +101,5 @@ class SpeechRecognition:
 		"""
 		reconfigure_recognizer = self.master_settings.retrieve_property('functions', 'reconfigure_recognizer')
 		if reconfigure_recognizer:
-			self.speech_recognition_engine.reconfigure_recognizer()
\ No newline at end of file
+			self.speech_recognition_engine.reconfigure_recognizer()
+			self.master_settings.save_property('functions', False, 'reconfigure_recognizer')
\ No newline at end of file
@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from unittest.mock import Mock
+from src.core_functions.speech_recognition.voice_activity_detection.voice_activity_detector import EnergyVoiceActivityDetector, VoiceActivityGate
+
+class TestEnergyVoiceActivityDetector(unittest.TestCase):
+    """Class for testing the energy based voice activity detector"""
+
+    def setUp(self):
+        self.detector = EnergyVoiceActivityDetector(frame_duration_ms=30, threshold_db=-40.0, onset_frames=3, pre_roll_ms=150, max_wait_ms=600)
+        self.silence = np.zeros(self.detector.frame_length, dtype=np.int16)
+        time = np.arange(self.detector.frame_length) / self.detector.sample_rate
+        self.speech = (8000 * np.sin(2 * np.pi * 220 * time)).astype(np.int16)
+
+    def test_onset_includes_pre_roll(self):
+        frames = [self.silence] * 4 + [self.speech] * 3
+        pre_roll = self.detector.wait_for_speech(iter(frames))
+        self.assertEqual(len(pre_roll), 5)
+        self.assertTrue(self.detector.is_speech(pre_roll[-1]))
+        self.assertFalse(self.detector.is_speech(pre_roll[0]))
+
+    def test_short_noise_is_not_speech(self):
+        frames = [self.silence, self.speech, self.speech, self.silence] * 3
+        self.assertIsNone(self.detector.wait_for_speech(iter(frames)))
+
+    def test_gives_up_after_max_wait(self):
+        frames = [self.silence] * 20 + [self.speech] * 3
+        self.assertIsNone(self.detector.wait_for_speech(iter(frames)))
+        self.assertTrue(self.detector.contains_speech(iter(frames)))
+        self.assertEqual(self.detector.max_wait_frames, 20)
+
+    def test_gate_discards_buffered_audio_before_listening(self):
+        calls = []
+        frames = iter([self.speech] * 3)
+        push_stream = Mock()
+        gate = VoiceActivityGate(self.detector, frames, push_stream, flush=lambda: calls.append('flush'))
+        self.assertTrue(gate.wait_for_speech())
+        gate.stop_streaming()
+        self.assertEqual(calls, ['flush'])
+        self.assertEqual(push_stream.write.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
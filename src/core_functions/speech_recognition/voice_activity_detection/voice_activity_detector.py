@@ -0,0 +1,165 @@
+import threading
+import wave
+from collections import deque
+import numpy as np
+
+try:
+	import sounddevice
+except ImportError:
+	sounddevice = None
+
+class EnergyVoiceActivityDetector:
+	"""
+	Detects the onset of speech locally from the energy of 16-bit mono audio frames.
+	Recent frames are kept in a pre-roll buffer so the audio leading up to the onset is not lost.
+	"""
+
+	def __init__(self, sample_rate:int=16000, frame_duration_ms:int=30, threshold_db:float=-40.0, onset_frames:int=3, pre_roll_ms:int=300, max_wait_ms:int=5000):
+		self.sample_rate = sample_rate
+		self.frame_length = sample_rate * frame_duration_ms // 1000
+		self.threshold_db = threshold_db
+		self.onset_frames = onset_frames
+		self.max_wait_frames = max_wait_ms // frame_duration_ms
+		self.pre_roll_frames = max(onset_frames, pre_roll_ms // frame_duration_ms)
+
+	def frame_energy_db(self, frame:np.ndarray) -> float:
+		"""
+		Returns the RMS energy of a frame in dBFS
+		"""
+		if not frame.size:
+			return -np.inf
+		samples = frame.astype(np.float32) / 32768.0
+		rms = np.sqrt(np.mean(np.square(samples)))
+		return 20 * np.log10(max(rms, 1e-10))
+
+	def is_speech(self, frame:np.ndarray) -> bool:
+		"""
+		Whether a single frame is loud enough to be speech
+		"""
+		return self.frame_energy_db(frame) >= self.threshold_db
+
+	def wait_for_speech(self, frames) -> list:
+		"""
+		Consumes frames until speech onset is detected and returns the pre-roll frames, onset included.
+		Returns None if no onset is detected within max_wait_ms or the frames run out.
+		"""
+		return self._detect_onset(frames, self.max_wait_frames)
+
+	def contains_speech(self, frames) -> bool:
+		"""
+		Whether speech onset occurs anywhere within the given frames
+		"""
+		return self._detect_onset(frames, None) is not None
+
+	def _detect_onset(self, frames, max_frames:int=None) -> list:
+		"""
+		Returns the pre-roll frames once speech onset is detected, or None if it is not detected within max_frames
+		(None to consume every frame). The pre-roll is local to the call, so a detector can be shared between threads.
+		"""
+		pre_roll = deque(maxlen=self.pre_roll_frames)
+		consecutive_speech_frames = 0
+
+		for frame_number, frame in enumerate(frames):
+			pre_roll.append(frame)
+			consecutive_speech_frames = consecutive_speech_frames + 1 if self.is_speech(frame) else 0
+
+			if consecutive_speech_frames >= self.onset_frames:
+				return list(pre_roll)
+
+			if max_frames is not None and frame_number + 1 >= max_frames:
+				break
+		return None
+
+class MicrophoneFrameSource:
+	"""
+	Reads 16-bit mono frames from the default microphone
+	"""
+
+	def __init__(self, sample_rate:int, frame_length:int):
+		if sounddevice is None:
+			raise ImportError('Voice activity detection on the microphone requires the "sounddevice" package: pip install sounddevice')
+		self.frame_length = frame_length
+		self.stream = sounddevice.InputStream(samplerate=sample_rate, channels=1, dtype='int16', blocksize=frame_length)
+		self.stream.start()
+
+	def flush(self) -> None:
+		"""
+		Discards the audio buffered since the microphone was last read, e.g. the bot's own voice while it was speaking
+		"""
+		available = self.stream.read_available
+		if available:
+			self.stream.read(available)
+
+	def frames(self):
+		"""
+		Yields microphone frames indefinitely
+		"""
+		while True:
+			frame, _ = self.stream.read(self.frame_length)
+			yield frame[:, 0]
+
+def read_wav_frames(file_path:str, frame_length:int):
+	"""
+	Yields 16-bit frames from the first channel of a WAV file
+	"""
+	with wave.open(file_path, 'rb') as wav_file:
+		channels = wav_file.getnchannels()
+		while True:
+			data = wav_file.readframes(frame_length)
+			if not data:
+				break
+			yield np.frombuffer(data, dtype=np.int16)[::channels]
+
+class VoiceActivityGate:
+	"""
+	Keeps cloud recognition closed until speech onset is detected locally.
+	Once open, the pre-roll and live microphone frames are written to the recognizer's push stream.
+	"""
+
+	def __init__(self, detector:EnergyVoiceActivityDetector, frames, push_stream:object, flush=None):
+		"""
+		:param flush: (callable) optional, discards the audio buffered by the frame source since it was last read
+		"""
+		self.detector = detector
+		self.frames = frames
+		self.push_stream = push_stream
+		self.flush = flush
+		self._streaming = threading.Event()
+		self._pump_thread = None
+
+	def wait_for_speech(self) -> bool:
+		"""
+		Blocks until speech onset, then starts streaming audio to the recognizer
+		"""
+		# audio captured while the bot was responding is stale and must not open the gate
+		if self.flush:
+			self.flush()
+		pre_roll = self.detector.wait_for_speech(self.frames)
+		if pre_roll is None:
+			return False
+
+		for frame in pre_roll:
+			self.push_stream.write(frame.tobytes())
+
+		self._streaming.set()
+		self._pump_thread = threading.Thread(target=self._pump_frames, daemon=True)
+		self._pump_thread.start()
+		return True
+
+	def stop_streaming(self) -> None:
+		"""
+		Stops streaming audio once the recognizer has returned a result
+		"""
+		self._streaming.clear()
+		if self._pump_thread:
+			self._pump_thread.join()
+			self._pump_thread = None
+
+	def _pump_frames(self) -> None:
+		"""
+		Writes live frames to the push stream until streaming is stopped
+		"""
+		for frame in self.frames:
+			if not self._streaming.is_set():
+				break
+			self.push_stream.write(frame.tobytes())
@@ -1,3 +1,4 @@
+import asyncio
 import azure.cognitiveservices.speech as speechsdk
 
 class AzureTextToSpeech:
@@ -18,6 +19,14 @@ class AzureTextToSpeech:
 		# perform text to speech
 		self.speech_synthesizer.speak_ssml(ssml)
   
+	async def text_to_speech_async(self, speech:str, language_country_code:str) -> None:
+		"""
+  		Performs text-to-speech using Azure's Speech Service without blocking the event loop.
+    	"""
+		ssml = self._prepare_ssml(speech, language_country_code)
+		# The Speech SDK's futures are blocking, so they are waited on in a worker thread
+		await asyncio.to_thread(lambda: self.speech_synthesizer.speak_ssml_async(ssml).get())
+
 	def _prepare_ssml(self, speech:str, language_country_code:str) -> str:
 		"""
 		Prepare data in ssml format to be used for azure text to speech
@@ -1,3 +1,4 @@
+import asyncio
 from elevenlabs import generate, play, set_api_key, voices
 from configuration.manage_secrets import ConfigurationManager
 
@@ -29,6 +30,12 @@ class ElevenlabsTextToSpeech:
 
     play(audio)
       
+  async def text_to_speech_async(self, speech:str, language_country_code:str):
+    """
+    Peforms text-to-speech using Elevenlabs' API without blocking the event loop.
+    """
+    await asyncio.to_thread(self.text_to_speech, speech, language_country_code)
+      
   def update_voice(self):
     """
     Updates the voice name used for Elevenlabs' API.
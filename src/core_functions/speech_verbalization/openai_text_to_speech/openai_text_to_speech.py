@@ -1,4 +1,4 @@
-from openai import OpenAI
+from src.utilities.openai_client.openai_client import get_openai_client, with_deadline, usage
 from concurrent.futures import ThreadPoolExecutor
 from pydub import AudioSegment
 from pydub.playback import play
@@ -8,17 +8,19 @@ import asyncio
 class OpenAITextToSpeech:
     
     def __init__(self, api_keys:dict):
-        self.client = OpenAI(api_key = api_keys['OPENAI-API-KEY'])
+        # shares the process wide OpenAI connection pool with chat and fine-tuning
+        self.client = get_openai_client(api_keys['OPENAI-API-KEY'])
         
     def fetch_audio_sync(self, text):
         """
         Synchronously fetch audio for a given text using the OpenAI client.
         """
-        response = self.client.audio.speech.create(
+        response = with_deadline(self.client, 'tts_deadline').audio.speech.create(
         model="tts-1",
         voice="alloy",
         input=text
         )
+        usage.record("tts-1", characters=len(text))
         return io.BytesIO(response.content)
 
     async def fetch_audio(self, text):
@@ -37,10 +39,16 @@ class OpenAITextToSpeech:
         # Fetch audio for each sentence
         audio_responses = await asyncio.gather(*[self.fetch_audio(sentence) for sentence in sentences])
 
-        # Play each audio response sequentially
+        # Play each audio response sequentially, decoding and playback block so they run off the event loop
         for audio_stream in audio_responses:
-            audio_segment = AudioSegment.from_file(audio_stream, format="mp3")
-            play(audio_segment)
+            audio_segment = await asyncio.to_thread(AudioSegment.from_file, audio_stream, format="mp3")
+            await asyncio.to_thread(play, audio_segment)
     
     def text_to_speech(self, input, language_country_code):
-        asyncio.run(self.main(input))
\ No newline at end of file
+        asyncio.run(self.main(input))
+
+    async def text_to_speech_async(self, input, language_country_code):
+        """
+        Performs text-to-speech within an already running event loop.
+        """
+        await self.main(input)
\ No newline at end of file
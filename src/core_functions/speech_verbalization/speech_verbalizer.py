@@ -1,7 +1,4 @@
 import sys
-from .elevenlabs_text_to_speech.elevenlabs_text_to_speech import ElevenlabsTextToSpeech
-from .azure_text_to_speech.azure_text_to_speech import AzureTextToSpeech
-from.openai_text_to_speech.openai_text_to_speech import OpenAITextToSpeech
 from src.utilities.logs.log_performance import PerformanceLogger
 
 logger = PerformanceLogger()
@@ -37,6 +34,24 @@ class SpeechVerbalizer:
   
 		return speech
 
+	async def verbalize_speech_async(self, speech: str) -> str:
+		"""
+  		Verbalize the bot's response using the speech synthesizer without blocking the event loop.
+    	"""
+		self._reload_settings()
+
+		# check whether the speech synthesizer needs to be reconfigured or if the bot is muted
+		perform_text_to_speech = self._check_and_handle_preconditions(speech)
+		if perform_text_to_speech:
+			# Verbalize the response
+			print('\nVerbalizing...')
+			await self.text_to_speech_engine.text_to_speech_async(speech, self.language_country_code)
+
+		# Checks whether the following params are true and executed the appropriate actions
+		self._check_and_handle_postconditions(self.reset_language, self.exit_status)
+
+		return speech
+
 	def _check_and_handle_preconditions(self, speech:str) -> bool:
 		"""
 		Initial flag check
@@ -77,11 +92,15 @@ class SpeechVerbalizer:
 		Retrieves the speech engine
 		"""
 		# check which speech engine is used
+		# engines are imported here so only the selected engine's SDK is loaded
 		if self.engine_name.lower() == 'azure':
+			from .azure_text_to_speech.azure_text_to_speech import AzureTextToSpeech
 			self.text_to_speech_engine = AzureTextToSpeech(self.profile_name, speech_objects, setting_objects)
 		elif self.engine_name.lower() == 'elevenlabs':
+			from .elevenlabs_text_to_speech.elevenlabs_text_to_speech import ElevenlabsTextToSpeech
 			self.text_to_speech_engine = ElevenlabsTextToSpeech(self.profile_name, api_keys, setting_objects)
 		elif self.engine_name.lower() == 'openai':
+			from .openai_text_to_speech.openai_text_to_speech import OpenAITextToSpeech
 			self.text_to_speech_engine = OpenAITextToSpeech(api_keys)
    
 	def _load_in_settings(self, setting_objects:dict) -> None:
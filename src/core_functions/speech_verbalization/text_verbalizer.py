@@ -0,0 +1,30 @@
+class TextVerbalizer:
+	"""
+	Stands in for the SpeechVerbalizer when Juno runs in text mode.
+	Nothing is spoken, but the flags a turn leaves behind are still handled.
+	"""
+
+	def __init__(self, setting_objects:dict):
+		self.master_settings = setting_objects['master_settings']
+		self.profile_settings = setting_objects['profile_settings']
+
+	def verbalize_speech(self, speech:str) -> str:
+		"""
+		Returns the response as is and handles the post-turn flags
+		"""
+		self._check_and_handle_postconditions()
+		return speech
+
+	def _check_and_handle_postconditions(self) -> None:
+		"""
+		Post turn flag check
+		"""
+		# check if language needs to be reset (this is done after one-shot speach translationions)
+		if self.master_settings.retrieve_property('functions', 'reset_language'):
+			old_language = self.profile_settings.retrieve_property('old_language')
+			self.profile_settings.save_property('language', old_language)
+			self.master_settings.save_property('functions', False, 'reset_language')
+
+		# There is no program to exit in text mode, the flag is cleared so it does not leak into the next turn
+		if self.master_settings.retrieve_property('status', 'exit'):
+			self.master_settings.save_property('status', False, 'exit')
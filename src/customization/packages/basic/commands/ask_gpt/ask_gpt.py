@@ -1,5 +1,4 @@
-import requests
-import json
+from src.utilities.openai_client.openai_client import get_openai_client, with_deadline, usage
 
 class AskGPT:
 	"""
@@ -46,34 +45,24 @@ class AskGPT:
 			self._update_conversation("user", speech)
 			message = self.conversation_history
   
-		# url to the GPT model
-		url = "https://api.openai.com/v1/chat/completions"
-
-		# Now using the GPT model
-		payload = {
-			"model": self.model,
-			"messages": message,
-			"max_tokens": 100,
-    		"top_p": 1
-		}
-		headers = {
-			"Content-Type": "application/json",
-			"Authorization": f"Bearer {openai_key}"
-		}
-
-		# Send the POST request to the GPT model
-		request = requests.post(url, headers=headers, data=json.dumps(payload))
-		if request.status_code == 200:
-			content = request.json()
-		else:
+		# Send the request to the GPT model using the process wide OpenAI client
+		try:
+			content = with_deadline(get_openai_client(openai_key), 'chat_deadline').chat.completions.create(
+				model=self.model,
+				messages=message,
+				max_tokens=100,
+				top_p=1
+			)
+		except Exception as e:
 			# print error message
-			print(request.text)
+			print(f"An exception occurred: {type(e).__name__}")
 			# If the request fails, return a message to the user
 			return "Sorry, I am currently experiencing technical difficulties. Please try again later."
+		usage.record_completion(content)
 
 		# Extract the 'content' value from the response
 		# This is the response from the GPT model
-		response = content['choices'][0]['message']['content']
+		response = content.choices[0].message.content
 		response = response.strip()
   
 		return response 
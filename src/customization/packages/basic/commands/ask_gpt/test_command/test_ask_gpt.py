@@ -1,27 +1,40 @@
+import os
 import unittest
-from configuration.secrets import key_vault
-from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+from unittest.mock import patch
+from benchmarks.mock_services import MockServices
+from src.utilities.openai_client import openai_client
+from src.utilities.settings.session_state.session_state import SessionState
 from src.customization.packages.basic.commands.ask_gpt.ask_gpt import AskGPT
 
 class TestAskGPT(unittest.TestCase):
-    """Class for testing the AskGPT command"""
+    """Class for testing the AskGPT command against the local mock OpenAI service"""
 
     def setUp(self):
-        self.openai_key = key_vault.retrieve_secret('OpenAI-API')
-        self.master_settings = MasterSettingsManager()
-        self.bot_name = self.master_settings.retrieve_property('name')
-        
-        self.ask_gpt = AskGPT(self.openai_key, self.master_settings, self.bot_name)
-        self.ask_gpt_incorrect = AskGPT("wrong_key", self.master_settings, self.bot_name)
-        
+        self.services = MockServices(api_key='test-openai-key').start()
+        self.addCleanup(self.services.stop)
+        environment = patch.dict(os.environ, {'JUNO_ENDPOINT_OPENAI': self.services.endpoints()['openai']})
+        environment.start()
+        self.addCleanup(environment.stop)
+        # shared clients keep the endpoint they were created with, so every test creates its own
+        clients = patch.dict(openai_client._clients, clear=True)
+        clients.start()
+        self.addCleanup(clients.stop)
+
+        session_state = SessionState()
+        self.setting_objects = {'master_settings': session_state.master_settings, 'profile_settings': session_state.profile_settings}
+        self.bot_name = session_state.profile_settings.retrieve_property('name')
+
+        self.ask_gpt = AskGPT('test-openai-key', self.setting_objects, self.bot_name)
+        self.ask_gpt_incorrect = AskGPT("wrong_key", self.setting_objects, self.bot_name)
+
     def test_ask_GPT(self):
         response = self.ask_gpt.ask_GPT("What are you?")
-        self.assertNotEqual(response, "Sorry, I am currently experiencing technical difficulties. Please try again later.")
+        self.assertEqual(response, "This is a mock answer to: What are you?")
 
     def test_ask_GPT_with_incorrect_key(self):
         # Use a wrong key to provoke an error
         response = self.ask_gpt_incorrect.ask_GPT("What are you?")
         self.assertEqual(response, "Sorry, I am currently experiencing technical difficulties. Please try again later.")
-        
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,16 +1,5 @@
-import yaml
-# Import all commands
-from src.customization.packages.virtual_assistant.commands.ask_gpt.ask_gpt import AskGPT
-from src.customization.packages.virtual_assistant.commands.translate_speech.translate_speech import TranslateSpeech
-from src.customization.packages.virtual_assistant.commands.get_weather.get_weather import GetWeather
-from src.customization.packages.virtual_assistant.commands.web_searcher.web_searcher import WebSearcher
-from src.customization.packages.virtual_assistant.commands.set_timer.set_timer import StartTimer
-from src.customization.packages.virtual_assistant.commands.generate_password.password_generator import PasswordGenerator
-from src.customization.packages.virtual_assistant.commands.get_news.get_news import GetNews
-from src.customization.packages.virtual_assistant.commands.play_music.play_music import PlaySong
-from src.customization.packages.virtual_assistant.commands.schedule_event.scheduler import Scheduler
-from src.utilities.conversation_history.conversation_history_manager import ConversationHistoryManager
-from src.customization.packages.basic.commands.bot_behavior.bot_behavior import BotBehavior
+from functools import cached_property
+from src.initialization.shared_resources import load_yaml
 
 class CommandParser:
 	
@@ -18,33 +7,73 @@ class CommandParser:
 		self.speech_verbalizer = speech_verbalizer
 		self.setting_objects = setting_objects
 		self.intents_data = intents_data
+		self.api_keys = api_keys
 		
 		self._retrieve_settings()
-		self._initialize_commands(api_keys)
   
 	def load_commands(self):
 		# path to 'supported_commands.yaml'
 		commands_file_path = 'src/customization/packages/virtual_assistant/supported_commands.yaml'
   
-		# loads all currently supported bot commands
-		with open(commands_file_path, 'r') as f:
-			commands = yaml.safe_load(f)
-			
-		return commands
+		# loads all currently supported bot commands, the file is only read once per process
+		return load_yaml(commands_file_path)
 	
-	def _initialize_commands(self, api_keys:dict):
-		# Initialize all bot commands
-		self.request_gpt = AskGPT(api_keys, self.setting_objects)
-		self.request_translation = TranslateSpeech(api_keys['TRANSLATOR-API-KEY'], self.setting_objects)
-		self.request_weather = GetWeather(api_keys['WEATHER-API-KEY'])
-		self.browser_request  = WebSearcher()
-		self.timer = StartTimer(self.speech_verbalizer)
-		self.password_generator = PasswordGenerator()
-		self.conversation_history = ConversationHistoryManager()
-		self.request_news = GetNews(self.request_gpt, api_keys)
-		self.request_song = PlaySong(api_keys)
-		self.schedule_event = Scheduler(self.setting_objects)
-		self.bot_behavior = BotBehavior(self.speech_verbalizer, self.setting_objects)
+	# Each command (and the SDK behind it) is imported and created the first time it is used,
+	# so startup does not pay for spotipy, openai, requests, etc. until a command needs them
+	@cached_property
+	def request_gpt(self):
+		from src.customization.packages.virtual_assistant.commands.ask_gpt.ask_gpt import AskGPT
+		return AskGPT(self.api_keys, self.setting_objects)
+
+	@cached_property
+	def request_translation(self):
+		from src.customization.packages.virtual_assistant.commands.translate_speech.translate_speech import TranslateSpeech
+		return TranslateSpeech(self.api_keys['TRANSLATOR-API-KEY'], self.setting_objects)
+
+	@cached_property
+	def request_weather(self):
+		from src.customization.packages.virtual_assistant.commands.get_weather.get_weather import GetWeather
+		return GetWeather(self.api_keys['WEATHER-API-KEY'])
+
+	@cached_property
+	def browser_request(self):
+		from src.customization.packages.virtual_assistant.commands.web_searcher.web_searcher import WebSearcher
+		return WebSearcher()
+
+	@cached_property
+	def timer(self):
+		from src.customization.packages.virtual_assistant.commands.set_timer.set_timer import StartTimer
+		return StartTimer(self.speech_verbalizer)
+
+	@cached_property
+	def password_generator(self):
+		from src.customization.packages.virtual_assistant.commands.generate_password.password_generator import PasswordGenerator
+		return PasswordGenerator()
+
+	@cached_property
+	def conversation_history(self):
+		from src.utilities.conversation_history.conversation_history_manager import ConversationHistoryManager
+		return ConversationHistoryManager(self.setting_objects['master_settings'], self.setting_objects['profile_settings'])
+
+	@cached_property
+	def request_news(self):
+		from src.customization.packages.virtual_assistant.commands.get_news.get_news import GetNews
+		return GetNews(self.request_gpt, self.api_keys)
+
+	@cached_property
+	def request_song(self):
+		from src.customization.packages.virtual_assistant.commands.play_music.play_music import PlaySong
+		return PlaySong(self.api_keys)
+
+	@cached_property
+	def schedule_event(self):
+		from src.customization.packages.virtual_assistant.commands.schedule_event.scheduler import Scheduler
+		return Scheduler(self.setting_objects)
+
+	@cached_property
+	def bot_behavior(self):
+		from src.customization.packages.basic.commands.bot_behavior.bot_behavior import BotBehavior
+		return BotBehavior(self.speech_verbalizer, self.setting_objects)
 		
 	def _retrieve_settings(self):
 		# retrieving the bot's role and language
@@ -59,6 +88,11 @@ class CommandParser:
 		self.gpt_response = True
 		return response
 
+	async def ask_GPT_async(self, speech:str):
+		response = await self.request_gpt.ask_GPT_async(speech=speech)
+		self.gpt_response = True
+		return response
+
 	def translate_speech(self):
 		speech_to_translate = self.intents_data["result"]["prediction"]["entities"][0]["text"]
 		new_language = self.intents_data["result"]["prediction"]["entities"][1]["text"]
@@ -66,6 +100,13 @@ class CommandParser:
 		response = self.request_translation.translate_speech(speech_to_translate, current_language, new_language, one_shot_translation=True)
 		return response
 
+	async def translate_speech_async(self):
+		speech_to_translate = self.intents_data["result"]["prediction"]["entities"][0]["text"]
+		new_language = self.intents_data["result"]["prediction"]["entities"][1]["text"]
+		current_language = self.language
+		response = await self.request_translation.translate_speech_async(speech_to_translate, current_language, new_language, one_shot_translation=True)
+		return response
+
 	def get_weather(self):
 		location = self.intents_data["result"]["prediction"]["entities"][0]["text"]
 		response = self.request_weather.get_weather(location)
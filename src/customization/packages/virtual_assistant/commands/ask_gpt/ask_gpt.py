@@ -1,4 +1,20 @@
-from openai import OpenAI
+import time
+from src.utilities.openai_client.openai_client import get_openai_client, get_async_openai_client, with_deadline, usage
+from src.utilities.logs.metrics_store import record_metric
+
+def build_system_message(entity_name:str, language:str, personality:str, role:str, persona:str=None, user_name:str=None) -> str:
+	"""
+	Builds the system message GPT is given for a profile, also used when exporting its conversations for fine-tuning
+	"""
+	system_message = f"You are a {personality} virtual assistant named {entity_name} who speaks {language}. Your role is {role}."
+
+	if persona:
+		system_message += f" Take on the persona of {persona}. Engage with the user as if you are {persona}."
+
+	if user_name:
+		system_message += f" The user's name is {user_name}."
+
+	return system_message
 
 class AskGPT:
 	"""
@@ -9,7 +25,9 @@ class AskGPT:
 	
 	def __init__(self, api_keys:dict, setting_objects:dict):
      
-		self.client = OpenAI(api_key = api_keys['OPENAI-API-KEY'])
+		# the OpenAI client and its connection pool are shared with every other OpenAI caller in the process
+		self.client = get_openai_client(api_keys['OPENAI-API-KEY'])
+		self.api_key = api_keys['OPENAI-API-KEY']
   
 		self.conversation_history = []
   
@@ -21,23 +39,87 @@ class AskGPT:
    
 		self._Load_in_settings(setting_objects)
 		self.system_message = self._construct_system_message()
+		self._initialize_response_cache(setting_objects)
 		
-	def ask_GPT(self, speech:str, manual_request:bool=False, max_tokens:int=100) -> str:
+	def ask_GPT(self, speech:str, manual_request:bool=False, max_tokens:int=100, model:str=None) -> str:
 		"""
 		Uses the user's speech, the bot's role, and the conversation history 
 		to create a response using OpenAI's GPT model.
+		A model can be given to use instead of the profile's model for this request only.
 		"""
+		# answer repeat questions from the response cache if it is enabled
+		cached_response = self._retrieve_cached_response(speech, manual_request, model)
+		if cached_response:
+			return cached_response
+
 		# get response from gpt
-		response = self._send_gpt_request(speech, manual_request, max_tokens)
+		response = self._send_gpt_request(speech, manual_request, max_tokens, model)
 		# cleanup response
 		response = self._clean_response(response, self.entity_name)
+		self._cache_response(speech, response, manual_request, model)
 	
 		return response
 
-	def _send_gpt_request(self, speech:str, manual_request:bool, max_tokens:int) -> str:
+	async def ask_GPT_async(self, speech:str, manual_request:bool=False, max_tokens:int=100, model:str=None) -> str:
+		"""
+		Same as ask_GPT, but awaits the GPT model using OpenAI's async client instead of blocking.
+		"""
+		cached_response = self._retrieve_cached_response(speech, manual_request, model)
+		if cached_response:
+			return cached_response
+
+		messages = self._prepare_messages(speech, manual_request)
+		start_time = time.perf_counter()
+		try:
+			response = await with_deadline(get_async_openai_client(self.api_key), 'chat_deadline').chat.completions.create(
+				model=model or self.model,
+				messages=messages,
+				max_tokens=max_tokens
+			)
+		except Exception as e:
+			self._record_request(start_time, e)
+			raise
+		self._record_request(start_time)
+		usage.record_completion(response)
+		response = self._clean_response(response.choices[0].message.content, self.entity_name)
+		self._cache_response(speech, response, manual_request, model)
+		return response
+
+	def _send_gpt_request(self, speech:str, manual_request:bool, max_tokens:int, model:str=None) -> str:
 		"""
 		Sends a POST request to the GPT model and returns the response.
 		"""
+		messages = self._prepare_messages(speech, manual_request)
+
+		start_time = time.perf_counter()
+		try:
+			response = with_deadline(self.client, 'chat_deadline').chat.completions.create(
+				model=model or self.model,
+				messages=messages,
+				max_tokens=max_tokens
+			)
+		except Exception as e:
+			self._record_request(start_time, e)
+			raise
+		self._record_request(start_time)
+		usage.record_completion(response)
+
+		# Extract the message
+		response = response.choices[0].message.content
+
+		return response 
+
+	def _record_request(self, start_time:float, error:Exception=None) -> None:
+		"""
+		Records the outcome of a request to OpenAI in the metrics store
+		"""
+		record_metric('upstream', service='openai', status=getattr(error, 'status_code', None if error else 200),
+		              error=type(error).__name__ if error else None, attempts=1, duration_ms=round((time.perf_counter() - start_time) * 1000, 1))
+
+	def _prepare_messages(self, speech:str, manual_request:bool) -> list:
+		"""
+		Prepares the messages sent to the GPT model
+		"""
 		messages = []
 
 		# For manual requests, we start with the system message and add the user message
@@ -48,16 +130,51 @@ class AskGPT:
 			self._update_conversation("user", speech)
 			messages = self.conversation_history
 
-		response = self.client.chat.completions.create(
-			model=self.model,
-			messages=messages,
-			max_tokens=max_tokens
+		return messages
+
+	def _initialize_response_cache(self, setting_objects:dict) -> None:
+		"""
+		Sets up the opt-in semantic response cache configured under 'ask_gpt' in "command_settings.json".
+		Answers are cached per system message, which covers the profile, persona, role and language.
+		"""
+		self.response_cache = None
+		command_settings = setting_objects.get('command_settings')
+		if not command_settings or not command_settings.retrieve_property('ask_gpt', 'cache_enabled'):
+			return
+
+		from .response_cache import get_response_cache
+		self.response_cache = get_response_cache(
+			similarity_threshold=command_settings.retrieve_property('ask_gpt', 'cache_similarity_threshold') or 0.9,
+			ttl=command_settings.retrieve_property('ask_gpt', 'cache_ttl') or 86400,
+			max_entries=command_settings.retrieve_property('ask_gpt', 'cache_max_entries') or 500
 		)
 
-		# Extract the message
-		response = response.choices[0].message.content
+	def _cache_namespace(self, model:str) -> str:
+		"""
+		The cache namespace for the current profile, system message and model
+		"""
+		return f"{self.profile_name}:{model or self.model}:{hash(self.system_message)}"
 
-		return response 
+	def _retrieve_cached_response(self, speech:str, manual_request:bool, model:str) -> str:
+		"""
+		Returns a cached answer to a similar question, manual requests carry their own context and are never cached
+		"""
+		if self.response_cache is None or manual_request:
+			return None
+
+		response = self.response_cache.lookup(speech, self._cache_namespace(model))
+		record_metric('cache', name='gpt', hit=bool(response))
+		if response:
+			# keep the conversation the same as if GPT had been asked
+			self._update_conversation("user", speech)
+		return response
+
+	def _cache_response(self, speech:str, response:str, manual_request:bool, model:str) -> None:
+		"""
+		Stores GPT's answer in the response cache
+		"""
+		if self.response_cache is not None and not manual_request:
+			self.response_cache.store(speech, response, self._cache_namespace(model))
 
 	def _update_conversation(self, role:str, content:str) -> None:
 		"""
@@ -86,15 +203,7 @@ class AskGPT:
 		"""
 		Constructs a system message that is used to initialize the conversation history.
 		"""
-		system_message = f"You are a {self.personality} virtual assistant named {self.entity_name} who speaks {self.language}. Your role is {self.role}."
-  
-		if self.persona:
-			system_message += f" Take on the persona of {self.persona}. Engage with the user as if you are {self.persona}."
-   
-		if self.user_name:
-			system_message += f" The user's name is {self.user_name}."
-   
-		return system_message
+		return build_system_message(self.entity_name, self.language, self.personality, self.role, self.persona, self.user_name)
      
      
 	def _Load_in_settings(self, setting_objects:dict) -> None: 
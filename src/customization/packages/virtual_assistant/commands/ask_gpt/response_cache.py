@@ -0,0 +1,145 @@
+import re
+import time
+import zlib
+import threading
+import numpy as np
+
+class HashingVectorizer:
+	"""
+	Embeds text locally as an L2 normalized vector of hashed character n-grams.
+	Near-duplicate questions ("what's your name", "what is your name?") share most n-grams and therefore score close to 1.
+	"""
+
+	def __init__(self, dimensions:int=4096, ngram_range:tuple=(3, 5)):
+		self.dimensions = dimensions
+		self.ngram_range = ngram_range
+
+	def normalize(self, text:str) -> str:
+		"""
+		Lowercases the text, strips punctuation and expands common contractions
+		"""
+		text = text.lower().replace("'s ", " is ").replace("'re ", " are ").replace("n't ", " not ")
+		text = re.sub(r"[^\w\s]", " ", text)
+		return ' '.join(text.split())
+
+	def vectorize(self, text:str) -> np.ndarray:
+		"""
+		Returns the text's unit length embedding
+		"""
+		vector = np.zeros(self.dimensions, dtype=np.float32)
+		# pad with spaces so the n-grams mark the start and end of words
+		text = f' {self.normalize(text)} '
+		for size in range(self.ngram_range[0], self.ngram_range[1] + 1):
+			for start in range(len(text) - size + 1):
+				# crc32 rather than hash() so embeddings are stable across processes
+				vector[zlib.crc32(text[start:start + size].encode()) % self.dimensions] += 1
+
+		norm = np.linalg.norm(vector)
+		return vector / norm if norm else vector
+
+class SemanticResponseCache:
+	"""
+	Caches GPT answers and returns a stored answer when a new question is similar enough to a recent one.
+	Entries are kept per namespace (e.g. per profile and persona), expire after ttl seconds, and each namespace holds
+	at most max_entries, the oldest entry being replaced once it is full.
+	"""
+
+	# Questions that refer back to the conversation depend on more than their own text, so they are never cached
+	FOLLOW_UP_PATTERN = re.compile(
+		r"^(and|but|so|then|also|what about|how about|why|why not|really|more)\b"
+		r"|\b(it|that|this|those|these|they|them|he|him|she|her|there|again|else|previous|last one|you said)\b"
+	)
+
+	def __init__(self, similarity_threshold:float=0.9, ttl:float=86400, max_entries:int=500, dimensions:int=4096):
+		self.similarity_threshold = similarity_threshold
+		self.ttl = ttl
+		self.max_entries = max_entries
+		self.vectorizer = HashingVectorizer(dimensions)
+		self.namespaces = {}
+		self.hits = 0
+		self.misses = 0
+		self._lock = threading.Lock()
+
+	def is_follow_up(self, question:str) -> bool:
+		"""
+		Whether the question depends on the conversation so far
+		"""
+		normalized_question = self.vectorizer.normalize(question)
+		return len(normalized_question.split()) < 3 or self.FOLLOW_UP_PATTERN.search(normalized_question) is not None
+
+	def lookup(self, question:str, namespace:str) -> str:
+		"""
+		Returns the answer stored for the most similar recent question, or None if there is none above the threshold
+		"""
+		if self.is_follow_up(question):
+			return None
+
+		query = self.vectorizer.vectorize(question)
+		with self._lock:
+			entries = self.namespaces.get(namespace)
+			if entries is None or entries['count'] == 0:
+				self.misses += 1
+				return None
+
+			count = entries['count']
+			# one matrix-vector product scores every stored question, expired entries are masked out
+			similarities = entries['vectors'][:count] @ query
+			similarities[entries['created'][:count] < time.time() - self.ttl] = -1
+			best = int(np.argmax(similarities))
+
+			if similarities[best] < self.similarity_threshold:
+				self.misses += 1
+				return None
+			self.hits += 1
+			return entries['answers'][best]
+
+	def store(self, question:str, answer:str, namespace:str) -> None:
+		"""
+		Stores a question's answer, replacing the oldest entry if the namespace is full
+		"""
+		if not answer or self.is_follow_up(question):
+			return
+
+		vector = self.vectorizer.vectorize(question)
+		with self._lock:
+			entries = self.namespaces.get(namespace)
+			if entries is None:
+				entries = {
+					'vectors': np.zeros((self.max_entries, self.vectorizer.dimensions), dtype=np.float32),
+					'created': np.zeros(self.max_entries),
+					'answers': [None] * self.max_entries,
+					'count': 0,
+					'next': 0
+				}
+				self.namespaces[namespace] = entries
+
+			index = entries['next']
+			entries['vectors'][index] = vector
+			entries['created'][index] = time.time()
+			entries['answers'][index] = answer
+			entries['next'] = (index + 1) % self.max_entries
+			entries['count'] = min(entries['count'] + 1, self.max_entries)
+
+	def status(self) -> dict:
+		"""
+		Returns the cache's hit and miss counts and the number of entries per namespace
+		"""
+		with self._lock:
+			return {
+				"hits": self.hits,
+				"misses": self.misses,
+				"entries": {namespace: entries['count'] for namespace, entries in self.namespaces.items()}
+			}
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_response_cache(similarity_threshold:float=0.9, ttl:float=86400, max_entries:int=500) -> SemanticResponseCache:
+	"""
+	Returns the process wide cache for the given configuration, so every session of a profile shares its answers
+	"""
+	key = (similarity_threshold, ttl, max_entries)
+	with _caches_lock:
+		if key not in _caches:
+			_caches[key] = SemanticResponseCache(similarity_threshold, ttl, max_entries)
+		return _caches[key]
@@ -1,23 +1,33 @@
 import json
 import os
-from configuration.secrets import key_vault
-from src.utilities.settings.master_settings.master_settings_manager import BotSettingsManager
+from benchmarks.mock_services import MockServices
+from src.utilities.settings.session_state.session_state import SessionState
 from src.customization.packages.virtual_assistant.commands.ask_gpt.ask_gpt import AskGPT
 
-# Relative path to mock_prompt.json file
-mock_prompt_path = os.path.join('customization/components/commands/ask_gpt/test_command/test_prompt/mock_prompt.json')
+# Path to the mock_prompt.json file next to this script
+mock_prompt_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_prompt.json')
 
 class TestPrompt:
-    """A class for testing prompts on the AskGPT command"""
+    """
+    A class for testing prompts on the AskGPT command.
+    Prompts are sent to the local mock OpenAI service unless an OpenAI key is given in OPENAI_API_KEY.
+    """
     
     def __init__(self):
-        self.openai_key = key_vault.retrieve_secret('OpenAI-API')
-        self.master_settings = BotSettingsManager()
-        self.bot_name = self.master_settings.retrieve_property('bot_name')
+        self.openai_key = os.environ.get('OPENAI_API_KEY')
+        self.services = None
+        if not self.openai_key:
+            self.openai_key = 'test-openai-key'
+            self.services = MockServices(api_key=self.openai_key).start()
+            os.environ['JUNO_ENDPOINT_OPENAI'] = self.services.endpoints()['openai']
+
+        session_state = SessionState()
+        setting_objects = {'master_settings': session_state.master_settings, 'profile_settings': session_state.profile_settings}
         
         #self.prompt = self._read_prompt()
         self.prompt = f"You are a helpful virtual assistant named Sarah. Keep your responses concise yet informative to the user."
-        self.ask_gpt = AskGPT(self.openai_key, self.master_settings, self.bot_name, self.prompt)
+        self.ask_gpt = AskGPT({'OPENAI-API-KEY': self.openai_key}, setting_objects)
+        self.ask_gpt.system_message = self.prompt
         
     def _ask_GPT(self):
         response = self.ask_gpt.ask_GPT(speech='What are your thoughts on climate change?', model='gpt-4', manual_request=True)
@@ -30,4 +40,4 @@ class TestPrompt:
             
 if __name__ == '__main__':
     test_prompt = TestPrompt()
-    print(test_prompt._ask_GPT())
\ No newline at end of file
+    print(test_prompt._ask_GPT())
@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import patch
+from src.customization.packages.virtual_assistant.commands.ask_gpt.response_cache import SemanticResponseCache
+
+class TestSemanticResponseCache(unittest.TestCase):
+    """Class for testing the SemanticResponseCache"""
+
+    def setUp(self):
+        self.cache = SemanticResponseCache(similarity_threshold=0.8, ttl=60, max_entries=2)
+        self.cache.store("What is your favorite color?", "Blue!", "juno")
+
+    def test_similar_question_is_a_hit(self):
+        self.assertEqual(self.cache.lookup("what's your favorite colour", "juno"), "Blue!")
+
+    def test_different_question_or_namespace_is_a_miss(self):
+        self.assertIsNone(self.cache.lookup("How far away is the moon?", "juno"))
+        self.assertIsNone(self.cache.lookup("What is your favorite color?", "another profile"))
+
+    def test_follow_ups_bypass_the_cache(self):
+        self.assertTrue(self.cache.is_follow_up("Why is that?"))
+        self.assertTrue(self.cache.is_follow_up("And yours?"))
+        self.assertFalse(self.cache.is_follow_up("What is your favorite color?"))
+
+    def test_expired_entries_are_ignored(self):
+        with patch('src.customization.packages.virtual_assistant.commands.ask_gpt.response_cache.time.time', return_value=10**12):
+            self.assertIsNone(self.cache.lookup("What is your favorite color?", "juno"))
+
+    def test_oldest_entry_is_replaced_when_full(self):
+        self.cache.store("How tall is Mount Everest?", "8,849 meters.", "juno")
+        self.cache.store("Who wrote Hamlet?", "Shakespeare.", "juno")
+        self.assertIsNone(self.cache.lookup("What is your favorite color?", "juno"))
+        self.assertEqual(self.cache.lookup("Who wrote Hamlet?", "juno"), "Shakespeare.")
+
+if __name__ == '__main__':
+    unittest.main()
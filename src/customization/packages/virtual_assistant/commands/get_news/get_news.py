@@ -1,4 +1,5 @@
-import requests   
+from src.utilities.http.http_transport import get_transport
+from src.utilities.http.service_endpoints import retrieve_service_endpoint
 
 class GetNews():
 	
@@ -8,7 +9,7 @@ class GetNews():
 		"sortBy": "top",
 		"apiKey": api_keys['NEWS-API-KEY']
 		}
-		self.main_url = " https://newsapi.org/v1/articles"
+		self.main_url = f"{retrieve_service_endpoint('news')}/articles"
 
 		# using GPT to summarize articles
 		self.gpt = ask_gpt
@@ -17,8 +18,12 @@ class GetNews():
 		"""Returns the top news articles from BBC News."""
      
 		 # fetching data in json format
-		data = requests.get(self.main_url, params=self.query_params)
-		open_bbc_page = data.json()
+		try:
+			data = get_transport().get(self.main_url, params=self.query_params)
+			open_bbc_page = data.json()
+		except Exception as e:
+			print(f"An exception occurred: {type(e).__name__}")
+			return "Sorry, I was unable to retrieve the news. Please try asking again."
 	
 		# getting all articles in a string article
 		articles = open_bbc_page["articles"]
@@ -1,4 +1,5 @@
-import requests
+from src.utilities.http.http_transport import get_transport
+from src.utilities.http.service_endpoints import retrieve_service_endpoint
 from src.utilities.settings.command_settings.command_settings_manager import BotCommandManager
 
 class GetWeather:
@@ -42,7 +43,8 @@ class GetWeather:
   		Sends a request to the OpenWeatherMap API for the current temperature of a given location
   		"""
 		try:
-			response = requests.get(f"https://api.openweathermap.org/data/2.5/weather?q={location}&units={self.units}&appid={self.weather_key}")
+			params = {"q": location, "units": self.units, "appid": self.weather_key}
+			response = get_transport().get(f"{retrieve_service_endpoint('weather')}/weather", params=params)
 		except Exception as e:
 			response = "Sorry, an error has occured. Please try asking again."
 			return response
@@ -1,23 +1,39 @@
+import os
 import unittest
-from configuration.secrets.key_vault import KeyVaultManager
+from unittest.mock import patch
+from benchmarks.mock_services import MockServices
+from src.utilities.settings.session_state.session_state import SessionState
+from src.customization.voices.voice_settings_manager import VoiceSettingsManager
 from src.customization.packages.virtual_assistant.commands.translate_speech.translate_speech import TranslateSpeech
 
 class TestTranslateSpeech(unittest.TestCase):
-    """Class for testing the TranslateSpeech command"""
-    
+    """Class for testing the TranslateSpeech command against the local mock Translator service"""
+
     def setUp(self):
-        self.key_vault = KeyVaultManager()
-        self.translator_key = self.key_vault.retrieve_secret('TRANSLATOR-API-KEY')
-        self.translator = TranslateSpeech(self.translator_key)
-        self.translator_incorrect = TranslateSpeech("wrong key")
-        
+        self.services = MockServices(api_key='test-translator-key').start()
+        self.addCleanup(self.services.stop)
+        environment = patch.dict(os.environ, {'JUNO_ENDPOINT_TRANSLATOR': self.services.endpoints()['translator']})
+        environment.start()
+        self.addCleanup(environment.stop)
+
+        # the session's settings are kept in memory, so the language changes made by translating are never saved
+        self.session_state = SessionState()
+        self.setting_objects = {
+            'master_settings': self.session_state.master_settings,
+            'profile_settings': self.session_state.profile_settings,
+            'voice_settings': VoiceSettingsManager(self.session_state.master_settings, self.session_state.profile_settings)
+        }
+        self.translator = TranslateSpeech('test-translator-key', self.setting_objects)
+        self.translator_incorrect = TranslateSpeech('wrong key', self.setting_objects)
+
     def test_translator(self):
         response = self.translator.translate_speech("Hello", "English", "Spanish", one_shot_translation=True)
-        self.assertEqual(response, "Hola")
+        self.assertEqual(response, "[es] Hello")
+        self.assertTrue(self.session_state.master_settings.retrieve_property('functions', 'reset_language'))
 
     def test_translator_with_incorrect_key(self):
         response = self.translator_incorrect.translate_speech("Hello", "English", "Spanish", one_shot_translation=True)
         self.assertEqual(response, 'Sorry, there was an error while trying to translate: Hello. Try asking again.')
-        
+
 if __name__ == '__main__':
     unittest.main()
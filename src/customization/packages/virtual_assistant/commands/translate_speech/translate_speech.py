@@ -1,5 +1,7 @@
-import requests
+import asyncio
 import uuid
+from src.utilities.http.http_transport import get_transport
+from src.utilities.http.service_endpoints import retrieve_service_endpoint
 
 class TranslateSpeech:
 	"""
@@ -12,7 +14,7 @@ class TranslateSpeech:
 		self.master_settings = setting_objects['master_settings']
 		self.profile_settings = setting_objects['profile_settings']
 		self.voice_settings = setting_objects['voice_settings']
-		self.endpoint = "https://api.cognitive.microsofttranslator.com/translate"
+		self.endpoint = f"{retrieve_service_endpoint('translator')}/translate"
 			
 	def translate_speech(self, speech_to_translate:str, current_language:str, new_language:str, one_shot_translation:bool=False) -> str:
 		"""
@@ -38,6 +40,12 @@ class TranslateSpeech:
 
 		return response
 
+	async def translate_speech_async(self, speech_to_translate:str, current_language:str, new_language:str, one_shot_translation:bool=False) -> str:
+		"""
+		Translates a given string of text to a desired langauge without blocking the event loop.
+		"""
+		return await asyncio.to_thread(self.translate_speech, speech_to_translate, current_language, new_language, one_shot_translation)
+
 	def _update_settings(self, new_language) -> None:
 		"""
 		Updates the current and old language settings.
@@ -98,7 +106,7 @@ class TranslateSpeech:
 
 		# attempt to send a request to Azure's Translator service
 		try:
-			request = requests.post(self.endpoint, params=params, headers=headers, json=body)
+			request = get_transport().post(self.endpoint, params=params, headers=headers, json=body)
 			response = request.json()
 
 			# get the translated speech
@@ -5,6 +5,11 @@ from src.utilities.settings.master_settings.master_settings_manager import Maste
 
 profiles_path = f"src/customization/profiles/profile_storage"
 
+# Properties stored within each section of a profile's settings.yaml
+entity_properties = ['name', 'gender', 'language', 'personality', 'persona', 'prompt', 'role']
+system_properties = ['gpt_model', 'package', 'startup_sound', 'tts', 'voice_name', 'voice_recognition_engine']
+user_properties = ['user_name', 'user_gender']
+
 class ProfileManager:
     
     def create_profile(self, config, profile_name) -> None:
@@ -34,11 +39,17 @@ class ProfileManager:
         
         profile_data = self._load_profile_data(profile_name)
         
-        if property_name in ['name', 'gender', 'language', 'personality', 'persona', 'prompt', 'role']:
+        return self.retrieve_property_from_data(profile_data, property_name)
+
+    def retrieve_property_from_data(self, profile_data:dict, property_name:str) -> str:
+        """
+        Gets a given property from already loaded profile data
+        """
+        if property_name in entity_properties:
             return profile_data['entity'][property_name]
-        if property_name in ['gpt_model', 'package', 'startup_sound', 'tts', 'voice_name', 'voice_recognition_engine']:
+        if property_name in system_properties:
             return profile_data['system'][property_name]
-        if property_name in ['user_name', 'user_gender']:
+        if property_name in user_properties:
             if property_name == 'user_name':
                 property_name = 'name'
             if property_name == 'user_gender':
@@ -52,18 +63,28 @@ class ProfileManager:
         if not profile_name:    
             profile_name = MasterSettingsManager().retrieve_property('profile')
             
+        self.save_properties({property_name: property_value}, profile_name)
+
+    def save_properties(self, properties:dict, profile_name=None) -> None:
+        """
+        Saves several properties to a given profile with a single write
+        """
+        if not profile_name:    
+            profile_name = MasterSettingsManager().retrieve_property('profile')
+            
         profile_data = self._load_profile_data(profile_name)
         
-        if property_name in ['name', 'gender', 'language', 'personality', 'persona', 'prompt', 'role']:
-            profile_data['entity'][property_name] = property_value
-        if property_name in ['gpt_model', 'package', 'startup_sound', 'tts', 'voice_name', 'voice_recognition_engine']:
-            profile_data['system'][property_name] = property_value
-        if property_name in ['user_name', 'user_gender']:
-            if property_name == 'user_name':
-                property_name = 'name'
-            if property_name == 'user_gender':
-                property_name = 'gender'
-            profile_data['user'][property_name] = property_value
+        for property_name, property_value in properties.items():
+            if property_name in entity_properties:
+                profile_data['entity'][property_name] = property_value
+            if property_name in system_properties:
+                profile_data['system'][property_name] = property_value
+            if property_name in user_properties:
+                if property_name == 'user_name':
+                    property_name = 'name'
+                if property_name == 'user_gender':
+                    property_name = 'gender'
+                profile_data['user'][property_name] = property_value
             
         with open (os.path.join(profiles_path, profile_name, 'settings.yaml'), 'w') as file:
             yaml.dump(profile_data, file)
@@ -1,4 +1,3 @@
-from playsound import playsound
 import os
 
 def play_bot_sound(sound_name):
@@ -12,6 +11,7 @@ def play_bot_sound(sound_name):
 	# Play sound if it exists
 	if os.path.isfile(sound_path):
 		try:
+			from playsound import playsound
 			playsound(sound_path)
 		except:
 			print(f"Error playing {sound_name}.wav. Ensure {sound_name}.wav is a valid wav file")
@@ -2,7 +2,7 @@ import json
 import os
 from src.customization.profiles.profile_manager import ProfileManager
 from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
-from configuration.manage_secrets import ConfigurationManager 
+from src.initialization.shared_resources import load_json
 
 current_directory = os.path.dirname(os.path.abspath(__file__))
 azure_voice_settings_path = os.path.join(current_directory, 'azure', 'azure_voices.json')
@@ -14,13 +14,14 @@ class VoiceSettingsManager:
 	Class for managing the voice settings for the Azure and Elevenlabs voice engines.
 	"""
  
-	def __init__(self):
+	def __init__(self, master_settings:object=None, profile_settings:object=None):
 		"""
 		Instantiates the class and loads the data from either "azure_voices.json" or "elevenlabs_voices.json"
+		:param master_settings: (object) the session's master settings, defaults to "master_settings.json"
+		:param profile_settings: (object) the session's profile settings, defaults to the profiles on disk
 		"""
-		self.configuration_manager = ConfigurationManager()
-		self.profile_settings = ProfileManager()
-		self.master_settings = MasterSettingsManager()
+		self.profile_settings = profile_settings or ProfileManager()
+		self.master_settings = master_settings or MasterSettingsManager()
 		self.profile_name = self.master_settings.retrieve_property('profile')
 		self.text_to_speech_engine = self.profile_settings.retrieve_property('tts', self.profile_name )
 		self.data = self._load_in_voice_data(elevenlabs_voice_settings_path)
@@ -87,7 +88,7 @@ class VoiceSettingsManager:
 		"""
 		Retrieves all of the available languages 
 		"""
-		data = self._load_in_voice_data(language_codes_path)
+		data = load_json(language_codes_path)
 		available_languages = list(data["language_country_codes"].keys())
 		# Convert language codes to title case
 		available_languages = [language_code.title() for language_code in available_languages]
@@ -100,7 +101,7 @@ class VoiceSettingsManager:
 		"""
 		Retrieves the language code associated with a specified language
 		"""
-		data = self._load_in_voice_data(language_codes_path)
+		data = load_json(language_codes_path)
 		language_codes = data["language_codes"].get(language)
 		return language_codes
 		
@@ -108,7 +109,7 @@ class VoiceSettingsManager:
 		"""
 		Gets the country code for the given language
 		"""
-		data = self._load_in_voice_data(language_codes_path)
+		data = load_json(language_codes_path)
 		country_codes = data['language_country_codes'].get(language)
 		return country_codes
 	
@@ -0,0 +1,62 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class InitializationGraph:
+	"""
+	Runs initialization steps concurrently on a thread pool, each step waiting only on the steps it depends on.
+	"""
+
+	def __init__(self, max_workers:int=4):
+		self.max_workers = max_workers
+		self.steps = {}
+		self.timings = {}
+
+	def add_step(self, name:str, function, dependencies:tuple=()) -> None:
+		"""
+		Adds a step, function is called with the results of its dependencies in the order they are listed
+		"""
+		if name in self.steps:
+			raise ValueError(f"Initialization step '{name}' was already added")
+		for dependency in dependencies:
+			if dependency not in self.steps:
+				raise ValueError(f"Initialization step '{name}' depends on '{dependency}', which must be added first")
+		self.steps[name] = (function, tuple(dependencies))
+
+	def run(self) -> dict:
+		"""
+		Runs every step and returns their results by name.
+		Steps are added after their dependencies, so submitting them in order means a step only ever
+		waits on steps that are already running or finished and the pool cannot deadlock.
+		If a step raises, its exception is raised here once every submitted step has finished.
+		"""
+		start_time = time.perf_counter()
+		futures = {}
+		with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='juno-init') as executor:
+			for name, (function, dependencies) in self.steps.items():
+				dependency_futures = [futures[dependency] for dependency in dependencies]
+				futures[name] = executor.submit(self._run_step, name, function, dependency_futures)
+
+		results = {name: future.result() for name, future in futures.items()}
+		self.timings['total'] = time.perf_counter() - start_time
+		return results
+
+	def _run_step(self, name:str, function, dependency_futures:list):
+		"""
+		Waits on the step's dependencies, then runs and times it
+		"""
+		arguments = [future.result() for future in dependency_futures]
+		start_time = time.perf_counter()
+		try:
+			return function(*arguments)
+		finally:
+			self.timings[name] = time.perf_counter() - start_time
+
+	def report(self) -> str:
+		"""
+		Returns the time each step took, slowest first
+		"""
+		steps = sorted((name for name in self.timings if name != 'total'), key=lambda name: self.timings[name], reverse=True)
+		lines = [f"{name:<20} {self.timings[name] * 1000:8.1f} ms" for name in steps]
+		if 'total' in self.timings:
+			lines.append(f"{'total':<20} {self.timings['total'] * 1000:8.1f} ms")
+		return '\n'.join(lines)
@@ -1,75 +1,143 @@
-import azure.cognitiveservices.speech as speechsdk
-from src.core_functions.speech_recognition.speech_recognizer import SpeechRecognition
+import threading
 from src.core_functions.speech_processing.speech_processor import SpeechProcessor
-from src.core_functions.speech_verbalization.speech_verbalizer import SpeechVerbalizer
-from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+from src.utilities.settings.session_state.session_state import SessionState
 from src.customization.voices.voice_settings_manager import VoiceSettingsManager
 from src.utilities.settings.command_settings.command_settings_manager import BotCommandManager
-from src.customization.profiles.profile_manager import ProfileManager
-from configuration.manage_secrets import ConfigurationManager
 from src.customization.sounds import play_sound
+from src.initialization.initialization_graph import InitializationGraph
+from src.initialization import shared_resources
 
 class BotInitializer:
 	'''
 	Initialize the bot's core functionalities: speech recognition, speech processing, and speech verbalization
 	'''
 	
-	def __init__(self):
+	def __init__(self, mode:str='voice', profile_name:str=None):
 		"""
 		Initializes Juno with the following proccesses:
 		- Load in settings objects and save given params to bot settings
 		- Retrieve dictionary of api keys
 		- Initialize the bot's core functionalities: speech recognition, speech processing, and speech verbalization
-		- Play startup sound once initialization is complete.
+		- Play startup sound while initialization finishes
+		Independent steps are run concurrently and the time each one took is kept in init_timings.
+		In 'text' mode no audio or speech SDK objects are created and only speech processing is initialized.
+		A profile_name runs the session on that profile instead of the one in "master_settings.json".
 		"""
-  
-		# load in bot, voice, command, and profile setting objects and store them in a dictionary for ease of use
-		self.setting_objects = self._load_in_setting_objects()
-  
+		self.mode = mode
+		self.profile_name = profile_name
+		self.initialization = InitializationGraph()
+
+		# Steps run concurrently, each one only waits on the steps named in its dependencies
+		self.initialization.add_step('session_state', self._load_in_session_state)
+		self.initialization.add_step('voice_settings', self._load_in_voice_settings, ('session_state',))
+		self.initialization.add_step('command_settings', BotCommandManager)
 		# retrieve api keys as a dictionary
-		self.api_keys = ConfigurationManager().retrieve_api_keys()
-  
-		# Initializing the bot's audio configuration, speech configuration, speech recognizer, and speech synthesizer
-		# The audio_config, speech_config, speech_recognizer, and speech_synthesizer are all being stored in a dictionary for ease of use  
-		self.speech_objects = self._setup_speech_and_audio(self.api_keys['COGNITIVE-SERVICES-API-KEY'], self.api_keys['REGION'], self.setting_objects['profile_settings'].retrieve_property('language'))
+		self.initialization.add_step('api_keys', self._retrieve_api_keys)
+		# load in bot, voice, command, and profile setting objects and store them in a dictionary for ease of use
+		self.initialization.add_step('setting_objects', self._load_in_setting_objects, ('session_state', 'voice_settings', 'command_settings'))
+
+		if self.mode == 'text':
+			self._initialize_text_functionalities()
+		else:
+			# plays the startup sound on its own thread while initialization finishes, text sessions stay silent
+			self.initialization.add_step('startup_sound', self._play_startup_sound, ('setting_objects',))
 
-		# initializing the bot's core functionalities: speech recognition, speech processing, and speech verbalization
-		self._initialize_speech_functionalities()
+			# Initializing the bot's audio configuration, speech configuration, speech recognizer, and speech synthesizer
+			# The audio_config, speech_config, speech_recognizer, and speech_synthesizer are all being stored in a dictionary for ease of use  
+			self.initialization.add_step('speech_objects', self._setup_speech_and_audio, ('api_keys', 'setting_objects'))
+
+			# initializing the bot's core functionalities: speech recognition, speech processing, and speech verbalization
+			self._initialize_speech_functionalities()
+
+		results = self.initialization.run()
+		self.session_state = results['session_state']
+		self.setting_objects = results['setting_objects']
+		self.api_keys = results['api_keys']
+		self.speech_objects = results.get('speech_objects')
+		self.speech_recognition = results.get('speech_recognition')
+		self.speech_verbalizer = results['speech_verbalizer']
+		self.speech_processor = results['speech_processor']
+
+		# feed stable partial hypotheses into intent recognition before the user has finished speaking
+		if self.speech_recognition and self.setting_objects['master_settings'].retrieve_property('functions', 'early_intent_prediction'):
+			self.speech_recognition.enable_early_intent_prediction(self.speech_processor.prefetch_intent)
+
+		# time taken by each initialization step, in seconds
+		self.init_timings = self.initialization.timings
+		if self.setting_objects['master_settings'].retrieve_property('functions', 'report_init_timings'):
+			print(f"Initialization timings:\n{self.initialization.report()}")
+
+	def _load_in_session_state(self) -> SessionState:
+		"""
+		Master and profile settings are held in memory by the session's state. A voice bot persists its changes
+		shortly after they are made, a text session only persists them when asked to.
+		"""
+		return SessionState(self.profile_name, persist_delay=1.0 if self.mode == 'voice' else None)
 
-		# plays startup sound
-		if self.setting_objects['profile_settings'].retrieve_property('startup_sound'):
-			play_sound.play_bot_sound('startup_sound')
+	def _load_in_voice_settings(self, session_state:SessionState) -> VoiceSettingsManager:
+		"""
+		Voice settings follow the session's profile rather than the one in "master_settings.json"
+		"""
+		return VoiceSettingsManager(session_state.master_settings, session_state.profile_settings)
+
+	def _retrieve_api_keys(self) -> dict:
+		"""
+		Retrieves the bot's secret values, shared with every other instance if the process was prewarmed
+		"""
+		return shared_resources.retrieve_api_keys()
+
+	def _play_startup_sound(self, setting_objects:dict) -> None:
+		"""
+		Plays the startup sound without holding up initialization
+		"""
+		if setting_objects['profile_settings'].retrieve_property('startup_sound'):
+			threading.Thread(target=play_sound.play_bot_sound, args=('startup_sound',), daemon=True).start()
   
-	def _load_in_setting_objects(self) -> dict:
+	def _load_in_setting_objects(self, session_state:SessionState, voice_settings:VoiceSettingsManager, command_settings:BotCommandManager) -> dict:
 		"""
-  		Initialize setting objects and store them in a dictionary for ease of use
+  		Store the setting objects in a dictionary for ease of use
     	"""
 		settings = {}
-		settings['master_settings'] = MasterSettingsManager()
-		settings['voice_settings'] = VoiceSettingsManager()
-		settings['command_settings'] = BotCommandManager()
-		settings['profile_settings'] = ProfileManager()
+		settings['master_settings'] = session_state.master_settings
+		settings['voice_settings'] = voice_settings
+		settings['command_settings'] = command_settings
+		settings['profile_settings'] = session_state.profile_settings
 		return settings 
 
-	def _setup_speech_and_audio(self, cognitive_services_api:str, region:str, language:str) -> dict:
+	def _setup_speech_and_audio(self, api_keys:dict, setting_objects:dict) -> dict:
 		"""
   		Initializes the bot's audio configuration, speech configuration, speech recognizer, and speech synthesizer
     	"""
+		import azure.cognitiveservices.speech as speechsdk
+
+		cognitive_services_api = api_keys['COGNITIVE-SERVICES-API-KEY']
+		region = api_keys['REGION']
+		language = setting_objects['profile_settings'].retrieve_property('language')
+
 		speech_objects = {}
 		speech_objects['audio_config'] = speechsdk.audio.AudioOutputConfig(use_default_speaker=True)
 		speech_objects['speech_config'] = speechsdk.SpeechConfig(subscription = cognitive_services_api, region = region)
-		speech_objects['speech_recognizer'] = speechsdk.SpeechRecognizer(speech_config=speech_objects['speech_config'], audio_config=speech_objects['audio_config'], language=self.setting_objects['voice_settings'].retrieve_language_country_code(language))
+		speech_objects['speech_recognizer'] = speechsdk.SpeechRecognizer(speech_config=speech_objects['speech_config'], audio_config=speech_objects['audio_config'], language=setting_objects['voice_settings'].retrieve_language_country_code(language))
 		speech_objects['speech_synthesizer'] = speechsdk.SpeechSynthesizer(speech_config=speech_objects['speech_config'], audio_config=speech_objects['audio_config'])
 		return speech_objects
   
 	def _initialize_speech_functionalities(self) -> None:
 		"""
   		initializing speech recognition, speech processing, and speech verbalization
+		recognition and verbalization are built concurrently, processing waits on the verbalizer it is given
     	"""
-		self.speech_recognition = SpeechRecognition(self.speech_objects, self.api_keys, self.setting_objects)
-		self.speech_verbalizer  = SpeechVerbalizer(self.speech_objects, self.api_keys, self.setting_objects)
-		self.speech_processor = SpeechProcessor(self.api_keys, self.setting_objects, self.speech_verbalizer)
-  
+		from src.core_functions.speech_recognition.speech_recognizer import SpeechRecognition
+		from src.core_functions.speech_verbalization.speech_verbalizer import SpeechVerbalizer
 
+		self.initialization.add_step('speech_recognition', SpeechRecognition, ('speech_objects', 'api_keys', 'setting_objects'))
+		self.initialization.add_step('speech_verbalizer', SpeechVerbalizer, ('speech_objects', 'api_keys', 'setting_objects'))
+		self.initialization.add_step('speech_processor', SpeechProcessor, ('api_keys', 'setting_objects', 'speech_verbalizer'))
 
+	def _initialize_text_functionalities(self) -> None:
+		"""
+		initializing speech processing only, responses are returned as text rather than verbalized
+		"""
+		from src.core_functions.speech_verbalization.text_verbalizer import TextVerbalizer
 
+		self.initialization.add_step('speech_verbalizer', TextVerbalizer, ('setting_objects',))
+		self.initialization.add_step('speech_processor', SpeechProcessor, ('api_keys', 'setting_objects', 'speech_verbalizer'))
@@ -0,0 +1,99 @@
+"""
+Read-only resources that every Juno instance in a process can share.
+A preforking server loads them once in the parent with prewarm() so forked workers share them copy-on-write.
+Cached data is shared between instances and must not be modified.
+"""
+
+import gc
+import json
+import glob
+import os
+import threading
+import yaml
+from importlib import import_module
+
+_lock = threading.Lock()
+_api_keys = None
+_json_files = {}
+_yaml_files = {}
+
+def retrieve_api_keys() -> dict:
+	"""
+	Returns the api keys loaded by prewarm(), or retrieves them from the configured secret storage if the process was not prewarmed
+	"""
+	if _api_keys is not None:
+		return dict(_api_keys)
+
+	from configuration.manage_secrets import ConfigurationManager
+	return ConfigurationManager().retrieve_api_keys()
+
+def use_api_keys(api_keys:dict) -> None:
+	"""
+	Makes every instance in the process use the given api keys instead of the configured secret storage,
+	used to run Juno against local stand-in services
+	"""
+	global _api_keys
+	_api_keys = dict(api_keys)
+
+def load_json(file_path:str) -> dict:
+	"""
+	Loads a JSON file once per process
+	"""
+	with _lock:
+		if file_path not in _json_files:
+			with open(file_path, 'r') as f:
+				_json_files[file_path] = json.load(f)
+		return _json_files[file_path]
+
+def load_yaml(file_path:str) -> dict:
+	"""
+	Loads a YAML file once per process
+	"""
+	with _lock:
+		if file_path not in _yaml_files:
+			with open(file_path, 'r') as f:
+				_yaml_files[file_path] = yaml.safe_load(f)
+		return _yaml_files[file_path]
+
+def prewarm(package:str=None) -> None:
+	"""
+	Loads the secrets, voice and language indexes, and the command registry of the given package (or the current profile's),
+	and imports the modules a Juno instance needs so they do not have to be loaded again per instance
+	"""
+	global _api_keys
+
+	from src.initialization.initializer import BotInitializer
+	from src.customization.voices import voice_settings_manager
+
+	_api_keys = retrieve_api_keys()
+	load_json(voice_settings_manager.language_codes_path)
+
+	if package is None:
+		from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+		from src.customization.profiles.profile_manager import ProfileManager
+		package = ProfileManager().retrieve_property('package', MasterSettingsManager().retrieve_property('profile'))
+	if package:
+		_import_package(package)
+
+def freeze() -> None:
+	"""
+	Moves every object allocated so far out of the garbage collector's reach, so collections in forked workers
+	do not write to (and therefore copy) the pages shared with the parent
+	"""
+	gc.collect()
+	gc.freeze()
+
+def _import_package(package:str) -> None:
+	"""
+	Imports a package's command parser, its supported commands and every command module
+	"""
+	import_module(f'src.customization.packages.{package}.command_parser')
+	load_yaml(f'src/customization/packages/{package}/supported_commands.yaml')
+
+	# command modules live directly within each command's directory, tests live in 'test_command' sub directories
+	for file_path in sorted(glob.glob(f'src/customization/packages/{package}/commands/*/*.py')):
+		module_name = os.path.splitext(file_path)[0].replace(os.sep, '.').replace('/', '.')
+		try:
+			import_module(module_name)
+		except ImportError as e:
+			print(f"Command module {module_name} could not be preloaded: {e}")
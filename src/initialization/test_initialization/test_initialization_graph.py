@@ -0,0 +1,38 @@
+import time
+import unittest
+from src.initialization.initialization_graph import InitializationGraph
+
+class TestInitializationGraph(unittest.TestCase):
+    """Class for testing the InitializationGraph"""
+
+    def test_steps_receive_dependency_results(self):
+        graph = InitializationGraph()
+        graph.add_step('a', lambda: 1)
+        graph.add_step('b', lambda: 2)
+        graph.add_step('c', lambda a, b: a + b, ('a', 'b'))
+        results = graph.run()
+        self.assertEqual(results['c'], 3)
+        self.assertIn('c', graph.timings)
+        self.assertIn('total', graph.timings)
+
+    def test_independent_steps_run_concurrently(self):
+        graph = InitializationGraph(max_workers=3)
+        for name in ['a', 'b', 'c']:
+            graph.add_step(name, lambda: time.sleep(0.2))
+        graph.run()
+        self.assertLess(graph.timings['total'], 0.5)
+
+    def test_failing_step_is_raised(self):
+        graph = InitializationGraph()
+        graph.add_step('a', lambda: 1 / 0)
+        graph.add_step('b', lambda a: a, ('a',))
+        with self.assertRaises(ZeroDivisionError):
+            graph.run()
+
+    def test_unknown_dependency_is_rejected(self):
+        graph = InitializationGraph()
+        with self.assertRaises(ValueError):
+            graph.add_step('a', lambda b: b, ('b',))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,28 +1,39 @@
+import asyncio
 from src.initialization.initializer import BotInitializer
+from src.core_functions.speech_pipeline.async_speech_pipeline import AsyncSpeechPipeline
 
 class Juno:
 	"""
 	A simple interface for creating an intelligent and interactive entity.
 	"""
  
-	def __init__(self):
+	def __init__(self, mode:str='voice', profile_name:str=None):
+		"""
+		:param mode: (str) 'voice' to listen, process, and verbalize, or 'text' to only process text input
+		:param profile_name: (str) profile to use instead of the one in "master_settings.json"
+		"""
+		self.mode = mode
+		self.profile_name = profile_name
 		self._initalize()
   
 	def _initalize(self) -> None:
 		"""
 		Initializes the speech recognition, speech processing, and speech verbalization
 		"""	
-		self.BotInitializer = BotInitializer()
+		self.BotInitializer = BotInitializer(self.mode, self.profile_name)
 		self.speech_recognition = self.BotInitializer.speech_recognition
 		self.speech_processor = self.BotInitializer.speech_processor
 		self.speech_verbalizer = self.BotInitializer.speech_verbalizer
+		self.session_state = self.BotInitializer.session_state
 	
-	def listen(self) -> str:
+	def listen(self, stop_event=None) -> str:
 		"""
 		Listens for users speech input
-		:return: (str) speech input
+		:param stop_event: (threading.Event) optional event that stops listening once it is set
+		:return: (str) speech input, or None if listening was stopped
 		"""		
-		return self.speech_recognition.listen()
+		self._check_voice_mode('listen')
+		return self.speech_recognition.listen(stop_event)
 
 	def process(self, speech: str) -> str:
 		"""
@@ -30,24 +41,84 @@ class Juno:
 		:param speech: (str) speech input
 		:return: (str) response to users speech
 		"""
-		return self.speech_processor.process_speech(speech)
+		response = self.speech_processor.process_speech(speech)
+
+		# In text mode there is no verbalization step, so the turn's flags are handled here
+		if self.mode == 'text':
+			self.speech_verbalizer.verbalize_speech(response)
+
+		return response
 	
 	def verbalize(self, response: str) -> str:
 		"""
 		Verbalizes a string
 		:param response: (str) string to be verbalized
 		"""
+		self._check_voice_mode('verbalize')
 		self.speech_verbalizer.verbalize_speech(response)
   
-	def run(self) -> str:
+	def run(self, stop_event=None, on_turn=None) -> str:
 		"""
-		Performs all of bot's functionalities continuously, running indefinitely:
+		Performs all of bot's functionalities continuously, running indefinitely or until stop_event is set:
 		:.listen() # Listens for users speech
 		:.process() # Processes and produces a response to users speech
 		:.verbalize() # Verbalizes the response
+		A thin wrapper around run_async()
+		:param on_turn: (callable) optional callback given each utterance and its response
+		"""
+		asyncio.run(self.run_async(stop_event, on_turn))
+
+	async def listen_async(self, stop_event=None) -> str:
+		"""
+		Listens for users speech input without blocking the event loop
+		:param stop_event: (threading.Event) optional event that stops listening once it is set
+		:return: (str) speech input, or None if listening was stopped
+		"""
+		self._check_voice_mode('listen_async')
+		return await self.speech_recognition.listen_async(stop_event)
+
+	async def process_async(self, speech: str) -> str:
+		"""
+		Processes and produces a response to users speech without blocking the event loop
+		:param speech: (str) speech input
+		:return: (str) response to users speech
+		"""
+		response = await self.speech_processor.process_speech_async(speech)
+
+		# In text mode there is no verbalization step, so the turn's flags are handled here
+		if self.mode == 'text':
+			self.speech_verbalizer.verbalize_speech(response)
+
+		return response
+
+	async def verbalize_async(self, response: str) -> str:
 		"""
-		while True:
-			speech = self.listen()
-			response = self.process(speech)
-			self.verbalize(response)
+		Verbalizes a string without blocking the event loop
+		:param response: (str) string to be verbalized
+		"""
+		self._check_voice_mode('verbalize_async')
+		await self.speech_verbalizer.verbalize_speech_async(response)
 
+	async def run_async(self, stop_event=None, on_turn=None) -> None:
+		"""
+		Performs all of bot's functionalities as a pipeline, so the next utterance can be captured
+		while the current response is being synthesized and played
+		:param stop_event: (threading.Event) optional event that stops the bot once it is set
+		:param on_turn: (callable) optional callback given each utterance and its response
+		"""
+		self._check_voice_mode('run_async')
+		pipeline = AsyncSpeechPipeline(self.speech_recognition, self.speech_processor, self.speech_verbalizer, on_turn=on_turn)
+		await pipeline.run(stop_event)
+
+	def save_settings(self) -> None:
+		"""
+		Persists the session's setting changes (i.e. mute status, language, voice, and role) to disk
+		"""
+		self.session_state.persist()
+
+	def _check_voice_mode(self, method_name:str) -> None:
+		"""
+		Listening and verbalizing are only available in voice mode
+		"""
+		if self.mode != 'voice':
+			raise RuntimeError(f"Juno.{method_name}() is not available in '{self.mode}' mode, only Juno.process() is.")
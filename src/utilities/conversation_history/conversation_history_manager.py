@@ -6,9 +6,10 @@ from src.customization.profiles.profile_manager import ProfileManager
 class ConversationHistoryManager:
 	"""A class that manages the conversation history in the file "conversation_history.yaml"."""
 	
-	def __init__(self):
-		self.profile_name = MasterSettingsManager().retrieve_property('profile')
-		self.entity_name = ProfileManager().retrieve_property('name', self.profile_name)
+	def __init__(self, master_settings:object=None, profile_settings:object=None):
+		"""Sessions pass their own settings, so each writes to the history of the profile it is using"""
+		self.profile_name = (master_settings or MasterSettingsManager()).retrieve_property('profile')
+		self.entity_name = (profile_settings or ProfileManager()).retrieve_property('name', self.profile_name)
 		self.conversation_history_path = f'src/customization/profiles/profile_storage/{self.profile_name}/conversation_history.yaml'
 		self.new_session = True
 		
@@ -40,8 +41,9 @@ class ConversationHistoryManager:
 			data = {}
 		return data
 
-	def save_conversation_history(self, speech: str, response: str):
-		"""Saves the new conversation along with the rest of the conversation history to conversation_history.yaml file"""
+	def save_conversation_history(self, speech: str, response: str, source: str = None):
+		"""Saves the new conversation along with the rest of the conversation history to conversation_history.yaml file.
+		The source ('gpt' or 'command') records what produced the response, so GPT turns can be exported for fine-tuning."""
 		if self.new_session:
 			self.setup_new_session()
 			self.new_session = False
@@ -52,6 +54,8 @@ class ConversationHistoryManager:
 			"User": speech,
 			f"{self.entity_name.title()}": response
 		}
+		if source:
+			conversation_entry["Source"] = source
 		if "Conversation" not in data[current_session_key]:
 			data[current_session_key]["Conversation"] = []
 		data[current_session_key]['Conversation'].append(conversation_entry)
@@ -0,0 +1,134 @@
+import os
+import time
+import random
+import threading
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from src.utilities.logs.metrics_store import record_metric
+
+class HttpTransport:
+	"""
+	A shared HTTP transport for every requests based integration.
+	Connections are kept alive in a pool per host, every request has a timeout, failed requests are retried with
+	jittered exponential backoff, and the number of requests in flight to a single host is limited.
+	"""
+
+	RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+	# sending these twice has the same effect as sending them once, so they are retried unless told otherwise
+	IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+	def __init__(self, connect_timeout:float=3.05, read_timeout:float=20, retries:int=2, backoff_factor:float=0.5,
+	             max_backoff:float=8, max_connections_per_host:int=10, max_concurrency_per_host:int=8):
+		self.timeout = (connect_timeout, read_timeout)
+		self.retries = retries
+		self.backoff_factor = backoff_factor
+		self.max_backoff = max_backoff
+		self.max_concurrency_per_host = max_concurrency_per_host
+
+		# retries are handled here rather than by urllib3 so they can be jittered and limited per host
+		self.session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_connections_per_host, max_retries=0)
+		self.session.mount('https://', adapter)
+		self.session.mount('http://', adapter)
+
+		self._host_semaphores = {}
+		self._lock = threading.Lock()
+
+	def request(self, method:str, url:str, timeout=None, retries:int=None, **kwargs) -> requests.Response:
+		"""
+		Sends a request and returns its response.
+		Connection errors, timeouts and 429/5xx responses of idempotent requests are retried, the last response is
+		returned once retries run out. Other requests (e.g. POST) are only retried when retries is given.
+		"""
+		timeout = self.timeout if timeout is None else timeout
+		if retries is None:
+			retries = self.retries if method.upper() in self.IDEMPOTENT_METHODS else 0
+		start_time = time.perf_counter()
+
+		for attempt in range(retries + 1):
+			try:
+				with self._host_semaphore(url):
+					response = self.session.request(method, url, timeout=timeout, **kwargs)
+			except (requests.ConnectionError, requests.Timeout) as e:
+				if attempt == retries:
+					self._record_request(url, start_time, attempt + 1, error=type(e).__name__)
+					raise
+				time.sleep(self._backoff(attempt))
+				continue
+
+			if response.status_code not in self.RETRY_STATUS_CODES or attempt == retries:
+				self._record_request(url, start_time, attempt + 1, status=response.status_code)
+				return response
+			time.sleep(self._backoff(attempt, response.headers.get('Retry-After')))
+
+	def get(self, url:str, **kwargs) -> requests.Response:
+		return self.request('GET', url, **kwargs)
+
+	def post(self, url:str, **kwargs) -> requests.Response:
+		return self.request('POST', url, **kwargs)
+
+	def put(self, url:str, **kwargs) -> requests.Response:
+		return self.request('PUT', url, **kwargs)
+
+	def delete(self, url:str, **kwargs) -> requests.Response:
+		return self.request('DELETE', url, **kwargs)
+
+	def close(self) -> None:
+		"""
+		Closes every pooled connection
+		"""
+		self.session.close()
+
+	def _host_semaphore(self, url:str) -> threading.BoundedSemaphore:
+		"""
+		Returns the semaphore limiting concurrent requests to the url's host
+		"""
+		host = urlsplit(url).netloc
+		with self._lock:
+			if host not in self._host_semaphores:
+				self._host_semaphores[host] = threading.BoundedSemaphore(self.max_concurrency_per_host)
+			return self._host_semaphores[host]
+
+	def _record_request(self, url:str, start_time:float, attempts:int, status:int=None, error:str=None) -> None:
+		"""
+		Records the outcome of a request, retries included, in the metrics store
+		"""
+		if error is None and status >= 400:
+			error = f'HTTP {status}'
+		record_metric('upstream', service=urlsplit(url).netloc, status=status, error=error, attempts=attempts,
+		              duration_ms=round((time.perf_counter() - start_time) * 1000, 1))
+
+	def _backoff(self, attempt:int, retry_after:str=None) -> float:
+		"""
+		Seconds to wait before the next attempt, the server's Retry-After is honoured when it gives one in seconds
+		"""
+		if retry_after and retry_after.isdigit():
+			return min(float(retry_after), self.max_backoff)
+		# "full jitter": a random wait between 0 and the exponential backoff
+		return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+_transport = None
+_transport_lock = threading.Lock()
+
+def get_transport() -> HttpTransport:
+	"""
+	Returns the process wide transport, configured from the 'http' section of "master_settings.json"
+	"""
+	global _transport
+	with _transport_lock:
+		if _transport is None:
+			from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+			_transport = HttpTransport(**(MasterSettingsManager().retrieve_property('http') or {}))
+		return _transport
+
+def _reset_transport() -> None:
+	"""
+	Forked processes must not share the parent's open connections
+	"""
+	global _transport, _transport_lock
+	_transport = None
+	_transport_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+	os.register_at_fork(after_in_child=_reset_transport)
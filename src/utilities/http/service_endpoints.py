@@ -0,0 +1,34 @@
+"""
+Resolves the base url of each external service.
+The JUNO_ENDPOINT_<SERVICE> environment variable takes precedence over 'service_endpoints' in "configuration/config.yaml",
+and the service's public url is used when neither is set.
+"""
+
+import os
+from src.initialization.shared_resources import load_yaml
+
+current_directory = os.path.dirname(os.path.abspath(__file__))
+config_path = os.path.join(current_directory, '..', '..', '..', 'configuration', 'config.yaml')
+
+DEFAULT_ENDPOINTS = {
+	'openai': None,
+	'clu': None,
+	'translator': 'https://api.cognitive.microsofttranslator.com',
+	'weather': 'https://api.openweathermap.org/data/2.5',
+	'news': 'https://newsapi.org/v1',
+}
+
+def retrieve_service_endpoint(service:str, default:str=None) -> str:
+	"""
+	Returns the base url to use for a service, without a trailing slash.
+	Returns the given default (or the service's public url) if the endpoint is not overridden.
+	"""
+	endpoint = os.environ.get(f'JUNO_ENDPOINT_{service.upper()}')
+	if not endpoint:
+		try:
+			endpoint = (load_yaml(config_path).get('service_endpoints') or {}).get(service)
+		except FileNotFoundError:
+			endpoint = None
+	if not endpoint:
+		endpoint = default or DEFAULT_ENDPOINTS.get(service)
+	return endpoint.rstrip('/') if endpoint else None
@@ -0,0 +1,42 @@
+import unittest
+from unittest.mock import Mock, patch
+import requests
+from src.utilities.http.http_transport import HttpTransport
+
+class TestHttpTransport(unittest.TestCase):
+    """Class for testing the HttpTransport"""
+
+    def setUp(self):
+        self.transport = HttpTransport(retries=2, backoff_factor=0)
+
+    def test_retries_server_errors(self):
+        responses = [Mock(status_code=503, headers={}), Mock(status_code=200, headers={})]
+        with patch.object(self.transport.session, 'request', side_effect=responses) as request:
+            response = self.transport.get('https://example.com/weather')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(request.call_args.kwargs['timeout'], self.transport.timeout)
+
+    def test_returns_last_response_once_retries_run_out(self):
+        with patch.object(self.transport.session, 'request', return_value=Mock(status_code=500, headers={})) as request:
+            response = self.transport.get('https://example.com/weather')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(request.call_count, 3)
+
+    def test_post_is_only_retried_when_asked(self):
+        with patch.object(self.transport.session, 'request', return_value=Mock(status_code=503, headers={})) as request:
+            self.transport.post('https://example.com/translate')
+        self.assertEqual(request.call_count, 1)
+
+        with patch.object(self.transport.session, 'request', return_value=Mock(status_code=503, headers={})) as request:
+            self.transport.post('https://example.com/translate', retries=1)
+        self.assertEqual(request.call_count, 2)
+
+    def test_raises_connection_errors_without_retries(self):
+        with patch.object(self.transport.session, 'request', side_effect=requests.ConnectionError) as request:
+            with self.assertRaises(requests.ConnectionError):
+                self.transport.post('https://example.com/voices/add', retries=0)
+        self.assertEqual(request.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
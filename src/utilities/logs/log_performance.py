@@ -1,5 +1,6 @@
 import yaml
 import time 
+from src.utilities.logs.metrics_store import record_metric
 from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
 from src.customization.profiles.profile_manager import ProfileManager
 
@@ -9,10 +10,30 @@ class PerformanceLogger:
 	"""
  
 	def __init__(self):
-		self.profile_name = MasterSettingsManager().retrieve_property('profile')
-		self.entity_name = ProfileManager().retrieve_property('name', self.profile_name)
-		self.log_path = f'src/customization/profiles/profile_storage/{self.profile_name}/logs.yaml'
+		# Loggers are created when their module is imported, so settings are only read once something is logged
+		self._log_path = None
 		self.new_session = True
+
+	@property
+	def log_path(self) -> str:
+		"""
+		Path to the current profile's log file, resolved on first use
+		"""
+		if self._log_path is None:
+			self.profile_name = MasterSettingsManager().retrieve_property('profile')
+			self.entity_name = ProfileManager().retrieve_property('name', self.profile_name)
+			self._log_path = f'src/customization/profiles/profile_storage/{self.profile_name}/logs.yaml'
+		return self._log_path
+
+	def _retrieve_log_path(self, instance) -> str:
+		"""
+		Path to the log file of the profile used by the logged object's session,
+		objects without session settings log to the profile in "master_settings.json"
+		"""
+		master_settings = getattr(instance, 'master_settings', None)
+		if master_settings is None:
+			return self.log_path
+		return f"src/customization/profiles/profile_storage/{master_settings.retrieve_property('profile')}/logs.yaml"
   
 	def log_operation(self, func):
 		"""
@@ -29,8 +50,9 @@ class PerformanceLogger:
 			# Determine input_data based on the action (function name)
 			action = self._make_method_name_readable(action, args, kwargs)
 
-			# Log the operation
-			result = self._log_operation(action, func, *args, **kwargs)
+			# Log the operation to the log file of the session's profile
+			log_path = self._retrieve_log_path(args[0] if args else None)
+			result = self._log_operation(action, func, log_path, *args, **kwargs)
 			return result
 		return wrapper
    
@@ -44,13 +66,12 @@ class PerformanceLogger:
 		elif action in ['process_speech', 'verbalize_speech']:
 			action = args[1]
 		elif action == '_retrieve_top_intent':
-			action = args
-			if action is None:
-				action = "ask_gpt"
+			action = "Intent selection"
 		else:
 			action = f"{args} {kwargs}"
+		return action
    
-	def _log_operation(self, action: str, func, *args, **kwargs):
+	def _log_operation(self, action: str, func, log_path: str, *args, **kwargs):
 		"""
 		Logs the operation
 		"""
@@ -65,6 +86,7 @@ class PerformanceLogger:
 
 		# Save runtime
 		log_data[action]["Run time"] = end_time - start_time
+		record_metric('operation', name=action, success=bool(result), duration_ms=round((end_time - start_time) * 1000, 1))
 
 		# Save input_data
 		if result: 
@@ -75,7 +97,7 @@ class PerformanceLogger:
 			log_data[action]["Output"] = 'error'
 			log_data[action]["Error"] = result
 
-		self._save_data(log_data)
+		self._save_data(log_data, log_path)
   
 		return result
    
@@ -90,24 +112,24 @@ class PerformanceLogger:
 			}
 		}
   
-	def _save_data(self, log_data):
+	def _save_data(self, log_data, log_path):
 		"""
 		Saves the log operation
 		"""
-		existing_data = self._Load_in_data()
+		existing_data = self._Load_in_data(log_path)
 		log_data.update(existing_data)
 		try:
-			with open(self.log_path, "w", encoding="utf-8") as f:
+			with open(log_path, "w", encoding="utf-8") as f:
 				yaml.safe_dump(log_data, f)
 		except FileNotFoundError:
 			print('The file "logs.yaml" is missing. Make sure all files are located within the same folder.')
 		 
-	def _Load_in_data(self):
+	def _Load_in_data(self, log_path):
 		"""
 		Loads the log data
 		"""
 		try:
-			with open(self.log_path, 'r', encoding='utf-8') as f:
+			with open(log_path, 'r', encoding='utf-8') as f:
 				data = yaml.safe_load(f) or {}
 		except FileNotFoundError:
 			print('The file "logs.yaml" is missing.\nMake sure all files are located within the same folder.')
@@ -0,0 +1,157 @@
+"""
+An append-only store of performance metrics, one JSON object per line.
+
+Turns, logged operations, cache lookups and upstream requests are recorded by every process (voice bot, api workers)
+into the same file. Recording only queues the record: a background thread appends queued records in batches, so callers
+on an event loop never wait on disk. Every batch is appended with a single write, so concurrent writers do not
+interleave, and readers can follow the file incrementally from the position they last read up to. Once the file exceeds
+its size limit it is rotated to "<file>.1", replacing the previous rotation.
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+
+current_directory = os.path.dirname(os.path.abspath(__file__))
+default_metrics_path = os.path.join(current_directory, 'metrics.jsonl')
+
+class MetricsStore:
+	"""
+	Appends metric records to a JSONL file from a background thread
+	"""
+
+	def __init__(self, path:str=default_metrics_path, enabled:bool=True, max_file_mb:float=50):
+		self.path = path
+		self.enabled = enabled
+		self.max_bytes = int(max_file_mb * 1024 * 1024)
+		self._pending = queue.Queue()
+		self._writer = None
+		self._lock = threading.Lock()
+		# records still queued when the process exits are written out first
+		atexit.register(self.flush)
+
+	def record(self, kind:str, **fields) -> None:
+		"""
+		Queues a metric of the given kind ('turn', 'operation', 'cache' or 'upstream') with its fields
+		"""
+		if not self.enabled:
+			return
+		self._pending.put(json.dumps({"ts": round(time.time(), 3), "kind": kind, "pid": os.getpid(), **fields}, default=str) + '\n')
+		if self._writer is None:
+			self._start_writer()
+
+	def flush(self) -> None:
+		"""
+		Waits until every queued record has been written
+		"""
+		# a forked child inherits the queue but not the writer thread, it has nothing of its own to write
+		if self._writer is not None and self._writer.is_alive():
+			self._pending.join()
+
+	def _start_writer(self) -> None:
+		with self._lock:
+			if self._writer is None:
+				self._writer = threading.Thread(target=self._write_records, daemon=True, name='metrics-writer')
+				self._writer.start()
+
+	def _write_records(self) -> None:
+		"""
+		Runs on the writer thread: appends whatever has been queued since the last write
+		"""
+		while True:
+			lines = [self._pending.get()]
+			while True:
+				try:
+					lines.append(self._pending.get_nowait())
+				except queue.Empty:
+					break
+			try:
+				self._rotate_if_full()
+				# opened per batch in append mode, so writes from several processes land whole at the end of the file
+				with open(self.path, 'a', encoding='utf-8') as f:
+					f.write(''.join(lines))
+			except OSError as e:
+				print(f"Metrics could not be recorded: {e}")
+			finally:
+				for _ in lines:
+					self._pending.task_done()
+
+	def _rotate_if_full(self) -> None:
+		try:
+			if os.path.getsize(self.path) >= self.max_bytes:
+				os.replace(self.path, f'{self.path}.1')
+		except FileNotFoundError:
+			pass
+
+def read_metrics(path:str=default_metrics_path, position:tuple=None, max_bytes:int=None) -> tuple:
+	"""
+	Reads the records appended since the given position.
+	Only complete lines are read, so a record still being written is picked up by the next read.
+	:param position: (tuple) the position returned by the previous read, None to read from the start
+	:param max_bytes: (int) if given, at most this many of the latest bytes are read, older records are skipped
+	:return: (tuple) the new records and the position to continue from, which restarts at the start of the file once it has been rotated
+	"""
+	try:
+		stat = os.stat(path)
+	except FileNotFoundError:
+		return [], None
+	# the file is identified by its inode, a rotated file is a new file even if it has since grown past the old offset
+	file_id = (stat.st_dev, stat.st_ino)
+	offset = position[1] if position and position[0] == file_id and position[1] <= stat.st_size else 0
+
+	records = []
+	with open(path, 'rb') as f:
+		if max_bytes is not None and stat.st_size - offset > max_bytes:
+			# start at the first whole line within the latest max_bytes
+			f.seek(stat.st_size - max_bytes - 1)
+			f.readline()
+			offset = f.tell()
+		f.seek(offset)
+		for line in f:
+			if not line.endswith(b'\n'):
+				break
+			offset += len(line)
+			try:
+				records.append(json.loads(line))
+			except ValueError:
+				continue
+	return records, (file_id, offset)
+
+_store = None
+
+def get_metrics_store() -> MetricsStore:
+	"""
+	Returns the process wide store, configured by the 'metrics' section of "master_settings.json"
+	"""
+	global _store
+	if _store is None:
+		from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+		settings = MasterSettingsManager().retrieve_property('metrics') or {}
+		_store = MetricsStore(settings.get('path') or default_metrics_path, settings.get('enabled', True), settings.get('max_file_mb', 50))
+	return _store
+
+def use_metrics_store(store:MetricsStore) -> None:
+	"""
+	Replaces the process wide store, e.g. so tests record their metrics to a temporary file
+	"""
+	global _store
+	_store = store
+
+def record_metric(kind:str, **fields) -> None:
+	"""
+	Records a metric in the process wide store
+	"""
+	get_metrics_store().record(kind, **fields)
+
+def _reset_store() -> None:
+	"""
+	Forked processes must not share the parent's lock or queue, and do not inherit its writer thread
+	"""
+	global _store
+	_store = None
+
+if hasattr(os, 'register_at_fork'):
+	os.register_at_fork(after_in_child=_reset_store)
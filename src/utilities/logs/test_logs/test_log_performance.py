@@ -0,0 +1,16 @@
+import unittest
+from unittest.mock import Mock
+from src.utilities.logs.log_performance import PerformanceLogger
+
+class TestPerformanceLogger(unittest.TestCase):
+    """Class for testing the PerformanceLogger"""
+
+    def test_logs_to_the_profile_of_the_session(self):
+        logger = PerformanceLogger()
+        first_session = Mock(master_settings=Mock(retrieve_property=Mock(return_value='first')))
+        second_session = Mock(master_settings=Mock(retrieve_property=Mock(return_value='second')))
+        self.assertEqual(logger._retrieve_log_path(first_session), 'src/customization/profiles/profile_storage/first/logs.yaml')
+        self.assertEqual(logger._retrieve_log_path(second_session), 'src/customization/profiles/profile_storage/second/logs.yaml')
+
+if __name__ == '__main__':
+    unittest.main()
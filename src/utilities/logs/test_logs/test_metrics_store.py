@@ -0,0 +1,76 @@
+import os
+import json
+import tempfile
+import unittest
+from src.utilities.logs.metrics_store import MetricsStore, read_metrics
+
+class TestMetricsStore(unittest.TestCase):
+    """Class for testing the MetricsStore"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'metrics.jsonl')
+        self.store = MetricsStore(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, store, kind, **fields):
+        store.record(kind, **fields)
+        store.flush()
+
+    def test_reads_only_new_records(self):
+        self.record(self.store, 'turn', total_ms=120)
+        records, position = read_metrics(self.path)
+        self.assertEqual([record['total_ms'] for record in records], [120])
+
+        self.record(self.store, 'cache', name='gpt', hit=True)
+        records, position = read_metrics(self.path, position)
+        self.assertEqual([record['kind'] for record in records], ['cache'])
+        self.assertEqual(read_metrics(self.path, position), ([], position))
+
+    def test_records_are_written_in_the_background(self):
+        for i in range(100):
+            self.store.record('turn', total_ms=i)
+        self.store.flush()
+        records, _ = read_metrics(self.path)
+        self.assertEqual([record['total_ms'] for record in records], list(range(100)))
+
+    def test_skips_incomplete_lines(self):
+        self.record(self.store, 'turn', total_ms=120)
+        with open(self.path, 'a') as f:
+            f.write('{"ts": 1, "kind": "tu')
+        records, position = read_metrics(self.path)
+        self.assertEqual(len(records), 1)
+
+        with open(self.path, 'a') as f:
+            f.write('rn"}\n')
+        records, _ = read_metrics(self.path, position)
+        self.assertEqual(records, [{"ts": 1, "kind": "turn"}])
+
+    def test_restarts_after_rotation(self):
+        store = MetricsStore(self.path, max_file_mb=0)
+        self.record(store, 'turn', total_ms=120)
+        _, position = read_metrics(self.path)
+        # the file is rotated, and the new file grows past the old offset before it is read again
+        self.record(store, 'turn', total_ms=80)
+        for total_ms in [81, 82]:
+            self.record(self.store, 'turn', total_ms=total_ms)
+        self.assertTrue(os.path.exists(f'{self.path}.1'))
+        records, _ = read_metrics(self.path, position)
+        self.assertEqual([record['total_ms'] for record in records], [80, 81, 82])
+
+    def test_reads_latest_records_of_long_files(self):
+        lines = [json.dumps({"ts": 1, "kind": "turn", "total_ms": i + 100}) + '\n' for i in range(100)]
+        with open(self.path, 'w') as f:
+            f.writelines(lines)
+        records, position = read_metrics(self.path, max_bytes=len(lines[0]) * 10 + 5)
+        self.assertEqual([record['total_ms'] for record in records], list(range(190, 200)))
+        self.assertEqual(position[1], os.path.getsize(self.path))
+
+    def test_records_nothing_when_disabled(self):
+        self.record(MetricsStore(self.path, enabled=False), 'turn', total_ms=120)
+        self.assertEqual(read_metrics(self.path), ([], None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+A process wide OpenAI client factory shared by chat, text-to-speech and fine-tuning.
+Clients are cached per api key (and per event loop for async clients), so every caller reuses the same tuned
+keep-alive connection pool instead of opening its own. Token and character usage of every call is accounted for.
+"""
+
+import os
+import asyncio
+import threading
+import importlib.util
+from src.utilities.http.service_endpoints import retrieve_service_endpoint
+
+_lock = threading.Lock()
+_clients = {}
+_async_clients = {}
+_settings = None
+
+def get_openai_client(api_key:str):
+	"""
+	Returns the shared OpenAI client for the given api key
+	"""
+	with _lock:
+		if api_key not in _clients:
+			from openai import OpenAI
+			import httpx
+
+			settings = _load_settings()
+			http_client = httpx.Client(http2=_http2_enabled(settings), limits=_limits(settings), timeout=_timeout(settings))
+			_clients[api_key] = OpenAI(api_key=api_key, base_url=retrieve_service_endpoint('openai'), http_client=http_client, max_retries=settings.get('max_retries', 2))
+		return _clients[api_key]
+
+def get_async_openai_client(api_key:str):
+	"""
+	Returns the shared async OpenAI client for the given api key, async clients are bound to the running event loop
+	"""
+	loop = asyncio.get_running_loop()
+	with _lock:
+		key = (api_key, loop)
+		if key not in _async_clients:
+			from openai import AsyncOpenAI
+			import httpx
+
+			# drop the clients of event loops that have since been closed
+			for closed_key in [client_key for client_key in _async_clients if client_key[1].is_closed()]:
+				del _async_clients[closed_key]
+
+			settings = _load_settings()
+			http_client = httpx.AsyncClient(http2=_http2_enabled(settings), limits=_limits(settings), timeout=_timeout(settings))
+			_async_clients[key] = AsyncOpenAI(api_key=api_key, base_url=retrieve_service_endpoint('openai'), http_client=http_client, max_retries=settings.get('max_retries', 2))
+		return _async_clients[key]
+
+def with_deadline(client, deadline_name:str):
+	"""
+	Returns the client with the per-call deadline named in the 'openai' settings (e.g. 'chat_deadline'),
+	the returned client shares the original's connection pool
+	"""
+	deadline = _load_settings().get(deadline_name)
+	if deadline:
+		return client.with_options(timeout=deadline)
+	return client
+
+class UsageTracker:
+	"""
+	Accumulates the tokens, characters and requests used per model
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self.models = {}
+
+	def record(self, model:str, prompt_tokens:int=0, completion_tokens:int=0, characters:int=0) -> None:
+		"""
+		Adds a call's usage to its model's totals
+		"""
+		with self._lock:
+			totals = self.models.setdefault(model, {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "characters": 0})
+			totals["requests"] += 1
+			totals["prompt_tokens"] += prompt_tokens
+			totals["completion_tokens"] += completion_tokens
+			totals["characters"] += characters
+
+	def record_completion(self, response) -> None:
+		"""
+		Records the usage reported by a chat completion response
+		"""
+		usage = getattr(response, 'usage', None)
+		self.record(response.model, getattr(usage, 'prompt_tokens', 0) or 0, getattr(usage, 'completion_tokens', 0) or 0)
+
+	def summary(self) -> dict:
+		"""
+		Returns a copy of the totals per model
+		"""
+		with self._lock:
+			return {model: dict(totals) for model, totals in self.models.items()}
+
+	def reset(self) -> None:
+		with self._lock:
+			self.models = {}
+
+usage = UsageTracker()
+
+def _load_settings() -> dict:
+	"""
+	Loads the 'openai' section of "master_settings.json" once per process
+	"""
+	global _settings
+	if _settings is None:
+		from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+		_settings = MasterSettingsManager().retrieve_property('openai') or {}
+	return _settings
+
+def _http2_enabled(settings:dict) -> bool:
+	"""
+	HTTP/2 needs the optional 'h2' package, connections fall back to HTTP/1.1 keep-alive without it
+	"""
+	return settings.get('http2', True) and importlib.util.find_spec('h2') is not None
+
+def _limits(settings:dict):
+	import httpx
+	return httpx.Limits(
+		max_connections=settings.get('max_connections', 20),
+		max_keepalive_connections=settings.get('max_keepalive_connections', 10),
+		keepalive_expiry=settings.get('keepalive_expiry', 120)
+	)
+
+def _timeout(settings:dict):
+	import httpx
+	return httpx.Timeout(settings.get('timeout', 30), connect=settings.get('connect_timeout', 5))
+
+def _reset_clients() -> None:
+	"""
+	Forked processes must not share the parent's open connections
+	"""
+	global _lock, _clients, _async_clients
+	_lock = threading.Lock()
+	_clients = {}
+	_async_clients = {}
+
+if hasattr(os, 'register_at_fork'):
+	os.register_at_fork(after_in_child=_reset_clients)
@@ -0,0 +1,19 @@
+import unittest
+from unittest.mock import Mock
+from src.utilities.openai_client.openai_client import UsageTracker
+
+class TestUsageTracker(unittest.TestCase):
+    """Class for testing the UsageTracker"""
+
+    def test_records_usage_per_model(self):
+        tracker = UsageTracker()
+        tracker.record_completion(Mock(model='gpt-4', usage=Mock(prompt_tokens=10, completion_tokens=5)))
+        tracker.record_completion(Mock(model='gpt-4', usage=Mock(prompt_tokens=2, completion_tokens=1)))
+        tracker.record('tts-1', characters=42)
+
+        summary = tracker.summary()
+        self.assertEqual(summary['gpt-4'], {"requests": 2, "prompt_tokens": 12, "completion_tokens": 6, "characters": 0})
+        self.assertEqual(summary['tts-1']['characters'], 42)
+
+if __name__ == '__main__':
+    unittest.main()
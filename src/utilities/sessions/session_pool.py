@@ -0,0 +1,164 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+class SessionLimitError(Exception):
+	"""
+	Raised when a new session is requested while the pool is at its maximum number of sessions
+	"""
+
+class Session:
+	"""
+	A text session with its own Juno instance, and therefore its own conversation context.
+	Turns within a session are processed one at a time, separate sessions are processed concurrently.
+	"""
+
+	def __init__(self, session_id:str, bot:object):
+		self.session_id = session_id
+		self.bot = bot
+		self.lock = threading.Lock()
+		self.created = time.time()
+		self.last_used = time.monotonic()
+
+	def process(self, text:str) -> str:
+		"""
+		Processes a turn of text input and returns the response
+		"""
+		with self.lock:
+			self.last_used = time.monotonic()
+			try:
+				return self.bot.process(text)
+			finally:
+				self.last_used = time.monotonic()
+
+	def idle_time(self) -> float:
+		"""
+		Seconds since the session was last used, a session that is processing a turn is never idle
+		"""
+		if self.lock.locked():
+			return 0.0
+		return time.monotonic() - self.last_used
+
+class SessionPool:
+	"""
+	Hands out isolated text sessions backed by a pool of prewarmed Juno instances.
+	New sessions take an already initialized instance when one is available and the pool is refilled in the background.
+	Sessions idle for longer than idle_timeout seconds are evicted.
+	Session ids start with session_id_prefix, which lets a preforked server tell which worker owns a session.
+	"""
+
+	def __init__(self, bot_factory, warm_size:int=4, max_sessions:int=500, idle_timeout:float=900, session_id_prefix:str=''):
+		self.bot_factory = bot_factory
+		self.session_id_prefix = session_id_prefix
+		self.warm_size = warm_size
+		self.max_sessions = max_sessions
+		self.idle_timeout = idle_timeout
+
+		self.sessions = {}
+		self.warm_bots = []
+		self.pending_warm_bots = 0
+		self._lock = threading.Lock()
+		self._warming_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='session-warmer')
+		self._shutdown = threading.Event()
+
+		self._replenish_warm_bots()
+		self._reaper = threading.Thread(target=self._evict_idle_sessions_periodically, daemon=True)
+		self._reaper.start()
+
+	def create_session(self) -> Session:
+		"""
+		Creates a new session, using a prewarmed Juno instance if one is available
+		"""
+		self.evict_idle_sessions()
+
+		with self._lock:
+			if len(self.sessions) >= self.max_sessions:
+				raise SessionLimitError(f'The maximum of {self.max_sessions} concurrent sessions has been reached.')
+			bot = self.warm_bots.pop() if self.warm_bots else None
+
+		# Fall back to initializing an instance on demand if the pool has run dry
+		if bot is None:
+			bot = self.bot_factory()
+		self._replenish_warm_bots()
+
+		session = Session(f'{self.session_id_prefix}{uuid.uuid4().hex}', bot)
+		with self._lock:
+			self.sessions[session.session_id] = session
+		return session
+
+	def retrieve_session(self, session_id:str) -> Session:
+		"""
+		Returns the session with the given id, or None if it does not exist or has been evicted
+		"""
+		with self._lock:
+			return self.sessions.get(session_id)
+
+	def close_session(self, session_id:str) -> bool:
+		"""
+		Removes a session from the pool
+		"""
+		with self._lock:
+			return self.sessions.pop(session_id, None) is not None
+
+	def evict_idle_sessions(self) -> int:
+		"""
+		Removes every session that has been idle for longer than idle_timeout and returns how many were removed
+		"""
+		with self._lock:
+			idle_session_ids = [session_id for session_id, session in self.sessions.items() if session.idle_time() > self.idle_timeout]
+			for session_id in idle_session_ids:
+				del self.sessions[session_id]
+		return len(idle_session_ids)
+
+	def status(self) -> dict:
+		"""
+		Returns the number of active sessions and prewarmed instances
+		"""
+		with self._lock:
+			return {
+				"active_sessions": len(self.sessions),
+				"warm_instances": len(self.warm_bots),
+				"warming_instances": self.pending_warm_bots,
+				"max_sessions": self.max_sessions
+			}
+
+	def shutdown(self) -> None:
+		"""
+		Stops the background warming and eviction
+		"""
+		self._shutdown.set()
+		self._warming_executor.shutdown(wait=False, cancel_futures=True)
+
+	def _replenish_warm_bots(self) -> None:
+		"""
+		Schedules enough background initializations to bring the pool back up to warm_size
+		"""
+		with self._lock:
+			missing = self.warm_size - len(self.warm_bots) - self.pending_warm_bots
+			self.pending_warm_bots += max(missing, 0)
+
+		for _ in range(missing):
+			self._warming_executor.submit(self._warm_bot)
+
+	def _warm_bot(self) -> None:
+		"""
+		Initializes a Juno instance and adds it to the pool
+		"""
+		try:
+			bot = self.bot_factory()
+		except Exception as e:
+			print(f"Error occurred while prewarming a session: {e}")
+			bot = None
+
+		with self._lock:
+			self.pending_warm_bots -= 1
+			if bot is not None:
+				self.warm_bots.append(bot)
+
+	def _evict_idle_sessions_periodically(self) -> None:
+		"""
+		Evicts idle sessions in the background
+		"""
+		while not self._shutdown.wait(max(self.idle_timeout / 4, 1)):
+			self.evict_idle_sessions()
@@ -0,0 +1,46 @@
+import time
+import unittest
+from unittest.mock import Mock
+from src.utilities.sessions.session_pool import SessionPool, SessionLimitError
+
+class TestSessionPool(unittest.TestCase):
+    """Class for testing the SessionPool"""
+
+    def setUp(self):
+        self.bot_factory = Mock(side_effect=lambda: Mock(process=Mock(side_effect=lambda text: text.upper())))
+        self.session_pool = SessionPool(self.bot_factory, warm_size=1, max_sessions=2, idle_timeout=60)
+
+    def tearDown(self):
+        self.session_pool.shutdown()
+
+    def test_sessions_are_isolated(self):
+        first_session = self.session_pool.create_session()
+        second_session = self.session_pool.create_session()
+        self.assertNotEqual(first_session.session_id, second_session.session_id)
+        self.assertIsNot(first_session.bot, second_session.bot)
+        self.assertEqual(first_session.process('hello'), 'HELLO')
+
+    def test_max_sessions(self):
+        self.session_pool.create_session()
+        self.session_pool.create_session()
+        with self.assertRaises(SessionLimitError):
+            self.session_pool.create_session()
+
+    def test_idle_sessions_are_evicted(self):
+        session = self.session_pool.create_session()
+        session.last_used = time.monotonic() - 120
+        self.assertEqual(self.session_pool.evict_idle_sessions(), 1)
+        self.assertIsNone(self.session_pool.retrieve_session(session.session_id))
+
+    def test_close_session(self):
+        session = self.session_pool.create_session()
+        self.assertTrue(self.session_pool.close_session(session.session_id))
+        self.assertFalse(self.session_pool.close_session(session.session_id))
+
+    def test_session_id_prefix(self):
+        session_pool = SessionPool(self.bot_factory, warm_size=0, session_id_prefix='w1-')
+        self.addCleanup(session_pool.shutdown)
+        self.assertTrue(session_pool.create_session().session_id.startswith('w1-'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from unittest.mock import Mock
+from src.utilities.sessions.worker_pool import JunoWorkerPool, WorkerPoolFullError
+
+class TestJunoWorkerPool(unittest.TestCase):
+    """Class for testing the JunoWorkerPool"""
+
+    def setUp(self):
+        self.bot_factory = Mock(side_effect=lambda: Mock(run=Mock(side_effect=lambda stop_event: stop_event.wait(5))))
+        self.worker_pool = JunoWorkerPool(self.bot_factory, max_workers=1)
+
+    def tearDown(self):
+        self.worker_pool.stop_all_workers()
+
+    def test_pool_applies_backpressure(self):
+        self.worker_pool.start_worker()
+        with self.assertRaises(WorkerPoolFullError):
+            self.worker_pool.start_worker()
+
+    def test_stopped_bot_is_reused(self):
+        worker = self.worker_pool.start_worker()
+        self.assertTrue(self.worker_pool.stop_worker(worker.worker_id))
+        worker.thread.join(5)
+
+        status = self.worker_pool.status()
+        self.assertEqual(status['available_slots'], 1)
+        self.assertEqual(status['idle_bots'], 1)
+
+        self.worker_pool.start_worker().thread.join(0.1)
+        self.assertEqual(self.bot_factory.call_count, 1)
+
+    def test_failed_bot_is_discarded(self):
+        self.bot_factory.side_effect = lambda: Mock(run=Mock(side_effect=RuntimeError('microphone unavailable')))
+        worker = self.worker_pool.start_worker()
+        worker.thread.join(5)
+        self.assertEqual(worker.state, 'failed')
+        self.assertEqual(self.worker_pool.status()['idle_bots'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import threading
+import time
+import uuid
+
+class WorkerPoolFullError(Exception):
+	"""
+	Raised when a worker is requested while the pool is already running its maximum number of workers
+	"""
+
+class JunoWorker:
+	"""
+	Runs a voice Juno instance on its own thread until it is stopped or exits.
+	"""
+
+	def __init__(self, bot_factory, bot:object=None, on_finished=None):
+		self.worker_id = uuid.uuid4().hex
+		self.bot_factory = bot_factory
+		self.bot = bot
+		self.on_finished = on_finished
+		self.stop_event = threading.Event()
+		self.state = 'initializing' if bot is None else 'running'
+		self.started = time.time()
+		self.error = None
+		self.thread = threading.Thread(target=self._run, daemon=True, name=f'juno-worker-{self.worker_id[:8]}')
+
+	def start(self) -> None:
+		"""
+		Starts the worker's thread
+		"""
+		self.thread.start()
+
+	def stop(self) -> None:
+		"""
+		Asks the worker to stop, it stops between listening attempts or once its current turn is complete
+		"""
+		if self.state in ['initializing', 'running']:
+			self.state = 'stopping'
+		self.stop_event.set()
+
+	def status(self) -> dict:
+		"""
+		Returns the worker's current state
+		"""
+		return {
+			"worker_id": self.worker_id,
+			"state": self.state,
+			"uptime": round(time.time() - self.started, 1),
+			"error": self.error
+		}
+
+	def _run(self) -> None:
+		"""
+		Initializes the bot if needed and runs it until it is stopped or exits
+		"""
+		try:
+			if self.bot is None:
+				self.bot = self.bot_factory()
+				if self.state == 'initializing':
+					self.state = 'running'
+			self.bot.run(stop_event=self.stop_event)
+		except SystemExit:
+			# The bot exits on a quit command or after a period of inactivity
+			pass
+		except Exception as e:
+			print(f"Error occurred while running Juno: {e}")
+			self.error = str(e)
+		finally:
+			self.state = 'failed' if self.error else 'stopped'
+			if self.on_finished:
+				self.on_finished(self)
+
+class JunoWorkerPool:
+	"""
+	Supervises a bounded number of voice Juno workers.
+	Stopped workers hand their initialized bot back to the pool so the next start does not pay the initialization cost again.
+	"""
+
+	def __init__(self, bot_factory, max_workers:int=1):
+		self.bot_factory = bot_factory
+		self.max_workers = max_workers
+		self.workers = {}
+		self.idle_bots = []
+		self._lock = threading.Lock()
+
+	def start_worker(self) -> JunoWorker:
+		"""
+		Starts a new worker, reusing an initialized bot if one is available
+		"""
+		with self._lock:
+			if len(self.workers) >= self.max_workers:
+				raise WorkerPoolFullError(f'All {self.max_workers} Juno workers are busy.')
+			bot = self.idle_bots.pop() if self.idle_bots else None
+			worker = JunoWorker(self.bot_factory, bot, on_finished=self._on_worker_finished)
+			self.workers[worker.worker_id] = worker
+
+		worker.start()
+		return worker
+
+	def stop_worker(self, worker_id:str) -> bool:
+		"""
+		Stops the worker with the given id
+		"""
+		with self._lock:
+			worker = self.workers.get(worker_id)
+		if worker is None:
+			return False
+		worker.stop()
+		return True
+
+	def stop_all_workers(self) -> int:
+		"""
+		Stops every running worker and returns how many were asked to stop
+		"""
+		with self._lock:
+			workers = list(self.workers.values())
+		for worker in workers:
+			worker.stop()
+		return len(workers)
+
+	def status(self) -> dict:
+		"""
+		Returns the state of every worker along with the pool's capacity
+		"""
+		with self._lock:
+			return {
+				"max_workers": self.max_workers,
+				"available_slots": self.max_workers - len(self.workers),
+				"idle_bots": len(self.idle_bots),
+				"workers": [worker.status() for worker in self.workers.values()]
+			}
+
+	def _on_worker_finished(self, worker:JunoWorker) -> None:
+		"""
+		Frees the worker's slot and keeps its bot for reuse unless the worker failed
+		"""
+		with self._lock:
+			self.workers.pop(worker.worker_id, None)
+			if worker.bot is not None and worker.state != 'failed':
+				self.idle_bots.append(worker.bot)
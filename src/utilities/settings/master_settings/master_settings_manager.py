@@ -39,7 +39,10 @@ class MasterSettingsManager:
         else:
             self.data['settings'][setting] = value
             
-        # write data back
+        self.save_settings()
+
+    def save_settings(self) -> None:
+        """Writes self.data back to "master_settings.json"."""
         with open(master_settings_path, "w") as f:
             json.dump(self.data, f, indent=4)
 
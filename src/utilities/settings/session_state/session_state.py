@@ -0,0 +1,180 @@
+import atexit
+import copy
+import threading
+from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+from src.customization.profiles.profile_manager import ProfileManager
+
+class SessionState:
+	"""
+	Holds a session's mutable settings in memory, layered over the defaults loaded once from
+	"master_settings.json" and the profile's "settings.yaml".
+	Reads and writes never touch disk, so several sessions can share a process without clobbering each other.
+	Persisting changes is an explicit operation, optionally debounced after every change.
+	"""
+
+	def __init__(self, profile_name:str=None, persist_delay:float=None):
+		"""
+		:param profile_name: (str) profile the session uses, defaults to the profile in "master_settings.json"
+		:param persist_delay: (float) seconds after the last change before changes are persisted, None to only persist explicitly
+		"""
+		self.profile_manager = ProfileManager()
+		self.master_defaults = copy.deepcopy(MasterSettingsManager().data['settings'])
+		self.profile_name = profile_name or self.master_defaults['profile']
+		# the session reports its own profile, without it becoming the profile saved in "master_settings.json"
+		self.master_defaults['profile'] = self.profile_name
+		self.profile_defaults = self.profile_manager._load_profile_data(self.profile_name)
+
+		self.master_overrides = {}
+		self.profile_overrides = {}
+		self.persist_delay = persist_delay
+		self._persist_timer = None
+		self._lock = threading.RLock()
+
+		self.master_settings = MasterSettingsView(self)
+		self.profile_settings = ProfileSettingsView(self)
+
+		if self.persist_delay is not None:
+			atexit.register(self.flush)
+
+	def retrieve_master_property(self, setting:str, subsetting:str=None) -> object:
+		"""
+		Retrieves a master setting, preferring the session's value over the default
+		"""
+		with self._lock:
+			if (setting, subsetting) in self.master_overrides:
+				return self.master_overrides[(setting, subsetting)]
+			if subsetting and (setting, None) in self.master_overrides:
+				return self.master_overrides[(setting, None)].get(subsetting)
+
+		if subsetting:
+			return self.master_defaults.get(setting).get(subsetting)
+		return self.master_defaults.get(setting)
+
+	def save_master_property(self, setting:str, value:object, subsetting:str=None) -> None:
+		"""
+		Saves a master setting for this session only
+		"""
+		with self._lock:
+			self.master_overrides[(setting, subsetting)] = value
+		self._schedule_persist()
+
+	def retrieve_profile_property(self, property_name:str) -> object:
+		"""
+		Retrieves a profile property, preferring the session's value over the profile's default
+		"""
+		with self._lock:
+			if property_name in self.profile_overrides:
+				return self.profile_overrides[property_name]
+		try:
+			return self.profile_manager.retrieve_property_from_data(self.profile_defaults, property_name)
+		except KeyError:
+			return None
+
+	def save_profile_property(self, property_name:str, property_value:object) -> None:
+		"""
+		Saves a profile property for this session only
+		"""
+		with self._lock:
+			self.profile_overrides[property_name] = property_value
+		self._schedule_persist()
+
+	def persist(self) -> None:
+		"""
+		Writes the session's changes to "master_settings.json" and the profile's "settings.yaml"
+		"""
+		with self._lock:
+			master_overrides = dict(self.master_overrides)
+			profile_overrides = dict(self.profile_overrides)
+
+		if master_overrides:
+			master_settings = MasterSettingsManager()
+			for (setting, subsetting), value in master_overrides.items():
+				if subsetting:
+					master_settings.data['settings'][setting][subsetting] = value
+				else:
+					master_settings.data['settings'][setting] = value
+			master_settings.save_settings()
+
+		if profile_overrides:
+			self.profile_manager.save_properties(profile_overrides, self.profile_name)
+
+	def flush(self) -> None:
+		"""
+		Persists any pending changes immediately
+		"""
+		with self._lock:
+			pending = self._persist_timer is not None
+			if self._persist_timer:
+				self._persist_timer.cancel()
+				self._persist_timer = None
+		if pending:
+			self.persist()
+
+	def _schedule_persist(self) -> None:
+		"""
+		Persists the session's changes once no further change has been made for persist_delay seconds
+		"""
+		if self.persist_delay is None:
+			return
+
+		with self._lock:
+			if self._persist_timer:
+				self._persist_timer.cancel()
+			self._persist_timer = threading.Timer(self.persist_delay, self.flush)
+			self._persist_timer.daemon = True
+			self._persist_timer.start()
+
+class MasterSettingsView:
+	"""
+	Exposes a session's master settings through the same interface as MasterSettingsManager
+	"""
+
+	def __init__(self, session_state:SessionState):
+		self.session_state = session_state
+
+	def retrieve_property(self, setting:str, subsetting:str=None) -> object:
+		"""Retrieves a property from the session's master settings."""
+		return self.session_state.retrieve_master_property(setting, subsetting)
+
+	def retrieve_properties(self) -> dict:
+		"""Retrieves all of the session's master settings."""
+		properties = copy.deepcopy(self.session_state.master_defaults)
+		for (setting, subsetting), value in self.session_state.master_overrides.items():
+			if subsetting:
+				properties[setting][subsetting] = value
+			else:
+				properties[setting] = value
+		return properties
+
+	def save_property(self, setting:str, value:object, subsetting:str=None) -> None:
+		"""Saves a property to the session's master settings."""
+		self.session_state.save_master_property(setting, value, subsetting)
+
+	def reload_settings(self) -> None:
+		"""The session's settings are held in memory and are always current."""
+		pass
+
+class ProfileSettingsView:
+	"""
+	Exposes a session's profile settings through the same interface as ProfileManager
+	"""
+
+	def __init__(self, session_state:SessionState):
+		self.session_state = session_state
+
+	def retrieve_property(self, property_name:str, profile_name:str=None) -> object:
+		"""
+		Gets a given property from the session's profile, other profiles are read from disk
+		"""
+		if profile_name and profile_name != self.session_state.profile_name:
+			return self.session_state.profile_manager.retrieve_property(property_name, profile_name)
+		return self.session_state.retrieve_profile_property(property_name)
+
+	def save_property(self, property_name:str, property_value:object, profile_name:str=None) -> None:
+		"""
+		Saves a given property to the session's profile, other profiles are written to disk
+		"""
+		if profile_name and profile_name != self.session_state.profile_name:
+			self.session_state.profile_manager.save_property(property_name, property_value, profile_name)
+			return
+		self.session_state.save_profile_property(property_name, property_value)
@@ -0,0 +1,60 @@
+import copy
+import unittest
+from unittest.mock import patch
+from src.utilities.settings.session_state.session_state import SessionState
+
+master_data = {
+    "settings": {
+        "profile": "default",
+        "functions": {"reset_language": False},
+        "status": {"mute": False, "exit": False}
+    }
+}
+
+profile_data = {
+    "entity": {"name": "Juno", "language": "english", "role": "assistant"},
+    "system": {"tts": "azure"},
+    "user": {"name": None, "gender": None}
+}
+
+@patch('src.utilities.settings.session_state.session_state.ProfileManager._load_profile_data', side_effect=lambda profile_name: copy.deepcopy(profile_data))
+@patch('src.utilities.settings.session_state.session_state.MasterSettingsManager.load_master_settings_data', side_effect=lambda: copy.deepcopy(master_data))
+class TestSessionState(unittest.TestCase):
+    """Class for testing the SessionState"""
+
+    def test_sessions_are_isolated(self, *mocks):
+        first_session = SessionState()
+        second_session = SessionState()
+
+        first_session.master_settings.save_property('status', True, 'mute')
+        first_session.profile_settings.save_property('language', 'spanish')
+
+        self.assertTrue(first_session.master_settings.retrieve_property('status', 'mute'))
+        self.assertFalse(second_session.master_settings.retrieve_property('status', 'mute'))
+        self.assertEqual(first_session.profile_settings.retrieve_property('language'), 'spanish')
+        self.assertEqual(second_session.profile_settings.retrieve_property('language'), 'english')
+        self.assertFalse(master_data['settings']['status']['mute'])
+
+    def test_unknown_profile_properties_are_kept(self, *mocks):
+        session = SessionState()
+        self.assertIsNone(session.profile_settings.retrieve_property('old_language'))
+        session.profile_settings.save_property('old_language', 'english')
+        self.assertEqual(session.profile_settings.retrieve_property('old_language'), 'english')
+
+    def test_session_profile_is_not_saved(self, *mocks):
+        session = SessionState('bench_profile')
+        self.assertEqual(session.master_settings.retrieve_property('profile'), 'bench_profile')
+        # the profile is not a change of the session's, so persisting does not make it the current profile
+        self.assertEqual(session.master_overrides, {})
+
+    def test_persist_is_explicit(self, *mocks):
+        session = SessionState()
+        session.master_settings.save_property('status', True, 'exit')
+        with patch('src.utilities.settings.session_state.session_state.MasterSettingsManager.save_settings') as save_settings:
+            session.flush()
+            save_settings.assert_not_called()
+            session.persist()
+            save_settings.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
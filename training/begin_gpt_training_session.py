@@ -1,7 +1,10 @@
 import openai
 import time
 import os
+import tempfile
 from configuration.manage_secrets import ConfigurationManager
+from src.utilities.openai_client.openai_client import get_openai_client
+from training.validate_gpt_training_data import DatasetValidator, print_report
 
 current_directory = os.path.dirname(os.path.abspath(__file__))
 training_data_path = os.path.join(current_directory, 'gpt_training_data')
@@ -10,20 +13,39 @@ class OpenAIFineTuningJob:
     """
     Used to create a fine-tuning job on OpenAI's servers.
     """
-    
+
     def __init__(self):
         self.api_key = ConfigurationManager().retrieve_api_keys()
-        openai.api_key = self.api_key['OPENAI-API-KEY']
-        
-    def start_finetuning(self, model_name=None, file=None):
+        self.client = get_openai_client(self.api_key['OPENAI-API-KEY'])
+
+    def start_finetuning(self, model_name=None, file=None, base_model="gpt-3.5-turbo"):
         """
         Begin the fine-tuning process.
+        The training data is validated first and only its valid, unique examples are uploaded.
+        :param file: (str or file) path or file object of the training data, defaults to the assistant training data
+        :return: (str) the fine-tuning job's id, or None if the data was unusable or the job could not be created
         """
-        # upload training data
-        file_id = self._upload_training_data(file)
-        
+        if file is None:
+            file = os.path.join(training_data_path, 'assistant_training_data', 'training_data.jsonl')
+
+        with tempfile.TemporaryDirectory() as directory:
+            # validate the training data and write its usable examples to a cleaned copy
+            cleaned_path = os.path.join(directory, 'training_data.jsonl')
+            self.validation_report = DatasetValidator(base_model).validate(file, cleaned_path)
+            print_report("Training data", self.validation_report)
+            if not self.validation_report['valid_examples']:
+                print("The training data contains no valid examples")
+                return None
+
+            # upload training data
+            with open(cleaned_path, 'rb') as cleaned_file:
+                file_id = self._upload_training_data(cleaned_file)
+
+        if not self._wait_for_file_to_be_processed(file_id):
+            return None
+
         # create fine-tuning job
-        self._create_fine_tuning_job(file_id, model_name)
+        return self._create_fine_tuning_job(file_id, model_name, base_model)
 
     def _upload_training_data(self, file) -> str:
         """
@@ -31,45 +53,60 @@ class OpenAIFineTuningJob:
         """
         # Upload training data
         print(f"Uploading training data...")
-        file_response = openai.File.create(
+        file_response = self.client.files.create(
             file=file,
             purpose='fine-tune'
         )
 
         print(f"Training data uploaded successfully")
-        print(f"File ID: {file_response['id']}")
-        
-        return file_response["id"]
+        print(f"File ID: {file_response.id}")
+
+        return file_response.id
+
+    def _wait_for_file_to_be_processed(self, file_id, timeout=600) -> bool:
+        """
+        Polls the uploaded file's status until OpenAI has processed it, backing off between polls.
+        """
+        print(f"Waiting for the servers to process the file...")
+        delay = 1
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            file_status = self.client.files.retrieve(file_id)
+            if file_status.status == 'processed':
+                return True
+            if file_status.status in ['error', 'deleted']:
+                print(f"The file could not be processed: {getattr(file_status, 'status_details', None)}")
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 15)
 
-    def _create_fine_tuning_job(self, file_id, model_name):
+        print(f"The file was not processed within {timeout} seconds")
+        return False
+
+    def _create_fine_tuning_job(self, file_id, model_name, base_model):
         """
         Begins a fine-tuning job.
         """
         if not model_name:
-            model_name = input("Enter a name for the fine-tuned model: ") 
-        
-        print(f"Giving servers some time to process the file")
-        time.sleep(20)
-        
+            model_name = input("Enter a name for the fine-tuned model: ")
+
         print(f"Creating fine-tuning job...")
-        while True:
-            try:
-                # Create a fine-tuning job
-                fine_tuning_response = openai.FineTuningJob.create(
-                    training_file=file_id,
-                    model="gpt-3.5-turbo",
-                    suffix=model_name
-                )
-                
-                print(f"Fine-tuning job completed!")
-                print(f"Job ID: {fine_tuning_response['id']}")
-
-                return fine_tuning_response["id"]
-            except openai.error.APIError as e:  
-                print(f"Still waiting for servers to process the file")
-                time.sleep(10)
-            
+        try:
+            # Create a fine-tuning job
+            fine_tuning_response = self.client.fine_tuning.jobs.create(
+                training_file=file_id,
+                model=base_model,
+                suffix=model_name
+            )
+        except openai.APIError as e:
+            print(f"The fine-tuning job could not be created: {e}")
+            return None
+
+        print(f"Fine-tuning job created!")
+        print(f"Job ID: {fine_tuning_response.id}")
+
+        return fine_tuning_response.id
+
 if __name__ == "__main__":
     new_job = OpenAIFineTuningJob()
     new_job.start_finetuning()
-
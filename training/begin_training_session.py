@@ -1,38 +1,67 @@
 import json
 import os
-import requests
+import sys
 import time
-from azure.core.credentials import AzureKeyCredential
-from azure.ai.language.conversations.authoring import ConversationAuthoringClient
-from configuration.manage_secrets import ConfigurationManager
+import random
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.utilities.http.http_transport import get_transport
+
+current_directory = os.path.dirname(os.path.abspath(__file__))
+# Compiled assets and the content hash of every project's deployed model
+compiled_data_path = os.path.join(current_directory, 'compiled_training_data')
+deployed_models_path = os.path.join(compiled_data_path, 'deployed_models.json')
+# Concurrent training sessions each record their deployment in the same file
+_deployed_models_lock = threading.Lock()
 
 class TrainCLUModel:
 	"""
  	Creates and trains a fully functioning Azure CLU model
 	Training data is imported and used to train the CLU models intent recognition.
 	The model is mainly used for recognizing and responding to commands given by the user.
+	Training is incremental: the training data is compiled into a content hashed asset file, and a project whose
+	deployed model was trained on identical data is not imported, trained or deployed again.
   	"""
 
-	def __init__(self, folder_name) -> None:
+	def __init__(self, folder_name, project_name=None) -> None:
 		"""
   		Initializes the CLU model
+		:param folder_name: (str) training folder, e.g. 'assistant_training_data'
+		:param project_name: (str) CLU project to train, defaults to CLU-PROJECT-NAME
     	"""
 		self._initialize_secrets()
-		self.project_data = DataHandler()._prepare_training_data(folder_name)
-  
-	def orchestrate_training_session(self) -> None:
+		if project_name:
+			self.project_name = project_name
+		self.folder_name = folder_name
+		self.project_data, self.content_hash = DataHandler().compile_training_data(folder_name)
+
+	def orchestrate_training_session(self, force=False) -> bool:
 		"""
-		Orchestrates the training of the CLU model
+		Orchestrates the training of the CLU model, skipping it if the deployed model was trained on the same data
+		:param force: (bool) train and deploy even if the training data has not changed
+		:return: (bool) whether the deployed model is up to date
 		"""
+		deployed_model = DataHandler().retrieve_deployed_model(self.project_name)
+		if not force and deployed_model.get('content_hash') == self.content_hash and deployed_model.get('model') == self.training_model_name:
+			self._print(f"Training data is unchanged since {deployed_model.get('deployed_at')} ({self.content_hash[:12]}), skipping training")
+			return True
+
 		self.import_project_data()
-		print("\n\nThis may take up to a minute...")	
-		self.train_conversation_model()
-		print("\n\nThis may take up to two minutes...")	
-		self.deploy_conversation_model()
+		self._print("This may take up to a minute...")
+		if not self.train_conversation_model():
+			return False
+		self._print("This may take up to two minutes...")
+		if not self.deploy_conversation_model():
+			return False
+
+		DataHandler().save_deployed_model(self.project_name, self.training_model_name, self.content_hash)
+		return True
 
 	def import_project_data(self) -> None:
 		"""
-		Creates a new CLU project and imports the training data located within 
+		Creates a new CLU project and imports the training data located within
 		the /training sub-directory into it
 		"""
 		poller = self.client.begin_import_project(
@@ -45,19 +74,19 @@ class TrainCLUModel:
 					"settings": {"confidenceThreshold": 0.7},
 					"projectName": self.project_name,
 					"multilingual": True,
-					"description": "Trying out CLU",
+					"description": f"Trained from {self.folder_name} ({self.content_hash[:12]})",
 					"language": "en-us",
 				},
 				"projectFileVersion": "2022-05-01",
 			},
 		)
-		print(f"\nImporting training data to project: {self.project_name}")
-		print(f'\n{poller.result()}')
-   
-	def train_conversation_model(self):
+		self._print(f"Importing training data to project: {self.project_name}")
+		self._print(poller.result())
+
+	def train_conversation_model(self) -> bool:
 		"""
 		Begins a training session for the newly created CLU model
-		"""	
+		"""
 
 		url = f"{self.endpoint}/language/authoring/analyze-conversations/projects/{self.project_name}/:train?api-version=2022-10-01-preview"
 
@@ -76,20 +105,21 @@ class TrainCLUModel:
 			}
 		}
 
-		print(f"\nBeginning a training session for the project: {self.project_name}")
-		response = requests.post(url, headers=headers, json=body)
+		self._print(f"Beginning a training session for the project: {self.project_name}")
+		# starting a training job is not idempotent, so it is never retried
+		response = get_transport().post(url, headers=headers, json=body, retries=0)
 
 		if response.status_code == 202:
 			operation_location = response.headers["operation-location"]
-			print(f"\nTraining started. Poll the operation location to get status: {operation_location}")
-			self._wait_for_operation_to_complete(operation_location, headers)
-		else:
-			print(f"Training failed. Error: {response.json()}")
-   
-	def deploy_conversation_model(self):
+			self._print(f"Training started. Poll the operation location to get status: {operation_location}")
+			return self._wait_for_operation_to_complete(operation_location, headers)
+		self._print(f"Training failed. Error: {response.json()}")
+		return False
+
+	def deploy_conversation_model(self) -> bool:
 		"""
 		Deploys the newly created CLU model
-		"""    
+		"""
 
 		url = f"{self.endpoint}/language/authoring/analyze-conversations/projects/{self.project_name}/deployments/{self.training_model_name}?api-version=2023-04-01"
 
@@ -102,35 +132,57 @@ class TrainCLUModel:
 			"trainedModelLabel": self.training_model_name
 		}
 
-		print(f"\nDeploying the model: {self.training_model_name}")
-		response = requests.put(url, headers=headers, json=body)  
+		self._print(f"Deploying the model: {self.training_model_name}")
+		response = get_transport().put(url, headers=headers, json=body)
 
 		if response.status_code == 202:
 			operation_location = response.headers["operation-location"]
-			print(f"\nDeployment started. Poll the operation location to get status: {operation_location}")
-			self._wait_for_operation_to_complete(operation_location, headers)
-		else:
-			print(f"Deployment failed. Error: {response.json()}")
-   
-	def _wait_for_operation_to_complete(self, operation_location, headers):
-		"""
-		Waits for the operation to complete
-		"""	
-		while True:
-			time.sleep(5)  
-			response = requests.get(operation_location, headers=headers)
+			self._print(f"Deployment started. Poll the operation location to get status: {operation_location}")
+			return self._wait_for_operation_to_complete(operation_location, headers)
+		self._print(f"Deployment failed. Error: {response.json()}")
+		return False
+
+	def _wait_for_operation_to_complete(self, operation_location, headers, initial_delay=1.0, max_delay=15.0, timeout=1800) -> bool:
+		"""
+		Waits for the operation to complete, polling quickly at first and backing off while it keeps running.
+		A Retry-After header sent by the service takes precedence over the backoff.
+		:return: (bool) whether the operation succeeded
+		"""
+		delay = initial_delay
+		deadline = time.monotonic() + timeout
+		while time.monotonic() < deadline:
+			response = get_transport().get(operation_location, headers=headers)
 			status = response.json().get("status")
 			if status == "succeeded":
-				print("Operation completed successfully.")
-				break
-			elif status == "failed":
-				print("Operation failed.")
-				break
+				self._print("Operation completed successfully.")
+				return True
+			elif status in ["failed", "cancelled"]:
+				self._print(f"Operation {status}: {response.json().get('errors')}")
+				return False
+
+			retry_after = response.headers.get("Retry-After")
+			wait = float(retry_after) if retry_after and retry_after.isdigit() else delay * random.uniform(0.8, 1.2)
+			time.sleep(min(wait, max(deadline - time.monotonic(), 0)))
+			delay = min(delay * 1.6, max_delay)
+
+		self._print(f"Operation did not complete within {timeout} seconds.")
+		return False
+
+	def _print(self, message) -> None:
+		"""
+		Prefixes messages with the project, so concurrent training sessions can be told apart
+		"""
+		print(f"\n[{self.project_name}] {message}")
 
 	def _initialize_secrets(self):
 		"""
 		Initializes secrets used for the CLU model
-		"""	
+		"""
+		# imported here so DataHandler can be used without the Azure SDK
+		from azure.core.credentials import AzureKeyCredential
+		from azure.ai.language.conversations.authoring import ConversationAuthoringClient
+		from configuration.manage_secrets import ConfigurationManager
+
 		self.configuration_manager = ConfigurationManager()
 		self.api_keys = self.configuration_manager.retrieve_api_keys()
 		self.project_name  = self.api_keys['CLU-PROJECT-NAME']
@@ -138,12 +190,51 @@ class TrainCLUModel:
 		self.endpoint = self.api_keys['CLU-ENDPOINT']
 		credential = AzureKeyCredential(self.api_keys['CLU-API-KEY'])
 		self.client = ConversationAuthoringClient(self.endpoint, credential)
-   
+
 class DataHandler:
 	"""
 	Used to load in and prepare the training data for the CLU model
 	"""
 
+	def compile_training_data(self, folder_name) -> tuple:
+		"""
+		Compiles the training data into normalized, deduplicated assets in a stable order,
+		and saves them with their content hash to "compiled_training_data/<folder_name>.json"
+		:return: (tuple) the assets and their content hash
+		"""
+		assets = self._normalize_assets(self._prepare_training_data(folder_name))
+		content_hash = hashlib.sha256(json.dumps(assets, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+		os.makedirs(compiled_data_path, exist_ok=True)
+		with open(os.path.join(compiled_data_path, f'{folder_name}.json'), 'w', encoding='utf-8') as f:
+			json.dump({"content_hash": content_hash, "assets": assets}, f, indent=2, ensure_ascii=False)
+
+		return assets, content_hash
+
+	def retrieve_deployed_model(self, project_name) -> dict:
+		"""
+		Returns the model label, content hash and deployment time of the project's deployed model
+		"""
+		try:
+			return self._load_in_file(deployed_models_path).get(project_name, {})
+		except FileNotFoundError:
+			return {}
+
+	def save_deployed_model(self, project_name, model_name, content_hash) -> None:
+		"""
+		Records the project's deployed model, sessions finishing together are written one after the other
+		"""
+		with _deployed_models_lock:
+			try:
+				deployed_models = self._load_in_file(deployed_models_path)
+			except FileNotFoundError:
+				deployed_models = {}
+
+			deployed_models[project_name] = {"model": model_name, "content_hash": content_hash, "deployed_at": time.strftime('%Y-%m-%d %H:%M:%S')}
+			os.makedirs(compiled_data_path, exist_ok=True)
+			with open(deployed_models_path, 'w') as f:
+				json.dump(deployed_models, f, indent=4)
+
 	def _prepare_training_data(self, folder_name) -> dict:
 		"""
 		Prepares the training data for the CLU model
@@ -165,6 +256,37 @@ class DataHandler:
 
 		return assets
 
+	def _normalize_assets(self, assets) -> dict:
+		"""
+		Removes duplicate intents, entities and utterances (utterances differing only in case or spacing count as duplicates),
+		trims the utterances' surrounding whitespace and sorts everything, so identical training data always hashes the same
+		"""
+		utterances = {}
+		for utterance in assets["utterances"]:
+			text = utterance["text"]
+			stripped_text = text.strip()
+			# entity offsets are relative to the text, so they move with any removed leading whitespace
+			shift = len(text) - len(text.lstrip())
+			entities = sorted(
+				({**entity, "offset": entity["offset"] - shift} for entity in utterance.get("entities", [])),
+				key=lambda entity: (entity["offset"], entity["category"])
+			)
+			key = (' '.join(stripped_text.lower().split()), utterance["intent"])
+			normalized = {**utterance, "text": stripped_text, **({"entities": entities} if entities else {})}
+			# of duplicates, the one with the most labelled entities is kept, whatever order the files were read in
+			if key not in utterances or self._duplicate_rank(normalized) < self._duplicate_rank(utterances[key]):
+				utterances[key] = normalized
+
+		return {
+			"projectKind": assets["projectKind"],
+			"intents": [{"category": category} for category in sorted({intent["category"] for intent in assets["intents"]})],
+			"entities": [{"category": category} for category in sorted({entity["category"] for entity in assets["entities"]})],
+			"utterances": [utterances[key] for key in sorted(utterances, key=lambda key: (key[1], key[0]))]
+		}
+
+	def _duplicate_rank(self, utterance) -> tuple:
+		return (-len(utterance.get("entities", [])), json.dumps(utterance, sort_keys=True, ensure_ascii=False))
+
 	def _load_in_project_data(self, project, assets) -> dict:
 		"""
 		Loads in the project data from the project_header.json file
@@ -174,7 +296,7 @@ class DataHandler:
 			for filename in filenames:
 				if filename.endswith('.json'):
 					full_path = os.path.join(dirpath, filename)
-					
+
 					# Load the JSON data
 					file_data = self._load_in_file(full_path)
 
@@ -182,7 +304,7 @@ class DataHandler:
 					if filename == 'intents.json':
 						assets["intents"].extend(file_data["intents"])
 					elif filename == 'entities.json':
-						assets["entities"].extend(file_data)  
+						assets["entities"].extend(file_data)
 					elif filename == 'utterances.json':
 						assets["utterances"].extend(file_data)
 		return assets
@@ -191,9 +313,41 @@ class DataHandler:
 		with open(file_path, 'r') as f:
 			return json.load(f)
 
+def train_projects(training_sessions, force=False) -> dict:
+	"""
+	Trains several projects concurrently, most of each session is spent waiting on the service
+	:param training_sessions: (list) (folder name, project name) pairs, a project name of None uses CLU-PROJECT-NAME
+	:return: (dict) whether each project's deployed model is up to date
+	"""
+	project_names = [project_name for _, project_name in training_sessions]
+	if len(set(project_names)) != len(project_names):
+		raise ValueError("Each training folder must be trained into a different project.")
+
+	def train(folder_name, project_name):
+		model = TrainCLUModel(folder_name, project_name)
+		return model.project_name, model.orchestrate_training_session(force)
+
+	with ThreadPoolExecutor(max_workers=len(training_sessions)) as executor:
+		return dict(executor.map(lambda session: train(*session), training_sessions))
+
 if __name__ == "__main__":
-	
-	folder_name = input("Enter the name of the folder used for training (i.e 'assistant_training_data', 'basic_training_data'): ")
-	
-	new_model = TrainCLUModel(folder_name)
-	new_model.orchestrate_training_session()
+
+	parser = argparse.ArgumentParser(description='Train and deploy CLU models from the training folders')
+	parser.add_argument('folders', nargs='*', help="training folders, e.g. 'assistant_training_data' 'basic_training_data'")
+	parser.add_argument('--project', action='append', help='CLU project of each folder, in the same order (defaults to CLU-PROJECT-NAME)')
+	parser.add_argument('--force', action='store_true', help='train and deploy even if the training data has not changed')
+	args = parser.parse_args()
+
+	folder_names = args.folders
+	if not folder_names:
+		folder_names = [input("Enter the name of the folder used for training (i.e 'assistant_training_data', 'basic_training_data'): ")]
+
+	project_names = args.project or []
+	if len(folder_names) > 1 and len(project_names) != len(folder_names):
+		parser.error('When training several folders, give each its own --project.')
+	project_names += [None] * (len(folder_names) - len(project_names))
+
+	results = train_projects(list(zip(folder_names, project_names)), args.force)
+	for project_name, up_to_date in results.items():
+		print(f"{project_name}: {'deployed model is up to date' if up_to_date else 'training failed'}")
+	sys.exit(0 if all(results.values()) else 1)
@@ -0,0 +1,321 @@
+"""
+Measures how accurately and how quickly an intent backend recognizes the training utterances and an optional held-out set.
+
+Backends:
+	clu          the deployed CLU model (the deployment can be chosen, so two model versions can be compared side by side)
+	cached-clu   the CLU model behind an in-memory cache of normalized utterances, repeated utterances skip the network
+	local        a nearest neighbour classifier over hashed character n-grams, evaluated leave-one-out on the training data
+
+For every backend a confusion matrix, per-intent precision and recall, and latency percentiles are reported. A sweep over
+the routing threshold ('minimum_intent_score' in the 'recognition' master settings, below which speech is answered by GPT
+instead of a command) shows how many commands each threshold would run correctly, run wrongly or hand to GPT.
+
+Usage:
+	python -m training.evaluate_intent_model --folder assistant_training_data --backend clu --backend local
+	python -m training.evaluate_intent_model --backend clu --deployment Model1 --backend clu --deployment Model2 --held-out held_out.json
+	python -m training.evaluate_intent_model --backend clu --save-threshold
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from training.begin_training_session import DataHandler
+
+# Utterances labelled with this intent should not run a command, they are answered by GPT
+NO_INTENT = 'None'
+
+class CLUBackend:
+	"""
+	Predicts intents with a deployed CLU model
+	"""
+
+	def __init__(self, deployment_name:str=None, language:str='en'):
+		from azure.core.credentials import AzureKeyCredential
+		from azure.ai.language.conversations import ConversationAnalysisClient
+		from src.initialization.shared_resources import retrieve_api_keys
+		from src.utilities.http.service_endpoints import retrieve_service_endpoint
+
+		api_keys = retrieve_api_keys()
+		self.project_name = api_keys['CLU-PROJECT-NAME']
+		self.deployment_name = deployment_name or api_keys['CLU-TRAINING-MODEL-NAME']
+		self.language = language
+		self.name = f'clu:{self.deployment_name}'
+		self.client = ConversationAnalysisClient(retrieve_service_endpoint('clu', api_keys['CLU-ENDPOINT']), AzureKeyCredential(api_keys['CLU-API-KEY']))
+
+	def predict(self, text:str) -> tuple:
+		"""
+		Returns the top intent and its confidence score
+		"""
+		result = self.client.analyze_conversation(task={
+			"kind": "Conversation",
+			"analysisInput": {
+				"conversationItem": {"participantId": "1", "id": "1", "modality": "text", "language": self.language, "text": text},
+				"isLoggingEnabled": False
+			},
+			"parameters": {"projectName": self.project_name, "deploymentName": self.deployment_name, "verbose": True}
+		})
+		prediction = result["result"]["prediction"]
+		top_intent = prediction["topIntent"]
+		scores = {intent["category"]: intent["confidenceScore"] for intent in prediction["intents"]}
+		return top_intent, scores.get(top_intent, 0.0)
+
+class CachedBackend:
+	"""
+	Answers repeated utterances from memory, only utterances not seen before reach the wrapped backend
+	"""
+
+	def __init__(self, backend:object):
+		self.backend = backend
+		self.name = f'cached-{backend.name}'
+		self.cache = {}
+		self.hits = 0
+
+	def predict(self, text:str) -> tuple:
+		key = ' '.join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+		if key in self.cache:
+			self.hits += 1
+		else:
+			self.cache[key] = self.backend.predict(text)
+		return self.cache[key]
+
+class LocalBackend:
+	"""
+	Predicts the intent of the most similar training utterances by cosine similarity of hashed character n-grams.
+	An utterance that is itself part of the training data is never matched with itself, so evaluating the training
+	data is a leave-one-out evaluation.
+	"""
+
+	def __init__(self, training_utterances:list, neighbours:int=3):
+		from src.customization.packages.virtual_assistant.commands.ask_gpt.response_cache import HashingVectorizer
+
+		self.name = 'local'
+		self.neighbours = neighbours
+		self.vectorizer = HashingVectorizer()
+		self.texts = [utterance['text'] for utterance in training_utterances]
+		self.intents = np.array([utterance['intent'] for utterance in training_utterances])
+		self.vectors = np.stack([self.vectorizer.vectorize(text) for text in self.texts])
+
+	def predict(self, text:str) -> tuple:
+		similarities = self.vectors @ self.vectorizer.vectorize(text)
+		similarities[[index for index, training_text in enumerate(self.texts) if training_text == text]] = -1
+
+		nearest = np.argsort(similarities)[::-1][:self.neighbours]
+		# the neighbours vote with their similarity, the score is the winning intent's share of the vote
+		votes = {}
+		for index in nearest:
+			votes[self.intents[index]] = votes.get(self.intents[index], 0) + max(similarities[index], 0)
+		top_intent = max(votes, key=votes.get)
+		total = sum(votes.values())
+		return str(top_intent), float(votes[top_intent] / total * similarities[nearest[0]]) if total else 0.0
+
+def load_utterances(folder_name:str, held_out_path:str=None) -> tuple:
+	"""
+	Returns the training utterances of the given folder (as compiled for CLU training) and the held-out utterances
+	"""
+	training_utterances = DataHandler()._prepare_training_data(folder_name)['utterances']
+	held_out_utterances = []
+	if held_out_path:
+		with open(held_out_path, 'r') as f:
+			held_out_utterances = json.load(f)
+	return training_utterances, held_out_utterances
+
+def run_backend(backend:object, utterances:list) -> dict:
+	"""
+	Predicts every utterance and returns the true intents, predicted intents, scores and latencies as arrays
+	"""
+	predictions, scores, latencies = [], [], []
+	for utterance in utterances:
+		start_time = time.perf_counter()
+		intent, score = backend.predict(utterance['text'])
+		latencies.append((time.perf_counter() - start_time) * 1000)
+		predictions.append(intent)
+		scores.append(score)
+
+	return {
+		'true': np.array([utterance['intent'] for utterance in utterances]),
+		'predicted': np.array(predictions),
+		'scores': np.array(scores, dtype=float),
+		'latencies': np.array(latencies),
+	}
+
+def confusion_matrix(true:np.ndarray, predicted:np.ndarray) -> tuple:
+	"""
+	Returns the intents and the matrix counting each (true intent, predicted intent) pair
+	"""
+	labels = np.unique(np.concatenate([true, predicted]))
+	matrix = np.zeros((len(labels), len(labels)), dtype=int)
+	np.add.at(matrix, (np.searchsorted(labels, true), np.searchsorted(labels, predicted)), 1)
+	return labels, matrix
+
+def per_intent_metrics(labels:np.ndarray, matrix:np.ndarray) -> dict:
+	"""
+	Returns each intent's precision, recall and support
+	"""
+	correct = np.diag(matrix)
+	predicted_counts = matrix.sum(axis=0)
+	support = matrix.sum(axis=1)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		precision = np.where(predicted_counts > 0, correct / predicted_counts, np.nan)
+		recall = np.where(support > 0, correct / support, np.nan)
+
+	return {
+		str(label): {
+			'precision': None if np.isnan(precision[index]) else round(float(precision[index]), 3),
+			'recall': None if np.isnan(recall[index]) else round(float(recall[index]), 3),
+			'support': int(support[index]),
+		}
+		for index, label in enumerate(labels)
+	}
+
+def threshold_sweep(run:dict, thresholds:np.ndarray) -> list:
+	"""
+	Returns what each routing threshold would do with the utterances: run the right command, run a wrong command,
+	or hand the speech to GPT (which is correct for utterances without an intent)
+	"""
+	true, predicted, scores = run['true'], run['predicted'], run['scores']
+	# rows are thresholds, columns are utterances
+	routed = scores[None, :] >= thresholds[:, None]
+	is_command = (true != NO_INTENT)[None, :]
+	right_command = routed & (predicted == true)[None, :] & is_command
+	wrong_command = routed & ~(predicted == true)[None, :]
+	correct_fallback = ~routed & ~is_command
+
+	return [
+		{
+			'threshold': round(float(threshold), 3),
+			'routing_accuracy': round(float((right_command[row] | correct_fallback[row]).mean()), 4),
+			'right_command_rate': round(float(right_command[row].mean()), 4),
+			'wrong_command_rate': round(float(wrong_command[row].mean()), 4),
+			'gpt_fallback_rate': round(float((~routed[row]).mean()), 4),
+		}
+		for row, threshold in enumerate(thresholds)
+	]
+
+def recommend_threshold(sweep:list, max_wrong_command_rate:float) -> dict:
+	"""
+	The threshold with the best routing accuracy among those that run few enough wrong commands,
+	the highest such threshold when several tie
+	"""
+	candidates = [row for row in sweep if row['wrong_command_rate'] <= max_wrong_command_rate] or sweep
+	return max(candidates, key=lambda row: (row['routing_accuracy'], row['threshold']))
+
+def latency_summary(latencies:np.ndarray) -> dict:
+	if not len(latencies):
+		return {'count': 0}
+	p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+	return {'count': int(len(latencies)), 'mean_ms': round(float(latencies.mean()), 3), 'p50_ms': round(float(p50), 3), 'p90_ms': round(float(p90), 3), 'p99_ms': round(float(p99), 3), 'max_ms': round(float(latencies.max()), 3)}
+
+def evaluate(backend:object, utterances:list, thresholds:np.ndarray, max_wrong_command_rate:float) -> dict:
+	"""
+	Evaluates a backend on the given utterances
+	"""
+	run = run_backend(backend, utterances)
+	labels, matrix = confusion_matrix(run['true'], run['predicted'])
+	sweep = threshold_sweep(run, thresholds)
+
+	return {
+		'backend': backend.name,
+		'utterances': len(utterances),
+		'accuracy': round(float((run['true'] == run['predicted']).mean()), 4) if len(utterances) else None,
+		'latency': latency_summary(run['latencies']),
+		'per_intent': per_intent_metrics(labels, matrix),
+		'confusion_matrix': {'labels': labels.tolist(), 'matrix': matrix.tolist()},
+		'threshold_sweep': sweep,
+		'recommended_threshold': recommend_threshold(sweep, max_wrong_command_rate) if sweep else None,
+		'cache_hits': getattr(backend, 'hits', None),
+	}
+
+def create_backends(args, training_utterances:list) -> list:
+	"""
+	Creates the requested backends, each --deployment applies to the clu backends in the order they were given
+	"""
+	deployments = list(args.deployment or [])
+	backends = []
+	for backend_name in args.backend or ['local']:
+		if backend_name == 'local':
+			backends.append(LocalBackend(training_utterances, args.neighbours))
+			continue
+		backend = CLUBackend(deployments.pop(0) if deployments else None, args.language)
+		backends.append(CachedBackend(backend) if backend_name == 'cached-clu' else backend)
+	return backends
+
+def print_report(result:dict, current_threshold:float) -> None:
+	print(f"\n{result['backend']} on {result['dataset']} ({result['utterances']} utterances)")
+	print(f"  accuracy {result['accuracy']}, latency p50 {result['latency'].get('p50_ms')} ms, p99 {result['latency'].get('p99_ms')} ms")
+
+	weakest = sorted(result['per_intent'].items(), key=lambda item: item[1]['recall'] if item[1]['recall'] is not None else 1)[:5]
+	print('  lowest recall: ' + ', '.join(f"{intent} {metrics['recall']}" for intent, metrics in weakest))
+
+	current = min(result['threshold_sweep'], key=lambda row: abs(row['threshold'] - current_threshold))
+	recommended = result['recommended_threshold']
+	print(f"  threshold {current['threshold']} (current): routing accuracy {current['routing_accuracy']}, wrong commands {current['wrong_command_rate']}, GPT fallbacks {current['gpt_fallback_rate']}")
+	print(f"  threshold {recommended['threshold']} (recommended): routing accuracy {recommended['routing_accuracy']}, wrong commands {recommended['wrong_command_rate']}, GPT fallbacks {recommended['gpt_fallback_rate']}")
+
+def print_comparison(first:dict, second:dict) -> None:
+	"""
+	Prints the per-intent recall of two backends side by side, largest differences first
+	"""
+	print(f"\nRecall by intent on {first['dataset']}: {first['backend']} vs {second['backend']}")
+	intents = set(first['per_intent']) | set(second['per_intent'])
+	rows = []
+	for intent in intents:
+		before = first['per_intent'].get(intent, {}).get('recall')
+		after = second['per_intent'].get(intent, {}).get('recall')
+		rows.append((intent, before, after, (after or 0) - (before or 0)))
+	for intent, before, after, difference in sorted(rows, key=lambda row: -abs(row[3])):
+		print(f"  {intent:<20} {str(before):>6} {str(after):>6} {difference:+.3f}")
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description='Evaluate the accuracy and latency of intent backends')
+	parser.add_argument('--folder', default='assistant_training_data', help="training folder, e.g. 'assistant_training_data' or 'basic_training_data'")
+	parser.add_argument('--held-out', default=None, help='JSON list of {"text", "intent"} utterances not used for training, "None" marks speech meant for GPT')
+	parser.add_argument('--backend', action='append', choices=['clu', 'cached-clu', 'local'], help='may be repeated, defaults to local')
+	parser.add_argument('--deployment', action='append', help='CLU deployment of each clu backend, defaults to CLU-TRAINING-MODEL-NAME')
+	parser.add_argument('--language', default='en')
+	parser.add_argument('--neighbours', type=int, default=3, help='neighbours consulted by the local backend')
+	parser.add_argument('--max-wrong-command-rate', type=float, default=0.02, help='share of utterances allowed to run a wrong command at the recommended threshold')
+	parser.add_argument('--save-threshold', action='store_true', help="save the first backend's recommended threshold as 'minimum_intent_score'")
+	parser.add_argument('--output', default=None, help='where to save the full results as JSON')
+	args = parser.parse_args()
+
+	from src.utilities.settings.master_settings.master_settings_manager import MasterSettingsManager
+	master_settings = MasterSettingsManager()
+	current_threshold = master_settings.retrieve_property('recognition', 'minimum_intent_score')
+	if current_threshold is None:
+		current_threshold = .90
+
+	training_utterances, held_out_utterances = load_utterances(args.folder, args.held_out)
+	datasets = {'training': training_utterances}
+	if held_out_utterances:
+		datasets['held_out'] = held_out_utterances
+
+	thresholds = np.round(np.arange(0.30, 1.0, 0.01), 2)
+	results = []
+	for backend in create_backends(args, training_utterances):
+		for dataset, utterances in datasets.items():
+			result = {'dataset': dataset, **evaluate(backend, utterances, thresholds, args.max_wrong_command_rate)}
+			results.append(result)
+			print_report(result, current_threshold)
+
+	# the first two backends side by side, on the held-out set if there is one
+	dataset = 'held_out' if 'held_out' in datasets else 'training'
+	compared = [result for result in results if result['dataset'] == dataset]
+	if len(compared) >= 2:
+		print_comparison(compared[0], compared[1])
+
+	if args.save_threshold and compared:
+		threshold = compared[0]['recommended_threshold']['threshold']
+		master_settings.save_property('recognition', threshold, 'minimum_intent_score')
+		print(f"\nSaved {threshold} as the minimum intent score")
+
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump(results, f, indent=2)
+		print(f'\nResults saved to {args.output}')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Exports the conversations stored in each profile's "conversation_history.yaml" as chat fine-tuning JSONL.
+
+Sessions are streamed out of the history files one at a time, so large histories are never loaded whole. Every exported
+example starts with the system message of the profile the conversation was held with. By default only turns answered
+by GPT are kept: responses of commands ("Opening Google.com") are not what GPT should learn, and GPT never saw them in
+its context either. Turns recorded before responses were labelled with their source are skipped unless requested.
+
+Usage:
+    python -m training.export_conversation_history [--profile default] [--since 01/10/2023] [--source gpt] [--validate]
+"""
+
+import os
+import sys
+import json
+import yaml
+import argparse
+from datetime import datetime
+
+current_directory = os.path.dirname(os.path.abspath(__file__))
+profiles_path = os.path.join(current_directory, '..', 'src', 'customization', 'profiles', 'profile_storage')
+default_output_path = os.path.join(current_directory, 'gpt_training_data', 'history_training_data', 'training_data.jsonl')
+
+# Keys of a conversation entry that are not the bot's response
+ENTRY_KEYS = {'User', 'Source'}
+
+def iter_sessions(conversation_history_path:str):
+    """
+    Yields (session name, session) pairs from a conversation history file, loading one session at a time.
+    The file is written by yaml.safe_dump in block style, so every unindented line starts a new session.
+    """
+    def load(lines):
+        data = yaml.safe_load(''.join(lines)) or {}
+        return [(name, session) for name, session in data.items() if str(name).startswith('Session') and isinstance(session, dict)]
+
+    lines = []
+    with open(conversation_history_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if lines and line[:1] not in (' ', '-', '\n', '#'):
+                yield from load(lines)
+                lines = []
+            lines.append(line)
+    if lines:
+        yield from load(lines)
+
+def session_date(session:dict) -> datetime:
+    try:
+        return datetime.strptime(str(session.get('Date')), '%d/%m/%Y')
+    except ValueError:
+        return None
+
+def profile_system_message(profile_name:str) -> str:
+    """
+    Builds the system message GPT is given by the profile, from the profile's "settings.yaml"
+    """
+    from src.customization.packages.virtual_assistant.commands.ask_gpt.ask_gpt import build_system_message
+
+    with open(os.path.join(profiles_path, profile_name, 'settings.yaml'), 'r', encoding='utf-8') as f:
+        entity = (yaml.safe_load(f) or {}).get('entity', {})
+    return build_system_message(entity.get('name'), entity.get('language'), entity.get('personality'), entity.get('role'), entity.get('persona'))
+
+def iter_examples(profile_name:str, sources:set, since:datetime=None, until:datetime=None, max_turns:int=10):
+    """
+    Yields a profile's conversations as fine-tuning examples.
+    Long sessions are split into examples of at most max_turns turns, each starting with the system message.
+    """
+    conversation_history_path = os.path.join(profiles_path, profile_name, 'conversation_history.yaml')
+    if not os.path.exists(conversation_history_path):
+        return
+    system_message = {"role": "system", "content": profile_system_message(profile_name)}
+
+    for _, session in iter_sessions(conversation_history_path):
+        date = session_date(session)
+        if (since and (date is None or date < since)) or (until and (date is None or date > until)):
+            continue
+
+        turns = []
+        for entry in session.get('Conversation') or []:
+            if not isinstance(entry, dict) or (entry.get('Source') or 'unlabelled') not in sources:
+                continue
+            response = next((value for key, value in entry.items() if key not in ENTRY_KEYS), None)
+            if not entry.get('User') or not response:
+                continue
+            turns.append([{"role": "user", "content": str(entry['User'])}, {"role": "assistant", "content": str(response)}])
+
+        for start in range(0, len(turns), max_turns):
+            yield {"messages": [system_message] + [message for turn in turns[start:start + max_turns] for message in turn]}
+
+def export(output_path:str, profile_names:list, sources:set, since:datetime=None, until:datetime=None, max_turns:int=10) -> int:
+    """
+    Streams the examples of the given profiles into a JSONL file and returns how many were written
+    """
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    written = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for profile_name in profile_names:
+            for example in iter_examples(profile_name, sources, since, until, max_turns):
+                f.write(json.dumps(example, ensure_ascii=False) + '\n')
+                written += 1
+    return written
+
+def parse_date(value:str) -> datetime:
+    try:
+        return datetime.strptime(value, '%d/%m/%Y')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a date in the form dd/mm/yyyy")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Export conversation history as GPT fine-tuning data')
+    parser.add_argument('--profile', action='append', help='profile to export, may be repeated (defaults to every profile)')
+    parser.add_argument('--since', type=parse_date, default=None, help='first session date to export, dd/mm/yyyy')
+    parser.add_argument('--until', type=parse_date, default=None, help='last session date to export, dd/mm/yyyy')
+    parser.add_argument('--source', choices=['gpt', 'command', 'all'], default='gpt', help='which responses to export')
+    parser.add_argument('--include-unlabelled', action='store_true', help='also export turns recorded without a source')
+    parser.add_argument('--max-turns', type=int, default=10, help='turns per example, longer sessions are split')
+    parser.add_argument('--output', default=default_output_path)
+    parser.add_argument('--validate', action='store_true', help='validate the exported data and estimate its training cost')
+    args = parser.parse_args()
+
+    sources = {'gpt', 'command'} if args.source == 'all' else {args.source}
+    if args.include_unlabelled:
+        sources.add('unlabelled')
+    profile_names = args.profile or sorted(name for name in os.listdir(profiles_path) if os.path.isdir(os.path.join(profiles_path, name)))
+
+    written = export(args.output, profile_names, sources, args.since, args.until, args.max_turns)
+    print(f"Exported {written} examples from {len(profile_names)} profile(s) to {os.path.relpath(args.output)}")
+
+    if args.validate and written:
+        from training.validate_gpt_training_data import DatasetValidator, print_report
+        print_report(os.path.relpath(args.output), DatasetValidator().validate(args.output))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
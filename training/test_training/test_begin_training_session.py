@@ -0,0 +1,102 @@
+import os
+import json
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, patch
+import training.begin_training_session as training_session
+from training.begin_training_session import DataHandler, TrainCLUModel
+
+ASSETS = {
+    "projectKind": "Conversation",
+    "intents": [{"category": "Open_Website"}, {"category": "Get_Weather"}, {"category": "Open_Website"}],
+    "entities": [{"category": "Website"}, {"category": "Website"}],
+    "utterances": [
+        {"text": "  open google", "intent": "Open_Website", "language": "en-us", "entities": [{"category": "Website", "offset": 7, "length": 6}]},
+        {"text": "Open  Google ", "intent": "Open_Website", "language": "en-us"},
+        {"text": "what is the weather", "intent": "Get_Weather", "language": "en-us"},
+    ]
+}
+
+def operation(status, retry_after=None):
+    return Mock(json=Mock(return_value={"status": status}), headers={"Retry-After": retry_after} if retry_after else {})
+
+class TestDataHandler(unittest.TestCase):
+    """Class for testing the CLU training data compilation"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch.multiple(training_session, compiled_data_path=self.directory.name,
+                                 deployed_models_path=os.path.join(self.directory.name, 'deployed_models.json'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def test_normalize_assets_deduplicates_and_sorts(self):
+        assets = DataHandler()._normalize_assets(ASSETS)
+        self.assertEqual(assets["intents"], [{"category": "Get_Weather"}, {"category": "Open_Website"}])
+        self.assertEqual(assets["entities"], [{"category": "Website"}])
+        self.assertEqual([utterance["text"] for utterance in assets["utterances"]], ["what is the weather", "open google"])
+
+    def test_normalize_assets_shifts_entity_offsets(self):
+        utterance = DataHandler()._normalize_assets(ASSETS)["utterances"][1]
+        entity = utterance["entities"][0]
+        self.assertEqual(utterance["text"][entity["offset"]:entity["offset"] + entity["length"]], "google")
+
+    def test_content_hash_is_stable(self):
+        shuffled = {**ASSETS, "intents": ASSETS["intents"][::-1], "utterances": ASSETS["utterances"][::-1]}
+        with patch.object(DataHandler, '_prepare_training_data', side_effect=[ASSETS, shuffled]):
+            assets, content_hash = DataHandler().compile_training_data('assistant_training_data')
+            shuffled_assets, shuffled_hash = DataHandler().compile_training_data('assistant_training_data')
+        self.assertEqual(content_hash, shuffled_hash)
+        self.assertEqual(assets, shuffled_assets)
+
+        with open(os.path.join(self.directory.name, 'assistant_training_data.json'), 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["content_hash"], content_hash)
+
+        changed = {**ASSETS, "utterances": ASSETS["utterances"] + [{"text": "open bing", "intent": "Open_Website"}]}
+        with patch.object(DataHandler, '_prepare_training_data', return_value=changed):
+            self.assertNotEqual(DataHandler().compile_training_data('assistant_training_data')[1], content_hash)
+
+    def test_concurrent_deployments_are_all_saved(self):
+        threads = [threading.Thread(target=DataHandler().save_deployed_model, args=(f'project-{i}', 'model', f'hash-{i}')) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i in range(20):
+            self.assertEqual(DataHandler().retrieve_deployed_model(f'project-{i}')["content_hash"], f'hash-{i}')
+
+class TestWaitForOperation(unittest.TestCase):
+    """Class for testing the polling of CLU training and deployment operations"""
+
+    def setUp(self):
+        # the Azure client and secrets are not needed to poll an operation
+        self.model = TrainCLUModel.__new__(TrainCLUModel)
+        self.model.project_name = 'Juno'
+        self.transport = Mock()
+        patcher = patch.object(training_session, 'get_transport', return_value=self.transport)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('training.begin_training_session.time.sleep')
+    def test_backs_off_until_the_operation_succeeds(self, sleep):
+        self.transport.get.side_effect = [operation('running'), operation('running'), operation('running'), operation('succeeded')]
+        self.assertTrue(self.model._wait_for_operation_to_complete('https://example.com/operation', {}, initial_delay=1.0))
+        waits = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(waits), 3)
+        self.assertTrue(0.8 <= waits[0] <= 1.2)
+        self.assertGreater(waits[2], waits[0])
+
+    @patch('training.begin_training_session.time.sleep')
+    def test_honours_retry_after(self, sleep):
+        self.transport.get.side_effect = [operation('running', retry_after='7'), operation('failed')]
+        self.assertFalse(self.model._wait_for_operation_to_complete('https://example.com/operation', {}))
+        sleep.assert_called_once_with(7.0)
+
+    def test_gives_up_after_the_timeout(self):
+        self.transport.get.return_value = operation('running')
+        self.assertFalse(self.model._wait_for_operation_to_complete('https://example.com/operation', {}, timeout=0.05))
+
+if __name__ == '__main__':
+    unittest.main()
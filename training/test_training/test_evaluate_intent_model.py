@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from training.evaluate_intent_model import LocalBackend, confusion_matrix, per_intent_metrics, threshold_sweep, recommend_threshold
+
+UTTERANCES = [
+    {"text": "open google", "intent": "Open_Website"},
+    {"text": "open google please", "intent": "Open_Website"},
+    {"text": "open youtube", "intent": "Open_Website"},
+    {"text": "what is the weather", "intent": "Get_Weather"},
+    {"text": "what is the weather today", "intent": "Get_Weather"},
+    {"text": "weather forecast for today", "intent": "Get_Weather"},
+]
+
+# utterances with their true and predicted intents and scores, 'None' marks speech GPT should answer
+RUN = {
+    'true': np.array(['Open_Website', 'Open_Website', 'Get_Weather', 'Get_Weather', 'None']),
+    'predicted': np.array(['Open_Website', 'Get_Weather', 'Get_Weather', 'Get_Weather', 'Open_Website']),
+    'scores': np.array([0.95, 0.6, 0.9, 0.8, 0.5]),
+}
+
+class TestEvaluateIntentModel(unittest.TestCase):
+    """Class for testing the intent model evaluation"""
+
+    def test_confusion_matrix(self):
+        labels, matrix = confusion_matrix(RUN['true'], RUN['predicted'])
+        self.assertEqual(labels.tolist(), ['Get_Weather', 'None', 'Open_Website'])
+        self.assertEqual(matrix.tolist(), [[2, 0, 0], [0, 0, 1], [1, 0, 1]])
+
+    def test_per_intent_metrics(self):
+        metrics = per_intent_metrics(*confusion_matrix(RUN['true'], RUN['predicted']))
+        self.assertEqual(metrics['Get_Weather'], {'precision': 0.667, 'recall': 1.0, 'support': 2})
+        self.assertEqual(metrics['Open_Website'], {'precision': 0.5, 'recall': 0.5, 'support': 2})
+        # never predicted, so its precision is undefined
+        self.assertEqual(metrics['None'], {'precision': None, 'recall': 0.0, 'support': 1})
+
+    def test_threshold_sweep(self):
+        sweep = threshold_sweep(RUN, np.array([0.0, 0.7, 1.0]))
+        self.assertEqual([row['wrong_command_rate'] for row in sweep], [0.4, 0.0, 0.0])
+        self.assertEqual([row['right_command_rate'] for row in sweep], [0.6, 0.6, 0.0])
+        self.assertEqual([row['gpt_fallback_rate'] for row in sweep], [0.0, 0.4, 1.0])
+        self.assertEqual([row['routing_accuracy'] for row in sweep], [0.6, 0.8, 0.2])
+
+    def test_recommend_threshold(self):
+        sweep = threshold_sweep(RUN, np.array([0.0, 0.55, 0.7, 1.0]))
+        self.assertEqual(recommend_threshold(sweep, max_wrong_command_rate=0.0)['threshold'], 0.7)
+        # when no threshold is good enough the most accurate one is still recommended
+        self.assertEqual(recommend_threshold(sweep[:1], max_wrong_command_rate=0.0)['threshold'], 0.0)
+
+    def test_local_backend(self):
+        backend = LocalBackend(UTTERANCES)
+        self.assertEqual(backend.predict('open google')[0], 'Open_Website')
+        self.assertEqual(backend.predict('weather for tomorrow')[0], 'Get_Weather')
+        # a training utterance is never matched with itself
+        self.assertLess(backend.predict('open google')[1], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import os
+import yaml
+import tempfile
+import unittest
+from training.export_conversation_history import iter_sessions
+
+class TestExportConversationHistory(unittest.TestCase):
+    """Class for testing the conversation history exporter"""
+
+    def test_iter_sessions(self):
+        history = {
+            'Session 1': {'Date': '01/10/2023', 'Time': '10:00:00', 'Conversation': [{'User': 'Hello', 'Juno': 'Hi!\nHow can I help?', 'Source': 'gpt'}]},
+            'Session 2': {'Date': '02/10/2023', 'Time': '11:00:00', 'Conversation': [{'User': 'Open Google', 'Juno': 'Opening Google.com', 'Source': 'command'}]},
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'conversation_history.yaml')
+            with open(path, 'w', encoding='utf-8') as f:
+                yaml.safe_dump(history, f)
+
+            self.assertEqual(dict(iter_sessions(path)), history)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import io
+import json
+import unittest
+from training.validate_gpt_training_data import DatasetValidator, estimate_epochs
+
+def example(question, answer):
+    return json.dumps({"messages": [{"role": "user", "content": question}, {"role": "assistant", "content": answer}]})
+
+class TestDatasetValidator(unittest.TestCase):
+    """Class for testing the fine-tuning dataset validator"""
+
+    def test_validate(self):
+        lines = [
+            example("How are you?", "Great!"),
+            example("How are you?", "Great!"),
+            example("how are you", "great"),
+            example("What's your name?", "Juno."),
+            '{"messages": [{"role": "user", "content": "Hi"}]}',
+            'not json',
+        ]
+        output = io.StringIO()
+        report = DatasetValidator().validate(io.BytesIO('\n'.join(lines).encode()), output)
+
+        self.assertEqual(report['examples'], 6)
+        self.assertEqual(report['valid_examples'], 2)
+        self.assertEqual(report['exact_duplicates'], 1)
+        self.assertEqual(report['near_duplicates'], 1)
+        self.assertEqual(report['errors']['no assistant message']['lines'], [5])
+        self.assertEqual(report['errors']['invalid JSON']['count'], 1)
+        self.assertEqual(len(output.getvalue().splitlines()), 2)
+
+    def test_estimate_epochs(self):
+        self.assertEqual(estimate_epochs(10), 10)
+        self.assertEqual(estimate_epochs(100), 3)
+        self.assertEqual(estimate_epochs(20000), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+"""
+Validates GPT fine-tuning datasets before they are uploaded.
+
+Each JSONL file is read one line at a time, so memory use does not grow with the file's size (only a short digest of
+every kept example is remembered to detect duplicates). Every example's messages are checked against the chat
+fine-tuning format, tokens are counted, exact and near duplicates are dropped, and the number of epochs OpenAI will
+train for and the resulting cost are estimated. Valid, unique examples can be written to a cleaned file for upload.
+
+Usage:
+    python -m training.validate_gpt_training_data [training_data.jsonl ...] [--model gpt-3.5-turbo] [--output-dir cleaned]
+"""
+
+import os
+import re
+import io
+import sys
+import json
+import glob
+import hashlib
+import argparse
+
+current_directory = os.path.dirname(os.path.abspath(__file__))
+training_data_path = os.path.join(current_directory, 'gpt_training_data')
+
+ROLES = {'system', 'user', 'assistant', 'function', 'tool'}
+MESSAGE_KEYS = {'role', 'content', 'name', 'function_call', 'tool_calls', 'tool_call_id', 'weight'}
+
+# Examples longer than this are truncated by OpenAI during training
+MAX_TOKENS_PER_EXAMPLE = 4096
+
+# OpenAI's default epochs: 3, raised for small datasets and lowered for large ones
+TARGET_EPOCHS = 3
+MIN_TARGET_EXAMPLES = 100
+MAX_TARGET_EXAMPLES = 25000
+MIN_DEFAULT_EPOCHS = 1
+MAX_DEFAULT_EPOCHS = 25
+
+# USD per 1000 trained tokens
+TRAINING_PRICE_PER_1K_TOKENS = {
+    'gpt-3.5-turbo': 0.008,
+    'davinci-002': 0.006,
+    'babbage-002': 0.0004,
+}
+
+class TokenCounter:
+    """
+    Counts chat tokens with tiktoken, or estimates them at four characters per token when tiktoken is not installed
+    """
+
+    def __init__(self, model:str):
+        try:
+            import tiktoken
+            self.encoding = tiktoken.encoding_for_model(model)
+        except (ImportError, KeyError):
+            self.encoding = None
+        self.estimated = self.encoding is None
+
+    def count_text(self, text:str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        return (len(text) + 3) // 4
+
+    def count_messages(self, messages:list) -> tuple:
+        """
+        Returns the example's total tokens and the tokens of its assistant messages.
+        Every message carries a few tokens of formatting, and the reply is primed with 3 more.
+        """
+        total, assistant = 3, 0
+        for message in messages:
+            total += 3
+            for key, value in message.items():
+                if isinstance(value, str):
+                    total += self.count_text(value)
+                elif value is not None and key != 'weight':
+                    total += self.count_text(json.dumps(value))
+                if key == 'name':
+                    total += 1
+            if message.get('role') == 'assistant' and isinstance(message.get('content'), str):
+                assistant += self.count_text(message['content'])
+        return total, assistant
+
+class DatasetValidator:
+    """
+    Validates, deduplicates and measures a chat fine-tuning dataset in a single streaming pass
+    """
+
+    def __init__(self, model:str='gpt-3.5-turbo', max_tokens_per_example:int=MAX_TOKENS_PER_EXAMPLE, price_per_1k_tokens:float=None):
+        self.model = model
+        self.max_tokens_per_example = max_tokens_per_example
+        self.price_per_1k_tokens = price_per_1k_tokens if price_per_1k_tokens is not None else TRAINING_PRICE_PER_1K_TOKENS.get(model)
+        self.token_counter = TokenCounter(model)
+
+    def validate(self, source, output=None, epochs:int=None) -> dict:
+        """
+        Validates every example of a JSONL dataset and returns a report
+        :param source: (str or file) path or file object of the dataset, text and binary files are both accepted
+        :param output: (str or file) optional path or file object the valid, unique examples are written to
+        :param epochs: (int) epochs the job will train for, OpenAI's default is estimated if not given
+        :return: (dict) the report
+        """
+        report = {
+            'examples': 0,
+            'valid_examples': 0,
+            'errors': {},
+            'exact_duplicates': 0,
+            'near_duplicates': 0,
+            'tokens': {'total': 0, 'assistant': 0, 'min': None, 'max': None, 'examples_over_limit': 0},
+            'token_counts_estimated': self.token_counter.estimated,
+        }
+        exact_digests, near_digests = set(), set()
+        billed_tokens = 0
+
+        with _open(source, 'r') as lines, (_open(output, 'w') if output is not None else _NullWriter()) as writer:
+            for line_number, line in enumerate(lines, start=1):
+                if isinstance(line, bytes):
+                    line = line.decode('utf-8')
+                if not line.strip():
+                    continue
+                report['examples'] += 1
+
+                example, error = self._parse_example(line)
+                if error:
+                    errors = report['errors'].setdefault(error, {'count': 0, 'lines': []})
+                    errors['count'] += 1
+                    # a few line numbers per error are enough to find the problem
+                    if len(errors['lines']) < 5:
+                        errors['lines'].append(line_number)
+                    continue
+
+                exact_digest, near_digest = self._digests(example['messages'])
+                if exact_digest in exact_digests:
+                    report['exact_duplicates'] += 1
+                    continue
+                if near_digest in near_digests:
+                    report['near_duplicates'] += 1
+                    continue
+                exact_digests.add(exact_digest)
+                near_digests.add(near_digest)
+
+                tokens, assistant_tokens = self.token_counter.count_messages(example['messages'])
+                token_stats = report['tokens']
+                token_stats['total'] += tokens
+                token_stats['assistant'] += assistant_tokens
+                token_stats['min'] = tokens if token_stats['min'] is None else min(token_stats['min'], tokens)
+                token_stats['max'] = tokens if token_stats['max'] is None else max(token_stats['max'], tokens)
+                if tokens > self.max_tokens_per_example:
+                    token_stats['examples_over_limit'] += 1
+                billed_tokens += min(tokens, self.max_tokens_per_example)
+
+                report['valid_examples'] += 1
+                writer.write(json.dumps(example, ensure_ascii=False) + '\n')
+
+        report['epochs'] = epochs or estimate_epochs(report['valid_examples'])
+        report['billed_tokens'] = billed_tokens * report['epochs']
+        report['estimated_cost_usd'] = round(report['billed_tokens'] / 1000 * self.price_per_1k_tokens, 2) if self.price_per_1k_tokens is not None else None
+        report['tokens']['mean'] = round(report['tokens']['total'] / report['valid_examples'], 1) if report['valid_examples'] else None
+        return report
+
+    def _parse_example(self, line:str) -> tuple:
+        """
+        Returns the parsed example, or the reason it is invalid
+        """
+        try:
+            example = json.loads(line)
+        except ValueError:
+            return None, 'invalid JSON'
+
+        if not isinstance(example, dict) or not isinstance(example.get('messages'), list) or not example['messages']:
+            return None, 'missing messages list'
+
+        for message in example['messages']:
+            if not isinstance(message, dict):
+                return None, 'message is not an object'
+            if message.get('role') not in ROLES:
+                return None, 'unrecognized role'
+            if set(message) - MESSAGE_KEYS:
+                return None, 'unrecognized message key'
+            content = message.get('content')
+            if content is None and not (message.get('function_call') or message.get('tool_calls')):
+                return None, 'missing content'
+            if content is not None and not isinstance(content, str):
+                return None, 'content is not a string'
+
+        if not any(message['role'] == 'assistant' for message in example['messages']):
+            return None, 'no assistant message'
+        return example, None
+
+    def _digests(self, messages:list) -> tuple:
+        """
+        Returns a digest of the exact messages and one of their normalized text, examples that differ only
+        in case, punctuation or spacing share the normalized digest
+        """
+        exact = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+        normalized = '\n'.join(f"{message.get('role')}:{self._normalize(message.get('content'))}" for message in messages)
+        return hashlib.blake2b(exact.encode('utf-8'), digest_size=16).digest(), hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+    def _normalize(self, content) -> str:
+        return ' '.join(re.sub(r'[^\w\s]', ' ', str(content or '').lower()).split())
+
+def estimate_epochs(examples:int) -> int:
+    """
+    The number of epochs OpenAI trains for by default, given the dataset's size
+    """
+    if not examples:
+        return 0
+    if examples * TARGET_EPOCHS < MIN_TARGET_EXAMPLES:
+        return min(MAX_DEFAULT_EPOCHS, MIN_TARGET_EXAMPLES // examples)
+    if examples * TARGET_EPOCHS > MAX_TARGET_EXAMPLES:
+        return max(MIN_DEFAULT_EPOCHS, MAX_TARGET_EXAMPLES // examples)
+    return TARGET_EPOCHS
+
+def print_report(name:str, report:dict) -> None:
+    print(f"\n{name}")
+    print(f"  {report['valid_examples']} of {report['examples']} examples are valid and unique "
+          f"({report['exact_duplicates']} exact and {report['near_duplicates']} near duplicates dropped)")
+    for error, details in report['errors'].items():
+        print(f"  {details['count']} x {error} (lines {', '.join(map(str, details['lines']))}{', ...' if details['count'] > len(details['lines']) else ''})")
+
+    tokens = report['tokens']
+    estimated = ' (estimated, install tiktoken for exact counts)' if report['token_counts_estimated'] else ''
+    print(f"  tokens{estimated}: {tokens['total']} in total, {tokens['min']}-{tokens['max']} per example, mean {tokens['mean']}")
+    if tokens['examples_over_limit']:
+        print(f"  {tokens['examples_over_limit']} examples are over the token limit and will be truncated")
+    cost = f"${report['estimated_cost_usd']:.2f}" if report['estimated_cost_usd'] is not None else 'unknown'
+    print(f"  {report['epochs']} epochs, {report['billed_tokens']} billed tokens, estimated cost {cost}")
+
+def _open(target, mode:str):
+    """
+    Opens a path, or wraps an already open file object so the caller's file is not closed
+    """
+    if isinstance(target, (str, os.PathLike)):
+        return open(target, mode, encoding='utf-8')
+    return _Borrowed(target)
+
+class _Borrowed:
+    def __init__(self, file):
+        self.file = file
+
+    def __enter__(self):
+        return self.file
+
+    def __exit__(self, *exc_info):
+        return False
+
+class _NullWriter(io.StringIO):
+    def write(self, text:str) -> int:
+        return len(text)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Validate GPT fine-tuning datasets and estimate their cost')
+    parser.add_argument('files', nargs='*', help='JSONL datasets, defaults to every gpt_training_data/*/training_data.jsonl')
+    parser.add_argument('--model', default='gpt-3.5-turbo')
+    parser.add_argument('--epochs', type=int, default=None, help="epochs to train for, defaults to OpenAI's estimate")
+    parser.add_argument('--price-per-1k', type=float, default=None, help='USD per 1000 trained tokens, for models without a known price')
+    parser.add_argument('--output-dir', default=None, help='write each dataset\'s valid, unique examples to this directory')
+    parser.add_argument('--json', action='store_true', help='print the reports as JSON')
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(training_data_path, '*', 'training_data.jsonl')))
+    validator = DatasetValidator(args.model, price_per_1k_tokens=args.price_per_1k)
+
+    reports = {}
+    for file_path in files:
+        output = None
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            output = os.path.join(args.output_dir, f"{os.path.basename(os.path.dirname(file_path))}.jsonl")
+        reports[file_path] = validator.validate(file_path, output, args.epochs)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for file_path, report in reports.items():
+            print_report(os.path.relpath(file_path), report)
+    return 0 if all(not report['errors'] for report in reports.values()) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())